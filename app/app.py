@@ -2,7 +2,22 @@ import streamlit as st
 import pandas as pd
 from lead_search import LeadFinder
 from sheets_writer import GoogleSheetsWriter
-import os
+from lead_store import LeadStore
+from incremental_search import IncrementalSearch
+from website_enricher import WebsiteEnricher
+from page_cache import PageCache
+from response_archive import ResponseArchive
+from lead_schema import LEAD_FIELDS, normalize_query
+from job_pool import JobPool, JobLimitError, DONE, CANCELLED
+from lead_table import LeadTable, TABLE_COLUMNS
+from lead_sinks import EXPORT_FORMATS, export_leads
+from campaign import Campaign, cross_queries, read_campaign_csv, split_lines, summarize, unique_queries
+from config import Config
+import math
+import tempfile
+import json
+import uuid
+from functools import partial
 from datetime import datetime
 
 # Page configuration
@@ -45,7 +60,485 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_lead_finder(api_key: str) -> LeadFinder:
+    """One LeadFinder (and HTTP connection pool) per API key for the whole process"""
+    # Archive raw responses when zstandard is installed
+    try:
+        archive = ResponseArchive()
+    except ImportError:
+        archive = None
+    return LeadFinder(api_key, archive=archive)
+
+
+@st.cache_resource
+def get_sheets_writer(credentials_json: str) -> GoogleSheetsWriter:
+    """One authorized writer per uploaded credentials file, shared by sessions and reruns"""
+    # Build credentials straight from the upload, no temp file
+    return GoogleSheetsWriter(credentials_info=json.loads(credentials_json))
+
+
+@st.cache_resource
+def get_lead_store() -> LeadStore:
+    return LeadStore()
+
+
+@st.cache_resource
+def get_page_cache() -> PageCache:
+    return PageCache()
+
+
+@st.cache_resource
+def get_enricher() -> WebsiteEnricher:
+    """One enricher for the process, so its concurrency cap, per-host politeness and robots.txt cache are shared"""
+    return WebsiteEnricher(page_cache=get_page_cache())
+
+
+@st.cache_resource
+def get_job_pool() -> JobPool:
+    """Background workers shared by every session, so the limits apply process-wide"""
+    return JobPool()
+
+
+# Results table display
+PAGE_SIZES = [25, 50, 100, 250]
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+DEFAULT_TABLE_COLUMNS = ['business_name', 'website', 'phone', 'address', 'niche', 'location']
+LIVE_PREVIEW_ROWS = 100  # Latest leads shown while a job is running
+
+
+class NoLeadsFound(Exception):
+    """Raised instead of returning no leads, so failed or empty searches aren't cached"""
+
+
+@st.cache_data(ttl=Config.SEARCH_CACHE_TTL, show_spinner=False)
+def search_leads_cached(query_key: str, api_key: str, incremental: bool, enrich: bool,
+                        _niche: str, _location: str, _num_results: int, _cancel_check=None) -> dict:
+    """
+    Run a search, shared across reruns and sessions until the TTL expires
+
+    Cached by the normalized (niche, location, num_results) query key plus the
+    search options; the underscore arguments are not part of the cache key.
+    _cancel_check is called between steps and before each website fetched
+    for enrichment; a cancelled search raises and isn't cached.
+
+    Returns:
+        dict: 'leads' and, for incremental searches, the 'delta' counts
+    """
+    lead_finder = get_lead_finder(api_key)
+    lead_store = get_lead_store()
+    delta = None
+
+    if incremental:
+        result = IncrementalSearch(lead_finder, lead_store).search(_niche, _location, _num_results)
+        leads = result['leads']
+        delta = {
+            'fetched': result['fetched'],
+            'added': len(result['added']),
+            'changed': len(result['changed']),
+            'removed': len(result['removed']),
+            'unchanged': result['unchanged']
+        }
+    else:
+        leads = lead_finder.search_leads(_niche, _location, _num_results)
+
+    if not leads:
+        raise NoLeadsFound()
+    
+    if enrich:
+        if _cancel_check is not None:
+            _cancel_check()
+        leads = get_enricher().enrich_leads(leads, _cancel_check)
+
+    # Keep every lead in the local store for later lookups
+    if enrich or not incremental:
+        try:
+            lead_store.add_leads(leads)
+        except Exception as e:
+            print(f"Could not save leads to the local store: {str(e)}")
+
+    return {'leads': leads, 'delta': delta}
+
+
+def run_search_task(task: dict) -> dict:
+    """Job task: one search, through the shared search cache"""
+    try:
+        return search_leads_cached(
+            normalize_query(task['niche'], task['location'], task['num_results']), task['api_key'],
+            task['incremental'], task['enrich'], task['niche'], task['location'], task['num_results'],
+            task.get('cancel_check')
+        )
+    except NoLeadsFound:
+        return {'leads': [], 'delta': None}
+
+
+def run_save_task(task: dict) -> bool:
+    """Job task: write leads to Google Sheets"""
+    sheets_writer = get_sheets_writer(task['credentials'])
+    if not sheets_writer.save_leads(task['leads'], task['spreadsheet_id'], task['sheet_name'], diff=True):
+        raise RuntimeError("Google Sheets rejected the write, see the server log for details")
+    return True
+
+
+def submit_job(kind: str, label: str, func, tasks: list, concurrency: int = 1, **context) -> bool:
+    """
+    Submit a background job for this session
+    
+    Args:
+        kind (str): 'search', 'campaign' or 'save', selects what happens when the job finishes
+        label (str): Short description shown with the progress bar
+        func: Task function run for each task
+        tasks (list): Task arguments
+        concurrency (int): Tasks of the job running at once
+        **context: Extra values kept for when the job finishes
+    
+    Returns:
+        bool: True if the job was queued; the caller should then rerun so the
+        job watcher picks it up. False if a job limit was hit
+    """
+    try:
+        job = get_job_pool().submit(st.session_state.session_id, label, func, tasks, concurrency)
+    except JobLimitError as e:
+        st.error(f"❌ {str(e)}")
+        return False
+    
+    st.session_state.pending_jobs[job.id] = dict(context, kind=kind)
+    return True
+
+
+def finish_job(job, context: dict):
+    """Move the outcome of a finished job into session state"""
+    progress = job.progress()
+    
+    if context['kind'] == 'search':
+        result = job.results[0] if job.results else None
+        st.session_state.search = {
+            'id': job.id,
+            'title': f"{context['niche']} in {context['location']}",
+            'file_label': f"{context['niche']}_{context['location']}",
+            'table': LeadTable(job.leads_since(0)),
+            'delta': result.get('delta') if result else None,
+            'searched_at': datetime.fromtimestamp(job.submitted_at),
+            'state': progress['state'],
+            'error': progress['error'],
+            'saved_to': None
+        }
+    
+    elif context['kind'] == 'campaign':
+        leads = job.leads_since(0)
+        queries = []
+        for (niche, location), task, result in zip(context['queries'], progress['tasks'], job.results):
+            row = {'niche': niche, 'location': location, 'status': task['state'],
+                   'found': 0, 'new': 0, 'duplicates': 0, 'searches': 0, 'cost': 0.0}
+            if result is not None:
+                row.update((field, result[field]) for field in ('found', 'new', 'duplicates', 'searches', 'cost'))
+            row['seconds'] = round(task['seconds'], 1) if task['seconds'] is not None else None
+            queries.append(row)
+        
+        # One batched write of the merged campaign to the local store
+        if context['store_leads'] and leads:
+            try:
+                get_lead_store().add_leads(leads)
+            except Exception as e:
+                print(f"Could not save leads to the local store: {str(e)}")
+        
+        st.session_state.search = {
+            'id': job.id,
+            'title': f"a campaign of {len(queries)} queries",
+            'file_label': f"campaign_{len(queries)}_queries",
+            'table': LeadTable(leads),
+            'delta': None,
+            'queries': queries,
+            'totals': summarize(job.results),
+            'searched_at': datetime.fromtimestamp(job.submitted_at),
+            'state': progress['state'],
+            'error': progress['error'],
+            'saved_to': None
+        }
+    
+    elif context['kind'] == 'save':
+        search = st.session_state.get('search')
+        if job.state == DONE:
+            if search is not None and search['id'] == context['search_id']:
+                search['saved_to'] = context['target']
+            st.session_state.save_message = ('success', "✅ Leads saved to Google Sheets successfully!")
+        elif job.state == CANCELLED:
+            st.session_state.save_message = ('warning', "Saving to Google Sheets was cancelled.")
+        else:
+            st.session_state.save_message = ('error', f"❌ Error saving to Google Sheets: {progress['error']}")
+
+
+@st.fragment(run_every=1.0)
+def watch_jobs():
+    """
+    Poll this session's running jobs once a second
+    
+    Only this fragment reruns while jobs are in flight. Once a job
+    finishes its outcome is moved into session state and the whole app
+    reruns to show it.
+    """
+    pool = get_job_pool()
+    pending = st.session_state.pending_jobs
+    finished = False
+    
+    for job_id, context in list(pending.items()):
+        job = pool.get(job_id)
+        if job is None or job.finished:
+            if job is not None:
+                finish_job(job, context)
+                # The outcome lives in session state now
+                pool.discard(job_id)
+            del pending[job_id]
+            finished = True
+            continue
+        
+        progress = job.progress()
+        status = f"{job.label}: {progress['done']}/{progress['total']} done, {progress['leads']} leads"
+        if progress['state'] == 'queued':
+            status = f"{job.label}: waiting for a free worker"
+        elif progress['eta'] is not None:
+            status += f", about {progress['eta']:.0f}s left"
+        st.progress(progress['fraction'], text=status)
+        
+        if progress['total'] > 1:
+            st.dataframe(pd.DataFrame(progress['tasks']), use_container_width=True, hide_index=True)
+        
+        # Latest leads found so far
+        if context['kind'] != 'save' and progress['leads']:
+            latest = job.leads_since(max(0, progress['leads'] - LIVE_PREVIEW_ROWS))
+            st.dataframe(pd.DataFrame(latest), use_container_width=True)
+        
+        if st.button("✖️ Cancel", key=f"cancel_{job_id}"):
+            job.cancel()
+    
+    if finished:
+        st.rerun(scope="app")
+
+
+def show_leads_table(table: LeadTable, key: str) -> LeadTable:
+    """
+    Paginated, filterable view of a lead table
+    
+    Filtering and slicing happen on the server; only the current page of
+    the selected columns is sent to the browser.
+    
+    Args:
+        table (LeadTable): Leads to show
+        key (str): Widget key prefix, unique per table on the page
+    
+    Returns:
+        LeadTable: The leads matching the selected filters
+    """
+    filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+    with filter_col1:
+        niche = st.selectbox("Niche", ["All"] + table.values('niche'), key=f"{key}_niche")
+    with filter_col2:
+        location = st.selectbox("Location", ["All"] + table.values('location'), key=f"{key}_location")
+    with filter_col3:
+        phone = st.selectbox("Phone", ["Any", "With phone", "Without phone"], key=f"{key}_phone")
+    with filter_col4:
+        domain = st.text_input("Domain contains", key=f"{key}_domain")
+    
+    columns = st.multiselect("Columns", TABLE_COLUMNS, default=DEFAULT_TABLE_COLUMNS, key=f"{key}_columns")
+    
+    filtered = table.filter(
+        niche=None if niche == "All" else niche,
+        location=None if location == "All" else location,
+        has_phone={"Any": None, "With phone": True, "Without phone": False}[phone],
+        domain=domain or None
+    )
+    
+    page_col1, page_col2 = st.columns(2)
+    with page_col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+    with page_col2:
+        page_count = filtered.page_count(page_size)
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1,
+                               key=f"{key}_page")
+    
+    # The page number widget keeps its value when filters shrink the result
+    page = min(page, page_count)
+    first = (page - 1) * page_size
+    st.dataframe(filtered.page(page, page_size, columns or None), use_container_width=True, hide_index=True)
+    st.caption(f"Rows {min(first + 1, len(filtered))}–{min(first + page_size, len(filtered))} of {len(filtered)}"
+               + (f" (filtered from {len(table)})" if len(filtered) != len(table) else ""))
+    return filtered
+
+
+def show_saved_leads(lead_store: LeadStore, **filters):
+    """
+    Paginated view of stored leads matching find_leads filters
+    
+    Only the current page is read from the database, with a COUNT query for
+    the page total, so the store's size doesn't matter.
+    
+    Args:
+        lead_store (LeadStore): Store to read from
+        **filters: niche, location, has_phone and text, as for LeadStore.find_leads
+    """
+    total = lead_store.count(**filters)
+    st.caption(f"{lead_store.count()} leads stored locally, {total} match")
+    if not total:
+        return
+    
+    page_col1, page_col2 = st.columns(2)
+    with page_col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key="saved_page_size")
+    with page_col2:
+        page_count = max(1, math.ceil(total / page_size))
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1,
+                               key="saved_page")
+    
+    # The page number widget keeps its value when filters shrink the result
+    page = min(page, page_count)
+    leads = lead_store.find_leads(limit=page_size, offset=(page - 1) * page_size, **filters)
+    st.dataframe(pd.DataFrame(leads, columns=LEAD_FIELDS), use_container_width=True, hide_index=True)
+
+
+def build_export(table: LeadTable, extension: str):
+    """
+    Encode a lead table for download
+    
+    Passed to st.download_button as a callable, so it only runs when the
+    user clicks the button, never on an ordinary rerun. Leads are encoded a
+    batch at a time into a temporary file that moves to disk past
+    EXPORT_SPOOL_BYTES; Streamlit reads it from there into its own buffer.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    export_leads(table.iter_leads(), extension, spool)
+    spool.seek(0)
+    return spool
+
+
+def show_search_results(search: dict, google_sheets_creds, spreadsheet_id: str, sheet_name: str):
+    """
+    Show the results of the last search with save and download actions
+    
+    Args:
+        search (dict): Last search as kept in st.session_state.search
+        google_sheets_creds: Uploaded credentials file, if any
+        spreadsheet_id (str): Target spreadsheet ID
+        sheet_name (str): Target sheet name
+    """
+    table = search['table']
+    delta = search['delta']
+    
+    if search['state'] == CANCELLED:
+        st.warning(f"Cancelled, showing the {len(table)} leads found before it stopped.")
+    elif search['error'] and not len(table):
+        st.error(f"❌ Error during search: {search['error']}")
+        return
+    
+    if delta is not None:
+        if delta['fetched']:
+            st.info(f"🔄 {delta['added']} new, {delta['changed']} changed, "
+                    f"{delta['removed']} no longer listed, {delta['unchanged']} unchanged")
+        else:
+            st.info("♻️ Showing recent results from the local store, no new search was needed")
+    
+    # Yield and cost of each campaign query
+    if 'queries' in search:
+        totals = search['totals']
+        st.info(f"📈 {totals['queries']} queries: {totals['found']} leads found, {totals['new']} unique, "
+                f"{totals['duplicates']} duplicates across queries, {totals['searches']} SerpAPI searches "
+                f"(about ${totals['cost']:.2f})")
+        with st.expander("Per-query results"):
+            st.dataframe(pd.DataFrame(search['queries']), use_container_width=True, hide_index=True)
+    
+    if not len(table):
+        st.warning("No leads found. Try adjusting your search terms.")
+        return
+    
+    st.success(f"✅ Found {len(table)} leads for {search['title']} "
+               f"({search['searched_at'].strftime('%H:%M:%S')})")
+    
+    # Display results
+    st.subheader("📊 Found Leads")
+    filtered = show_leads_table(table, key="results")
+    
+    # Save to Google Sheets
+    target = (spreadsheet_id, sheet_name)
+    if search['saved_to'] == target:
+        st.caption(f"💾 Saved to sheet '{sheet_name}'")
+    
+    if st.button("💾 Save to Google Sheets", type="secondary"):
+        if google_sheets_creds is None or not spreadsheet_id:
+            st.error("Please upload Google Sheets credentials and enter a Spreadsheet ID in the sidebar.")
+        else:
+            task = {
+                'label': f"{sheet_name} ({len(table)} leads)",
+                'credentials': google_sheets_creds.getvalue().decode('utf-8'),
+                'leads': table.to_leads(),
+                'spreadsheet_id': spreadsheet_id,
+                'sheet_name': sheet_name
+            }
+            if submit_job('save', "Saving to Google Sheets", run_save_task, [task],
+                          search_id=search['id'], target=target):
+                st.rerun()
+    
+    save_message = st.session_state.pop('save_message', None)
+    if save_message is not None:
+        kind, message = save_message
+        getattr(st, kind)(message)
+    
+    # Download option, encoded in batches only when the button is clicked
+    export_col1, export_col2 = st.columns(2)
+    with export_col1:
+        export_format = st.selectbox("Download format", list(EXPORT_FORMATS))
+    with export_col2:
+        only_filtered = st.checkbox("Only rows matching the filters", disabled=len(filtered) == len(table))
+    
+    extension, mime = EXPORT_FORMATS[export_format]
+    st.download_button(
+        label=f"📥 Download as {export_format}",
+        data=partial(build_export, filtered if only_filtered else table, extension),
+        file_name=f"leads_{search['file_label']}_{search['searched_at'].strftime('%Y%m%d_%H%M%S')}{extension}",
+        mime=mime
+    )
+
+
+def show_campaign_form(api_key: str, num_results: int, incremental: bool, enrich: bool):
+    """
+    Bulk mode: search many (niche, location) queries as one background campaign
+    
+    Queries come from an uploaded CSV and/or from pasted niche and location
+    lists, where every niche is searched in every location.
+    """
+    campaign_file = st.file_uploader("Campaign CSV", type="csv", help="A file with 'niche' and 'location' columns, one query per row")
+    list_col1, list_col2 = st.columns(2)
+    with list_col1:
+        niches = st.text_area("Niches", placeholder="One per line, e.g.\nDentists\nPlumbers")
+    with list_col2:
+        locations = st.text_area("Locations", placeholder="One per line, e.g.\nPune\nMumbai")
+    
+    queries = []
+    if campaign_file is not None:
+        try:
+            queries = read_campaign_csv(campaign_file.getvalue())
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+    queries = unique_queries(queries + cross_queries(split_lines(niches), split_lines(locations)))
+    
+    if len(queries) > Config.CAMPAIGN_MAX_QUERIES:
+        st.warning(f"Only the first {Config.CAMPAIGN_MAX_QUERIES} of {len(queries)} queries will be searched.")
+        queries = queries[:Config.CAMPAIGN_MAX_QUERIES]
+    st.caption(f"{len(queries)} queries, at most {len(queries)} SerpAPI searches "
+               f"(about ${len(queries) * Config.SERPAPI_SEARCH_COST:.2f})")
+    
+    if st.button("🚀 Run Campaign", type="primary", use_container_width=True, disabled=not queries):
+        enricher = get_enricher() if enrich else None
+        campaign = Campaign(get_lead_finder(api_key), get_lead_store(), num_results, incremental, enricher)
+        if submit_job('campaign', f"Campaign of {len(queries)} queries", campaign.run_query,
+                      campaign.tasks(queries), concurrency=Config.CAMPAIGN_MAX_CONCURRENCY, queries=queries,
+                      store_leads=enrich or not incremental):
+            st.rerun()
+
+
 def main():
+    # Per-session job bookkeeping
+    st.session_state.setdefault('session_id', uuid.uuid4().hex)
+    st.session_state.setdefault('pending_jobs', {})
+    
     # Header
     st.markdown('<h1 class="main-header">🔍 Lead Finder Automation</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Find business leads and automatically save them to Google Sheets</p>', unsafe_allow_html=True)
@@ -66,6 +559,8 @@ def main():
         # Search Settings
         st.subheader("Search Settings")
         num_results = st.slider("Number of results to fetch", min_value=5, max_value=50, value=20)
+        enrich = st.checkbox("Enrich leads from their websites", value=False, help="Visit each lead's website to find missing phone numbers, emails and addresses")
+        incremental = st.checkbox("Reuse recent results", value=True, help="Serve searches fetched recently from the local store instead of calling SerpAPI again")
         
         # Google Sheets Settings
         st.subheader("Google Sheets Settings")
@@ -87,67 +582,67 @@ def main():
     with col1:
         st.header("🎯 Lead Search")
         
-        # Input fields
-        niche = st.text_input("Niche", placeholder="e.g., Interior Designers, Digital Marketing Agencies, etc.")
-        location = st.text_input("Location", placeholder="e.g., Mumbai, New York, London, etc.")
+        mode = st.radio("Mode", ["Single search", "Bulk campaign"], horizontal=True, label_visibility="collapsed")
+        niche = location = ""
+        
+        if mode == "Bulk campaign":
+            show_campaign_form(serpapi_key, num_results, incremental, enrich)
+        
+        else:
+            # Input fields
+            niche = st.text_input("Niche", placeholder="e.g., Interior Designers, Digital Marketing Agencies, etc.")
+            location = st.text_input("Location", placeholder="e.g., Mumbai, New York, London, etc.")
         
-        # Search button
-        if st.button("🔍 Find Leads", type="primary", use_container_width=True):
+        # Search button; results are kept in session state so later reruns
+        # (saving, downloading) reuse them instead of searching again
+        if mode == "Single search" and st.button("🔍 Find Leads", type="primary", use_container_width=True):
             if not all([niche, location]):
                 st.error("Please fill in Niche and Location to search for leads.")
                 return
             
-            try:
-                # Initialize lead finder
-                lead_finder = LeadFinder(serpapi_key)
-                
-                # Show progress
-                with st.spinner("Searching for leads..."):
-                    leads = lead_finder.search_leads(niche, location, num_results)
-                
-                if leads:
-                    st.success(f"✅ Found {len(leads)} leads!")
-                    
-                    # Display results
-                    st.subheader("📊 Found Leads")
-                    df = pd.DataFrame(leads)
-                    st.dataframe(df, use_container_width=True)
-                    
-                    # Save to Google Sheets
-                    if st.button("💾 Save to Google Sheets", type="secondary"):
-                        with st.spinner("Saving to Google Sheets..."):
-                            # Save credentials temporarily
-                            creds_path = "temp_creds.json"
-                            with open(creds_path, "w") as f:
-                                f.write(google_sheets_creds.getvalue().decode())
-                            
-                            try:
-                                sheets_writer = GoogleSheetsWriter(creds_path)
-                                sheets_writer.save_leads(leads, spreadsheet_id, sheet_name)
-                                st.success("✅ Leads saved to Google Sheets successfully!")
-                                
-                                # Clean up temp file
-                                os.remove(creds_path)
-                                
-                            except Exception as e:
-                                st.error(f"❌ Error saving to Google Sheets: {str(e)}")
-                                if os.path.exists(creds_path):
-                                    os.remove(creds_path)
-                    
-                    # Download CSV option
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download as CSV",
-                        data=csv,
-                        file_name=f"leads_{niche}_{location}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
+            # Run the search in the background so the page stays responsive
+            task = {
+                'label': f"{niche} in {location}",
+                'niche': niche,
+                'location': location,
+                'num_results': num_results,
+                'api_key': serpapi_key,
+                'incremental': incremental,
+                'enrich': enrich
+            }
+            if submit_job('search', f"Searching {niche} in {location}", run_search_task, [task],
+                          niche=niche, location=location):
+                st.rerun()
+        
+        if st.session_state.pending_jobs:
+            watch_jobs()
+        
+        search = st.session_state.get('search')
+        if search is not None:
+            show_search_results(search, google_sheets_creds, spreadsheet_id, sheet_name)
+        
+        # Search leads found earlier without calling SerpAPI again
+        with st.expander("🗄️ Search Saved Leads"):
+            keywords = st.text_input("Keywords", placeholder="e.g., orthodontic, emergency repair")
+            filter_col1, filter_col2 = st.columns(2)
+            with filter_col1:
+                saved_niche = st.text_input("Niche filter", value=niche)
+            with filter_col2:
+                saved_location = st.text_input("Location filter", value=location)
+            only_with_phone = st.checkbox("Only leads with a phone number")
+            
+            # Expanders render even when collapsed, so the store is only queried on request
+            if st.toggle("Show saved leads", key="saved_open"):
+                try:
+                    show_saved_leads(
+                        get_lead_store(),
+                        niche=saved_niche or None,
+                        location=saved_location or None,
+                        has_phone=True if only_with_phone else None,
+                        text=keywords or None
                     )
-                    
-                else:
-                    st.warning("No leads found. Try adjusting your search terms.")
-                    
-            except Exception as e:
-                st.error(f"❌ Error during search: {str(e)}")
+                except Exception as e:
+                    st.error(f"❌ Error reading saved leads: {str(e)}")
     
     with col2:
         st.header("📋 Quick Tips")
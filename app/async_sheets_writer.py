@@ -0,0 +1,125 @@
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from config import Config
+from sheets_backend import SheetsBackend
+from sheets_quota import QuotaScheduler
+from sheets_writer import GoogleSheetsWriter
+from token_cache import TokenCache
+
+
+class AsyncGoogleSheetsWriter:
+    def __init__(self, credentials_path: str = None, max_concurrency: int = None,
+                 scheduler: QuotaScheduler = None, backend: SheetsBackend = None,
+                 writer: GoogleSheetsWriter = None, credentials_info: Dict = None,
+                 token_cache: TokenCache = None):
+        """
+        Asyncio front-end for GoogleSheetsWriter
+
+        Calls are run on a bounded thread pool around one writer. The writer
+        gets its own authorized session with a connection per concurrent call,
+        and shares the quota scheduler and token cache with the other writers.
+        Writes to different worksheets overlap; writes to the same worksheet are
+        serialized so they can't interleave.
+
+        Args:
+            credentials_path (str): Path to Google service account JSON file
+            max_concurrency (int): Maximum number of API operations in flight
+            scheduler (QuotaScheduler): Quota scheduler, defaults to the process-wide one
+            backend (SheetsBackend): Spreadsheet service, defaults to Google Sheets
+            writer (GoogleSheetsWriter): Existing writer to wrap instead of creating
+                                         one; its session is used as it is
+            credentials_info (Dict): Parsed service account JSON, used instead of
+                                     credentials_path without writing a file
+            token_cache (TokenCache): Access token cache, defaults to the process-wide one
+        """
+        self.max_concurrency = max_concurrency or Config.SHEETS_MAX_CONCURRENCY
+        self.writer = writer or GoogleSheetsWriter(credentials_path, scheduler=scheduler, backend=backend,
+                                                   credentials_info=credentials_info, token_cache=token_cache,
+                                                   pool_size=self.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="sheets-writer")
+        # Locks are bound to the loop they are used on, and are dropped once
+        # no call holds or waits for them
+        self._worksheet_locks: 'weakref.WeakValueDictionary[Tuple, asyncio.Lock]' = weakref.WeakValueDictionary()
+
+    async def _run(self, spreadsheet_id: str, sheet_name: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a writer call on the thread pool, one at a time per worksheet
+
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            sheet_name (str): Name of the worksheet the call touches
+            func (Callable): Writer method to call
+            *args, **kwargs: Arguments for the call
+
+        Returns:
+            Any: Result of the call
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, spreadsheet_id, sheet_name)
+        lock = self._worksheet_locks.get(key)
+        if lock is None:
+            lock = self._worksheet_locks[key] = asyncio.Lock()
+
+        async with lock:
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def save_leads(self, leads: List[Dict], spreadsheet_id: str, sheet_name: str = "Leads",
+                         diff: bool = False) -> bool:
+        """Async version of GoogleSheetsWriter.save_leads"""
+        return await self._run(spreadsheet_id, sheet_name, self.writer.save_leads,
+                               leads, spreadsheet_id, sheet_name, diff=diff)
+
+    async def append_leads(self, leads: List[Dict], spreadsheet_id: str, sheet_name: str = "Leads") -> bool:
+        """Async version of GoogleSheetsWriter.append_leads"""
+        return await self._run(spreadsheet_id, sheet_name, self.writer.append_leads,
+                               leads, spreadsheet_id, sheet_name)
+
+    async def upsert_leads(self, leads: List[Dict], spreadsheet_id: str, sheet_name: str = "Leads") -> bool:
+        """Async version of GoogleSheetsWriter.upsert_leads"""
+        return await self._run(spreadsheet_id, sheet_name, self.writer.upsert_leads,
+                               leads, spreadsheet_id, sheet_name)
+
+    async def get_existing_leads(self, spreadsheet_id: str, sheet_name: str = "Leads") -> List[Dict]:
+        """Async version of GoogleSheetsWriter.get_existing_leads"""
+        return await self._run(spreadsheet_id, sheet_name, self.writer.get_existing_leads,
+                               spreadsheet_id, sheet_name)
+
+    async def save_many(self, jobs: Iterable[Tuple[List[Dict], str, str]], mode: str = "save",
+                        diff: bool = False) -> List[bool]:
+        """
+        Write many lead sets concurrently, e.g. one spreadsheet per client
+
+        Args:
+            jobs (Iterable[Tuple]): (leads, spreadsheet_id, sheet_name) per write
+            mode (str): 'save', 'append' or 'upsert'
+            diff (bool): Use diff mode for 'save'
+
+        Returns:
+            List[bool]: Success flag per job, in job order
+        """
+        if mode == "save":
+            calls = [self.save_leads(leads, spreadsheet_id, sheet_name, diff=diff)
+                     for leads, spreadsheet_id, sheet_name in jobs]
+        elif mode == "append":
+            calls = [self.append_leads(*job) for job in jobs]
+        elif mode == "upsert":
+            calls = [self.upsert_leads(*job) for job in jobs]
+        else:
+            raise ValueError(f"Unknown write mode: {mode}")
+
+        return list(await asyncio.gather(*calls))
+
+    def close(self):
+        """Shut down the thread pool"""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,212 @@
+import csv
+import io
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+from incremental_search import IncrementalSearch
+from lead_schema import lead_key, normalize_query
+from lead_store import LeadStore
+
+# Accepted CSV header names, lowercase
+NICHE_COLUMNS = ('niche', 'category', 'business type', 'keyword')
+LOCATION_COLUMNS = ('location', 'city', 'area', 'region')
+
+
+def unique_queries(pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Drop empty and repeated (niche, location) pairs, keeping the first spelling"""
+    queries = []
+    seen = set()
+    for niche, location in pairs:
+        niche, location = niche.strip(), location.strip()
+        key = normalize_query(niche, location, 0)
+        if niche and location and key not in seen:
+            seen.add(key)
+            queries.append((niche, location))
+    return queries
+
+
+def split_lines(text: str) -> List[str]:
+    """Split pasted text into one entry per non-empty line"""
+    return [line.strip() for line in (text or '').splitlines() if line.strip()]
+
+
+def cross_queries(niches: Iterable[str], locations: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Every combination of the given niches and locations
+
+    Args:
+        niches (Iterable[str]): Business niches
+        locations (Iterable[str]): Locations
+
+    Returns:
+        List[Tuple[str, str]]: Unique (niche, location) pairs
+    """
+    locations = list(locations)
+    return unique_queries((niche, location) for niche in niches for location in locations)
+
+
+def read_campaign_csv(data: bytes) -> List[Tuple[str, str]]:
+    """
+    Read (niche, location) pairs from an uploaded CSV file
+
+    The file needs a header row with a niche column ('niche', 'category',
+    'business type' or 'keyword') and a location column ('location',
+    'city', 'area' or 'region'); other columns are ignored.
+
+    Args:
+        data (bytes): CSV file contents
+
+    Returns:
+        List[Tuple[str, str]]: Unique (niche, location) pairs in file order
+
+    Raises:
+        ValueError: If the niche or location column is missing
+    """
+    reader = csv.reader(io.StringIO(data.decode('utf-8-sig')))
+    header = [column.strip().lower() for column in next(reader, [])]
+
+    niche_column = next((header.index(name) for name in NICHE_COLUMNS if name in header), None)
+    location_column = next((header.index(name) for name in LOCATION_COLUMNS if name in header), None)
+    if niche_column is None or location_column is None:
+        raise ValueError("The CSV needs a 'niche' and a 'location' column")
+
+    width = max(niche_column, location_column) + 1
+    return unique_queries((row[niche_column], row[location_column]) for row in reader if len(row) >= width)
+
+
+class RateLimiter:
+    def __init__(self, interval: float):
+        """
+        Space out calls made from several threads
+
+        Args:
+            interval (float): Minimum seconds between the start of two calls
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_call = 0.0
+
+    def wait(self):
+        """Block until the caller may start its call"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_call)
+            self._next_call = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class _RateLimitedFinder:
+    """LeadFinder stand-in that waits for the rate limiter before every search"""
+
+    def __init__(self, lead_finder, limiter: RateLimiter):
+        self.lead_finder = lead_finder
+        self.limiter = limiter
+
+    def search_leads(self, niche: str, location: str, num_results: int = 20) -> List[Dict]:
+        self.limiter.wait()
+        return self.lead_finder.search_leads(niche, location, num_results)
+
+
+class Campaign:
+    def __init__(self, lead_finder, store: Optional[LeadStore] = None, num_results: int = 20,
+                 incremental: bool = True, enricher=None, delay: float = None, search_cost: float = None):
+        """
+        Search many (niche, location) queries as one campaign
+
+        run_query is meant to be the task function of a background job that
+        runs several queries at once. SerpAPI calls from all of them go
+        through one rate limiter, and leads are deduplicated across the whole
+        campaign, so each query only returns leads no other query found first.
+
+        Args:
+            lead_finder (LeadFinder): Finder used for the searches
+            store (LeadStore): Lead store for incremental searches, defaults to Config.LEAD_STORE_PATH
+            num_results (int): Results requested per query
+            incremental (bool): Reuse queries fetched recently instead of calling SerpAPI
+            enricher (WebsiteEnricher): Enrich each query's new leads from their websites
+            delay (float): Minimum seconds between SerpAPI calls, defaults to Config.SEARCH_DELAY
+            search_cost (float): Cost of one SerpAPI search, defaults to Config.SERPAPI_SEARCH_COST
+        """
+        self.num_results = num_results
+        self.incremental = incremental
+        self.enricher = enricher
+        self.search_cost = Config.SERPAPI_SEARCH_COST if search_cost is None else search_cost
+
+        limiter = RateLimiter(Config.SEARCH_DELAY if delay is None else delay)
+        self._finder = _RateLimitedFinder(lead_finder, limiter)
+        self._incremental = IncrementalSearch(self._finder, store) if incremental else None
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def tasks(queries: Iterable[Tuple[str, str]]) -> List[Dict]:
+        """Job tasks for (niche, location) pairs"""
+        return [{'label': f"{niche} in {location}", 'niche': niche, 'location': location}
+                for niche, location in queries]
+
+    def run_query(self, task: Dict) -> Dict:
+        """
+        Search one query of the campaign
+
+        Args:
+            task (Dict): Task with 'niche' and 'location', plus the job's 'cancel_check'
+
+        Returns:
+            Dict: 'leads' new to the campaign, plus 'niche', 'location',
+            'found', 'new' and 'duplicates' counts, 'searches' (SerpAPI
+            calls made) and their 'cost'
+        """
+        niche, location = task['niche'], task['location']
+
+        if self._incremental is not None:
+            result = self._incremental.search(niche, location, self.num_results)
+            leads = result['leads']
+            searches = 1 if result['fetched'] else 0
+        else:
+            leads = self._finder.search_leads(niche, location, self.num_results)
+            searches = 1
+
+        new_leads = []
+        with self._lock:
+            for lead in leads:
+                key = lead_key(lead)
+                if key not in self._seen:
+                    self._seen.add(key)
+                    new_leads.append(lead)
+
+        if self.enricher is not None and new_leads:
+            new_leads = self.enricher.enrich_leads(new_leads, task.get('cancel_check'))
+
+        return {
+            'leads': new_leads,
+            'niche': niche,
+            'location': location,
+            'found': len(leads),
+            'new': len(new_leads),
+            'duplicates': len(leads) - len(new_leads),
+            'searches': searches,
+            'cost': searches * self.search_cost
+        }
+
+
+def summarize(results: Iterable[Optional[Dict]]) -> Dict:
+    """
+    Campaign totals from the run_query results of finished queries
+
+    Args:
+        results (Iterable[Optional[Dict]]): run_query results, None for queries that didn't finish
+
+    Returns:
+        Dict: 'queries' finished, and totals of 'found', 'new', 'duplicates', 'searches' and 'cost'
+    """
+    totals = {'queries': 0, 'found': 0, 'new': 0, 'duplicates': 0, 'searches': 0, 'cost': 0.0}
+    for result in results:
+        if result is None:
+            continue
+        totals['queries'] += 1
+        for field in ('found', 'new', 'duplicates', 'searches', 'cost'):
+            totals[field] += result[field]
+    return totals
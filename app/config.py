@@ -1,5 +1,22 @@
 import os
-from typing import Optional
+from typing import Dict, Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    """Integer environment variable, or the default if it is unset or not a number"""
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Float environment variable, or the default if it is unset or not a number"""
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
 
 class Config:
     """Configuration class for the Lead Finder Automation app"""
@@ -10,13 +27,50 @@ class Config:
     
     # Google Sheets Configuration
     GOOGLE_SHEETS_CREDENTIALS_PATH: Optional[str] = None
+    TOKEN_CACHE_PATH: Optional[str] = None  # Encrypted access token cache shared by workers
+    TOKEN_CACHE_SECRET: Optional[str] = None  # Secret used to encrypt the token cache
     DEFAULT_SPREADSHEET_ID: Optional[str] = None
     DEFAULT_SHEET_NAME: str = "Leads"
+    SHEETS_READ_REQUESTS_PER_MINUTE: int = 60  # Per-minute read quota shared by the process
+    SHEETS_WRITE_REQUESTS_PER_MINUTE: int = 60  # Per-minute write quota shared by the process
+    SHEETS_MAX_RETRIES: int = 5  # Retries for requests rejected with 429/503
+    SHEETS_MAX_CONCURRENCY: int = 8  # Sheets operations in flight at once for concurrent writers
+    SHEETS_READ_CACHE_MB: int = 64  # Memory budget for cached sheet contents
+    
+    # Local Lead Store
+    LEAD_STORE_PATH: str = "leads.db"  # SQLite database holding every lead found
+    QUERY_REFRESH_HOURS: float = 168.0  # Re-fetch a query once its last fetch is older than this
+    NICHE_REFRESH_HOURS: Dict[str, float] = {}  # Per-niche overrides of QUERY_REFRESH_HOURS
+    
+    # Raw Response Archive
+    RESPONSE_ARCHIVE_DIR: str = "response_archive"  # Compressed raw SerpAPI responses for replay
+    RESPONSE_ARCHIVE_MAX_MB: int = 0  # Oldest segments are deleted beyond this size, 0 for no limit
+    RESPONSE_ARCHIVE_MAX_AGE_DAYS: float = 0.0  # Segments older than this are deleted, 0 for no limit
+    
+    # Website Enrichment
+    ENRICH_MAX_CONCURRENCY: int = 16  # Website fetches in flight at once
+    ENRICH_HOST_CONCURRENCY: int = 2  # Fetches in flight at once per host
+    ENRICH_HOST_DELAY: float = 1.0  # Minimum seconds between requests to the same host
+    ENRICH_TIMEOUT: float = 10.0  # Seconds allowed per page fetch
+    ENRICH_MAX_PAGE_KB: int = 1024  # Larger pages are truncated
+    PAGE_CACHE_PATH: str = "page_cache.db"  # Fetched pages kept for conditional re-fetches
+    PAGE_CACHE_MB: int = 256  # Disk budget for compressed cached pages
     
     # Search Configuration
     DEFAULT_NUM_RESULTS: int = 20
     MAX_NUM_RESULTS: int = 100
     SEARCH_DELAY: float = 1.0  # Delay between searches in seconds
+    SEARCH_CACHE_TTL: int = 900  # Seconds the app reuses results of an identical search
+    SERPAPI_SEARCH_COST: float = 0.015  # Cost of one SerpAPI search, for campaign estimates
+    
+    # Bulk Campaigns
+    CAMPAIGN_MAX_QUERIES: int = 200  # Queries allowed in one campaign
+    CAMPAIGN_MAX_CONCURRENCY: int = 4  # Queries of a campaign searched at once
+    
+    # Background Jobs
+    JOB_MAX_WORKERS: int = 4  # Searches and saves running at once across all sessions
+    JOB_MAX_PER_SESSION: int = 2  # Unfinished jobs one browser session may have
+    JOB_MAX_ACTIVE: int = 16  # Unfinished jobs (running or queued) across all sessions
     
     # Data Processing
     ENABLE_DATA_CLEANING: bool = True
@@ -38,6 +92,11 @@ class Config:
         cls.OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
         cls.GOOGLE_SHEETS_CREDENTIALS_PATH = os.getenv('GOOGLE_SHEETS_CREDENTIALS_PATH')
         cls.DEFAULT_SPREADSHEET_ID = os.getenv('DEFAULT_SPREADSHEET_ID')
+        cls.TOKEN_CACHE_PATH = os.getenv('TOKEN_CACHE_PATH')
+        cls.TOKEN_CACHE_SECRET = os.getenv('TOKEN_CACHE_SECRET')
+        
+        if os.getenv('LEAD_STORE_PATH'):
+            cls.LEAD_STORE_PATH = os.getenv('LEAD_STORE_PATH')
         
         # Optional settings
         if os.getenv('DEFAULT_SHEET_NAME'):
@@ -49,11 +108,52 @@ class Config:
             except ValueError:
                 pass
         
+        cls.SHEETS_READ_REQUESTS_PER_MINUTE = _env_int('SHEETS_READ_REQUESTS_PER_MINUTE', cls.SHEETS_READ_REQUESTS_PER_MINUTE)
+        cls.SHEETS_WRITE_REQUESTS_PER_MINUTE = _env_int('SHEETS_WRITE_REQUESTS_PER_MINUTE', cls.SHEETS_WRITE_REQUESTS_PER_MINUTE)
+        cls.SHEETS_MAX_RETRIES = _env_int('SHEETS_MAX_RETRIES', cls.SHEETS_MAX_RETRIES)
+        cls.SHEETS_MAX_CONCURRENCY = _env_int('SHEETS_MAX_CONCURRENCY', cls.SHEETS_MAX_CONCURRENCY)
+        cls.SHEETS_READ_CACHE_MB = _env_int('SHEETS_READ_CACHE_MB', cls.SHEETS_READ_CACHE_MB)
+        cls.QUERY_REFRESH_HOURS = _env_float('QUERY_REFRESH_HOURS', cls.QUERY_REFRESH_HOURS)
+        
+        # Format: "Dentists=72,Restaurants=24"
+        if os.getenv('NICHE_REFRESH_HOURS'):
+            for entry in os.getenv('NICHE_REFRESH_HOURS').split(','):
+                niche, _, hours = entry.partition('=')
+                try:
+                    cls.NICHE_REFRESH_HOURS[niche.strip().lower()] = float(hours)
+                except ValueError:
+                    pass
+        
+        cls.ENRICH_MAX_CONCURRENCY = _env_int('ENRICH_MAX_CONCURRENCY', cls.ENRICH_MAX_CONCURRENCY)
+        cls.ENRICH_HOST_CONCURRENCY = _env_int('ENRICH_HOST_CONCURRENCY', cls.ENRICH_HOST_CONCURRENCY)
+        cls.ENRICH_HOST_DELAY = _env_float('ENRICH_HOST_DELAY', cls.ENRICH_HOST_DELAY)
+        cls.ENRICH_TIMEOUT = _env_float('ENRICH_TIMEOUT', cls.ENRICH_TIMEOUT)
+        cls.ENRICH_MAX_PAGE_KB = _env_int('ENRICH_MAX_PAGE_KB', cls.ENRICH_MAX_PAGE_KB)
+        
+        if os.getenv('RESPONSE_ARCHIVE_DIR'):
+            cls.RESPONSE_ARCHIVE_DIR = os.getenv('RESPONSE_ARCHIVE_DIR')
+        
+        cls.RESPONSE_ARCHIVE_MAX_MB = _env_int('RESPONSE_ARCHIVE_MAX_MB', cls.RESPONSE_ARCHIVE_MAX_MB)
+        cls.RESPONSE_ARCHIVE_MAX_AGE_DAYS = _env_float('RESPONSE_ARCHIVE_MAX_AGE_DAYS', cls.RESPONSE_ARCHIVE_MAX_AGE_DAYS)
+        
+        if os.getenv('PAGE_CACHE_PATH'):
+            cls.PAGE_CACHE_PATH = os.getenv('PAGE_CACHE_PATH')
+        
+        cls.PAGE_CACHE_MB = _env_int('PAGE_CACHE_MB', cls.PAGE_CACHE_MB)
+        cls.SERPAPI_SEARCH_COST = _env_float('SERPAPI_SEARCH_COST', cls.SERPAPI_SEARCH_COST)
+        cls.CAMPAIGN_MAX_QUERIES = _env_int('CAMPAIGN_MAX_QUERIES', cls.CAMPAIGN_MAX_QUERIES)
+        cls.CAMPAIGN_MAX_CONCURRENCY = _env_int('CAMPAIGN_MAX_CONCURRENCY', cls.CAMPAIGN_MAX_CONCURRENCY)
+        cls.JOB_MAX_WORKERS = _env_int('JOB_MAX_WORKERS', cls.JOB_MAX_WORKERS)
+        cls.JOB_MAX_PER_SESSION = _env_int('JOB_MAX_PER_SESSION', cls.JOB_MAX_PER_SESSION)
+        cls.JOB_MAX_ACTIVE = _env_int('JOB_MAX_ACTIVE', cls.JOB_MAX_ACTIVE)
+        
         if os.getenv('SEARCH_DELAY'):
             try:
                 cls.SEARCH_DELAY = float(os.getenv('SEARCH_DELAY'))
             except ValueError:
                 pass
+        
+        cls.SEARCH_CACHE_TTL = _env_int('SEARCH_CACHE_TTL', cls.SEARCH_CACHE_TTL)
     
     @classmethod
     def validate_config(cls) -> bool:
@@ -0,0 +1,553 @@
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import gspread
+from gspread.utils import a1_range_to_grid_range, rowcol_to_a1
+
+from sheets_backend import SheetsBackend
+
+# Google Sheets limit on the number of cells in one spreadsheet
+MAX_CELLS_PER_SPREADSHEET = 10_000_000
+
+_ERROR_STATUS = {
+    400: 'INVALID_ARGUMENT',
+    404: 'NOT_FOUND',
+    429: 'RESOURCE_EXHAUSTED',
+    503: 'UNAVAILABLE'
+}
+
+
+class FakeResponse:
+    """Minimal stand-in for the HTTP response carried by gspread's APIError"""
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.text = message
+        self.headers = {}
+
+    def json(self) -> Dict:
+        return {'error': {
+            'code': self.status_code,
+            'message': self.text,
+            'status': _ERROR_STATUS.get(self.status_code, 'UNKNOWN')
+        }}
+
+
+def _api_error(status_code: int, message: str) -> gspread.exceptions.APIError:
+    """Build the same exception gspread raises for an API error response"""
+    return gspread.exceptions.APIError(FakeResponse(status_code, message))
+
+
+def _payload_size(payload: Any) -> int:
+    """Approximate the JSON size of a request or response body in bytes"""
+    if payload is None:
+        return 0
+    return len(json.dumps(payload, default=str))
+
+
+def _cell_value(value: Any) -> str:
+    """Store a written value the way the API hands it back"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return str(value)
+
+
+def _trim(values: List[List[str]]) -> List[List[str]]:
+    """Drop trailing empty cells and rows, as the values API does"""
+    rows = []
+    for row in values:
+        end = len(row)
+        while end and row[end - 1] == '':
+            end -= 1
+        rows.append(row[:end])
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+class FakeSheetsBackend(SheetsBackend):
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, error_status: int = 429,
+                 quota_per_minute: Optional[int] = None, seed: Optional[int] = None):
+        """
+        In-memory Google Sheets backend for tests and benchmarks
+
+        Spreadsheets live in memory and follow the worksheet semantics the
+        writer relies on: grid limits, clear, update, append, batch updates and
+        batch formatting. Every simulated API round trip is counted together
+        with its request and response payload sizes.
+
+        Args:
+            latency (float): Seconds to sleep per API call
+            error_rate (float): Probability that a call fails with error_status
+            error_status (int): Status code for injected errors (429 or 503)
+            quota_per_minute (int): Fail calls with 429 beyond this many per minute
+            seed (int): Seed for the error injection random generator
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.quota_per_minute = quota_per_minute
+        self.spreadsheets: Dict[str, 'FakeSpreadsheet'] = {}
+        self.stats: Dict[str, Any] = {}
+        self.reset_stats()
+
+        self._lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._call_times = deque()
+        self._forced_errors = deque()
+        self._next_id = 0
+
+    def fingerprint(self, source: Any) -> str:
+        return f"fake:{id(self)}"
+
+    def load_credentials(self, source: Any, scopes: List[str]) -> None:
+        return None
+
+    def authorize(self, credentials: Any) -> 'FakeClient':
+        return FakeClient(self)
+
+    def reset_stats(self):
+        """Reset call and payload counters"""
+        self.stats = {
+            'calls': 0,
+            'errors': 0,
+            'request_bytes': 0,
+            'response_bytes': 0,
+            'by_method': Counter()
+        }
+
+    def fail_next(self, count: int = 1, status: int = 429):
+        """
+        Make the next API calls fail
+
+        Args:
+            count (int): Number of calls to fail
+            status (int): Status code to fail them with
+        """
+        with self._lock:
+            self._forced_errors.extend([status] * count)
+
+    def add_spreadsheet(self, title: str = "Fake Spreadsheet", spreadsheet_id: str = None) -> 'FakeSpreadsheet':
+        """
+        Create a spreadsheet directly, without counting an API call
+
+        Args:
+            title (str): Spreadsheet title
+            spreadsheet_id (str): ID to use, generated if omitted
+
+        Returns:
+            FakeSpreadsheet: The new spreadsheet with an empty 'Sheet1'
+        """
+        with self._lock:
+            if spreadsheet_id is None:
+                spreadsheet_id = f"fake-spreadsheet-{self._new_id()}"
+            spreadsheet = FakeSpreadsheet(self, spreadsheet_id, title)
+            spreadsheet._add_sheet('Sheet1', 1000, 26)
+            self.spreadsheets[spreadsheet_id] = spreadsheet
+            return spreadsheet
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def _injected_error(self) -> Optional[int]:
+        """Decide whether the current call fails, returning its status code"""
+        if self._forced_errors:
+            return self._forced_errors.popleft()
+
+        if self.quota_per_minute is not None:
+            now = time.monotonic()
+            while self._call_times and now - self._call_times[0] >= 60:
+                self._call_times.popleft()
+            if len(self._call_times) >= self.quota_per_minute:
+                return 429
+            self._call_times.append(now)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_status
+
+        return None
+
+    def _call(self, method: str, request: Any, operation: Callable[[], Any]) -> Any:
+        """
+        Simulate one API round trip
+
+        Args:
+            method (str): API method name used for accounting
+            request (Any): Request payload, for byte accounting
+            operation (Callable): Applies the call to the in-memory state
+
+        Returns:
+            Any: Result of the operation
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['by_method'][method] += 1
+            self.stats['request_bytes'] += _payload_size(request)
+
+            status = self._injected_error()
+            if status is not None:
+                self.stats['errors'] += 1
+                raise _api_error(status, f"Simulated error for {method}")
+
+            result = operation()
+            self.stats['response_bytes'] += _payload_size(result)
+            return result
+
+
+class FakeClient:
+    """gspread.Client stand-in backed by a FakeSheetsBackend"""
+
+    def __init__(self, backend: FakeSheetsBackend):
+        self.backend = backend
+
+    def open_by_key(self, key: str) -> 'FakeSpreadsheet':
+        def operation():
+            spreadsheet = self.backend.spreadsheets.get(key)
+            if spreadsheet is None:
+                raise gspread.SpreadsheetNotFound(key)
+            return spreadsheet
+        return self.backend._call('open_by_key', {'id': key}, operation)
+
+    def create(self, title: str) -> 'FakeSpreadsheet':
+        return self.backend._call('create', {'title': title}, lambda: self.backend.add_spreadsheet(title))
+
+
+class FakeSpreadsheet:
+    """gspread.Spreadsheet stand-in"""
+
+    def __init__(self, backend: FakeSheetsBackend, spreadsheet_id: str, title: str):
+        self.backend = backend
+        self.client = FakeClient(backend)
+        self.id = spreadsheet_id
+        self.title = title
+        self.permissions: List[Dict] = []
+        self._sheets: List['FakeWorksheet'] = []
+        self._revision = 0
+
+    def _touch(self):
+        self._revision += 1
+
+    def _add_sheet(self, title: str, rows: int, cols: int, index: int = None) -> 'FakeWorksheet':
+        if any(sheet.title == title for sheet in self._sheets):
+            raise _api_error(400, f"A sheet with the name \"{title}\" already exists.")
+        self._check_cells(extra=rows * cols)
+
+        worksheet = FakeWorksheet(self, self.backend._new_id(), title, rows, cols)
+        self._sheets.insert(len(self._sheets) if index is None else index, worksheet)
+        self._touch()
+        return worksheet
+
+    def _check_cells(self, extra: int = 0):
+        total = sum(sheet.row_count * sheet.col_count for sheet in self._sheets) + extra
+        if total > MAX_CELLS_PER_SPREADSHEET:
+            raise _api_error(400, f"This action would increase the number of cells in the workbook "
+                                  f"above the limit of {MAX_CELLS_PER_SPREADSHEET} cells.")
+
+    def _sheet_by_id(self, sheet_id: int) -> 'FakeWorksheet':
+        for sheet in self._sheets:
+            if sheet.id == sheet_id:
+                return sheet
+        raise _api_error(400, f"No grid with id: {sheet_id}")
+
+    def fetch_sheet_metadata(self) -> Dict:
+        return self.backend._call('fetch_sheet_metadata', None, lambda: {
+            'sheets': [{'properties': sheet._properties()} for sheet in self._sheets]
+        })
+
+    def worksheets(self) -> List['FakeWorksheet']:
+        return self.backend._call('fetch_sheet_metadata', None, lambda: list(self._sheets))
+
+    def worksheet(self, title: str) -> 'FakeWorksheet':
+        def operation():
+            for sheet in self._sheets:
+                if sheet.title == title:
+                    return sheet
+            raise gspread.WorksheetNotFound(title)
+        return self.backend._call('fetch_sheet_metadata', None, operation)
+
+    def add_worksheet(self, title: str, rows: int, cols: int, index: int = None) -> 'FakeWorksheet':
+        request = {'addSheet': {'properties': {'title': title, 'rows': rows, 'cols': cols}}}
+        return self.backend._call('batch_update', request, lambda: self._add_sheet(title, rows, cols, index))
+
+    def del_worksheet(self, worksheet: 'FakeWorksheet'):
+        def operation():
+            self._sheets.remove(self._sheet_by_id(worksheet.id))
+            self._touch()
+        return self.backend._call('batch_update', {'deleteSheet': {'sheetId': worksheet.id}}, operation)
+
+    def batch_update(self, body: Dict) -> Dict:
+        return self.backend._call('batch_update', body, lambda: self._apply_requests(body.get('requests', [])))
+
+    def _apply_requests(self, requests: List[Dict]) -> Dict:
+        replies = []
+        for request in requests:
+            (kind, params), = request.items()
+
+            if kind == 'addSheet':
+                properties = params.get('properties', {})
+                grid = properties.get('gridProperties', {})
+                sheet = self._add_sheet(properties['title'], grid.get('rowCount', 1000),
+                                        grid.get('columnCount', 26), properties.get('index'))
+                replies.append({'addSheet': {'properties': sheet._properties()}})
+                continue
+
+            if kind == 'deleteSheet':
+                self._sheets.remove(self._sheet_by_id(params['sheetId']))
+            elif kind in ('repeatCell', 'updateBorders'):
+                grid_range = params['range']
+                self._sheet_by_id(grid_range['sheetId']).formats.append((grid_range, params))
+            elif kind == 'updateDimensionProperties':
+                grid_range = params['range']
+                sheet = self._sheet_by_id(grid_range['sheetId'])
+                properties = params.get('properties', {})
+                if grid_range['dimension'] == 'COLUMNS':
+                    for col in range(grid_range['startIndex'], grid_range['endIndex']):
+                        if 'pixelSize' in properties:
+                            sheet.column_widths[col] = properties['pixelSize']
+                        if 'hiddenByUser' in properties:
+                            if properties['hiddenByUser']:
+                                sheet.hidden_columns.add(col)
+                            else:
+                                sheet.hidden_columns.discard(col)
+            elif kind == 'deleteDimension':
+                grid_range = params['range']
+                sheet = self._sheet_by_id(grid_range['sheetId'])
+                if grid_range['dimension'] == 'ROWS':
+                    sheet._delete_rows(grid_range['startIndex'], grid_range['endIndex'])
+            elif kind == 'appendDimension':
+                sheet = self._sheet_by_id(params['sheetId'])
+                if params['dimension'] == 'ROWS':
+                    sheet._resize(rows=sheet.row_count + params['length'])
+                else:
+                    sheet._resize(cols=sheet.col_count + params['length'])
+            else:
+                raise _api_error(400, f"Unsupported request in fake backend: {kind}")
+
+            replies.append({})
+
+        self._touch()
+        return {'spreadsheetId': self.id, 'replies': replies}
+
+    def get_lastUpdateTime(self) -> str:
+        # Drive reports modifiedTime, derive a monotonically increasing one
+        def operation():
+            modified = datetime(2024, 1, 1) + timedelta(milliseconds=self._revision)
+            return modified.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+        return self.backend._call('drive_files_get', None, operation)
+
+    def share(self, email: str, perm_type: str = 'user', role: str = 'writer', **kwargs):
+        permission = {'emailAddress': email, 'type': perm_type, 'role': role}
+        return self.backend._call('drive_permissions_create', permission,
+                                  lambda: self.permissions.append(permission))
+
+
+class FakeWorksheet:
+    """gspread.Worksheet stand-in holding cell values in memory"""
+
+    def __init__(self, spreadsheet: FakeSpreadsheet, sheet_id: int, title: str, rows: int, cols: int):
+        self.spreadsheet = spreadsheet
+        self.client = spreadsheet.client
+        self.id = sheet_id
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self.formats: List = []
+        self.column_widths: Dict[int, int] = {}
+        self.hidden_columns = set()
+        self._cells: List[List[str]] = []
+
+    @property
+    def _backend(self) -> FakeSheetsBackend:
+        return self.spreadsheet.backend
+
+    def _properties(self) -> Dict:
+        return {
+            'sheetId': self.id,
+            'title': self.title,
+            'gridProperties': {'rowCount': self.row_count, 'columnCount': self.col_count}
+        }
+
+    def _grid_range(self, range_name: str) -> Dict:
+        """Parse an A1 range (optionally sheet-qualified) into 0-based bounds"""
+        grid = a1_range_to_grid_range(range_name.split('!')[-1])
+        return {
+            'start_row': grid.get('startRowIndex', 0),
+            'end_row': grid.get('endRowIndex', self.row_count),
+            'start_col': grid.get('startColumnIndex', 0),
+            'end_col': grid.get('endColumnIndex', self.col_count)
+        }
+
+    def _check_grid(self, end_row: int, end_col: int):
+        if end_row > self.row_count or end_col > self.col_count:
+            raise _api_error(400, f"Range ('{self.title}'!{rowcol_to_a1(end_row, end_col)}) exceeds grid limits. "
+                                  f"Max rows: {self.row_count}, max columns: {self.col_count}")
+
+    def _write(self, start_row: int, start_col: int, values: List[List]):
+        for offset, row in enumerate(values):
+            index = start_row + offset
+            while len(self._cells) <= index:
+                self._cells.append([])
+            line = self._cells[index]
+            if len(line) < start_col + len(row):
+                line.extend([''] * (start_col + len(row) - len(line)))
+            for col, value in enumerate(row):
+                line[start_col + col] = _cell_value(value)
+
+    def _read(self, range_name: str) -> List[List[str]]:
+        bounds = self._grid_range(range_name)
+        rows = self._cells[bounds['start_row']:min(bounds['end_row'], self.row_count)]
+        return _trim([list(row[bounds['start_col']:bounds['end_col']]) for row in rows])
+
+    def _validate_write(self, range_name: str, values: List[List]) -> Dict:
+        bounds = self._grid_range(range_name)
+        width = max((len(row) for row in values), default=0)
+        self._check_grid(bounds['start_row'] + len(values), bounds['start_col'] + width)
+        return bounds
+
+    def _delete_rows(self, start_index: int, end_index: int):
+        if end_index - start_index >= self.row_count:
+            raise _api_error(400, "You can't delete all the rows on the sheet.")
+        del self._cells[start_index:end_index]
+        self.row_count -= end_index - start_index
+
+    def _resize(self, rows: int = None, cols: int = None):
+        if rows is not None:
+            self.spreadsheet._check_cells(extra=(rows - self.row_count) * self.col_count)
+            self.row_count = rows
+            del self._cells[rows:]
+        if cols is not None:
+            self.spreadsheet._check_cells(extra=(cols - self.col_count) * self.row_count)
+            self.col_count = cols
+            for line in self._cells:
+                del line[cols:]
+
+    def update(self, range_name: Any = None, values: Any = None, **kwargs) -> Dict:
+        # gspread accepts both update(range, values) and update(values, range)
+        if isinstance(range_name, list):
+            range_name, values = values, range_name
+        range_name = range_name or 'A1'
+
+        def operation():
+            bounds = self._validate_write(range_name, values)
+            self._write(bounds['start_row'], bounds['start_col'], values)
+            self.spreadsheet._touch()
+            return {'updatedRange': f"'{self.title}'!{range_name}", 'updatedCells': sum(map(len, values))}
+
+        return self._backend._call('values_update', {'range': range_name, 'values': values}, operation)
+
+    def batch_update(self, data: List[Dict], **kwargs) -> Dict:
+        def operation():
+            # Validate every range before writing, the API applies all or nothing
+            writes = [(self._validate_write(item['range'], item['values']), item['values']) for item in data]
+            for bounds, values in writes:
+                self._write(bounds['start_row'], bounds['start_col'], values)
+            self.spreadsheet._touch()
+            return {'totalUpdatedCells': sum(sum(map(len, values)) for _, values in writes)}
+
+        return self._backend._call('values_batch_update', {'data': data}, operation)
+
+    def append_rows(self, values: List[List], value_input_option: str = 'RAW',
+                    insert_data_option: str = None, table_range: str = None, **kwargs) -> Dict:
+        def operation():
+            start_row = len(_trim(self._cells))
+            width = max((len(row) for row in values), default=0)
+            if width > self.col_count:
+                self._check_grid(start_row + len(values), width)
+
+            # Appending grows the grid instead of failing
+            if start_row + len(values) > self.row_count:
+                self._resize(rows=start_row + len(values))
+
+            self._write(start_row, 0, values)
+            self.spreadsheet._touch()
+            updated_range = f"'{self.title}'!A{start_row + 1}:{rowcol_to_a1(start_row + len(values), max(width, 1))}"
+            return {'updates': {'updatedRange': updated_range, 'updatedRows': len(values)}}
+
+        return self._backend._call('values_append', {'values': values}, operation)
+
+    def append_row(self, values: List, **kwargs) -> Dict:
+        return self.append_rows([values], **kwargs)
+
+    def get(self, range_name: str = None, **kwargs) -> List[List[str]]:
+        range_name = range_name or f"A1:{rowcol_to_a1(self.row_count, self.col_count)}"
+        return self._backend._call('values_get', {'range': range_name}, lambda: self._read(range_name))
+
+    def batch_get(self, ranges: List[str], **kwargs) -> List[List[List[str]]]:
+        return self._backend._call('values_batch_get', {'ranges': ranges},
+                                   lambda: [self._read(range_name) for range_name in ranges])
+
+    def get_all_values(self, **kwargs) -> List[List[str]]:
+        def operation():
+            rows = _trim(self._cells)
+            width = max((len(row) for row in rows), default=0)
+            return [row + [''] * (width - len(row)) for row in rows]
+
+        return self._backend._call('values_get', None, operation)
+
+    def get_values(self, range_name: str = None, **kwargs) -> List[List[str]]:
+        if range_name is None:
+            return self.get_all_values()
+        return self.get(range_name)
+
+    def row_values(self, row: int, **kwargs) -> List[str]:
+        return self._backend._call('values_get', {'range': f"{row}:{row}"},
+                                   lambda: (self._read(f"{row}:{row}") or [[]])[0])
+
+    def col_values(self, col: int, **kwargs) -> List[str]:
+        letter = rowcol_to_a1(1, col)[:-1]
+        return self._backend._call('values_get', {'range': f"{letter}:{letter}"},
+                                   lambda: [row[0] if row else '' for row in self._read(f"{letter}:{letter}")])
+
+    def clear(self) -> Dict:
+        def operation():
+            self._cells = []
+            self.spreadsheet._touch()
+            return {'clearedRange': f"'{self.title}'"}
+
+        return self._backend._call('values_clear', None, operation)
+
+    def delete_rows(self, start_index: int, end_index: int = None) -> Dict:
+        end_index = end_index or start_index
+        request = {'deleteDimension': {'range': {
+            'sheetId': self.id,
+            'dimension': 'ROWS',
+            'startIndex': start_index - 1,
+            'endIndex': end_index
+        }}}
+        return self.spreadsheet.batch_update({'requests': [request]})
+
+    def add_rows(self, rows: int) -> Dict:
+        return self.resize(rows=self.row_count + rows)
+
+    def resize(self, rows: int = None, cols: int = None) -> Dict:
+        def operation():
+            self._resize(rows, cols)
+            self.spreadsheet._touch()
+            return {'replies': [{}]}
+
+        return self._backend._call('batch_update', {'rows': rows, 'cols': cols}, operation)
+
+    def format(self, ranges: Any, format: Dict) -> Dict:
+        ranges = [ranges] if isinstance(ranges, str) else ranges
+        return self.batch_format([{'range': range_name, 'format': format} for range_name in ranges])
+
+    def batch_format(self, formats: List[Dict]) -> Dict:
+        def operation():
+            for item in formats:
+                self._grid_range(item['range'])
+                self.formats.append((item['range'], item['format']))
+            self.spreadsheet._touch()
+            return {'replies': [{} for _ in formats]}
+
+        return self._backend._call('batch_update', {'formats': formats}, operation)
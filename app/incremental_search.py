@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+from lead_schema import LEAD_HEADERS, lead_key, lead_row, normalize_query, row_digest
+from lead_search import LeadFinder
+from lead_store import LeadStore
+
+
+class IncrementalSearch:
+    def __init__(self, lead_finder: LeadFinder, store: Optional[LeadStore] = None,
+                 refresh_hours: Optional[float] = None,
+                 niche_refresh_hours: Optional[Dict[str, float]] = None):
+        """
+        Re-run searches only when they are stale and report what changed
+
+        Every fetch is recorded in the lead store with the keys of the leads
+        it returned. A query is fetched again only once its last fetch is
+        older than the freshness window for its niche, and the new results
+        are diffed against the stored leads so that only additions, changes
+        and disappearances need to be written downstream.
+
+        Args:
+            lead_finder (LeadFinder): Finder used for stale queries
+            store (LeadStore): Lead store, defaults to Config.LEAD_STORE_PATH
+            refresh_hours (float): Default freshness window in hours
+            niche_refresh_hours (Dict[str, float]): Freshness window by niche (case-insensitive)
+        """
+        self.lead_finder = lead_finder
+        self.store = store or LeadStore()
+        self.refresh_hours = Config.QUERY_REFRESH_HOURS if refresh_hours is None else refresh_hours
+        overrides = Config.NICHE_REFRESH_HOURS if niche_refresh_hours is None else niche_refresh_hours
+        self.niche_refresh_hours = {niche.strip().lower(): hours for niche, hours in overrides.items()}
+
+    def freshness_window(self, niche: str) -> timedelta:
+        """Get how long results for a niche stay fresh"""
+        hours = self.niche_refresh_hours.get((niche or '').strip().lower(), self.refresh_hours)
+        return timedelta(hours=hours)
+
+    def is_stale(self, niche: str, location: str, num_results: int = 20) -> bool:
+        """
+        Check whether a query needs to be fetched again
+
+        Args:
+            niche (str): Business niche/category
+            location (str): Location to search in
+            num_results (int): Number of results requested
+
+        Returns:
+            bool: True if never fetched or older than the niche's freshness window
+        """
+        query = self.store.get_query(normalize_query(niche, location, num_results))
+        if query is None:
+            return True
+        return datetime.now() - query['last_fetched'] >= self.freshness_window(niche)
+
+    def search(self, niche: str, location: str, num_results: int = 20, force: bool = False) -> Dict:
+        """
+        Search a query incrementally
+
+        Args:
+            niche (str): Business niche/category
+            location (str): Location to search in
+            num_results (int): Number of results to fetch
+            force (bool): Fetch even if the last fetch is still fresh
+
+        Returns:
+            Dict: Delta with keys
+                'fetched' (bool): whether SerpAPI was called,
+                'leads' (List[Dict]): current leads for the query,
+                'added' / 'changed' (List[Dict]): leads new to the query or with changed content,
+                'removed' (List[Dict]): stored leads the query no longer returns,
+                'unchanged' (int): number of leads that didn't change
+        """
+        query_key = normalize_query(niche, location, num_results)
+        previous = self.store.get_query(query_key)
+        previous_keys = previous['lead_keys'] if previous else []
+
+        if previous is not None and not force and \
+                datetime.now() - previous['last_fetched'] < self.freshness_window(niche):
+            return self._delta(False, self.store.get_leads_by_keys(previous_keys))
+
+        leads = self.lead_finder.search_leads(niche, location, num_results)
+        if not leads:
+            # search_leads returns [] on errors too, so don't treat an empty
+            # response as every lead disappearing
+            return self._delta(True, self.store.get_leads_by_keys(previous_keys))
+
+        # Deduplicate within the response, keeping the first occurrence
+        current: Dict[str, Tuple[Dict, str]] = {}
+        for lead in leads:
+            key = lead_key(lead)
+            if key not in current:
+                current[key] = (lead, row_digest(lead_row(lead), LEAD_HEADERS))
+
+        previous_set = set(previous_keys)
+        stored_digests = self.store.get_digests(current.keys())
+
+        added, changed = [], []
+        for key, (lead, digest) in current.items():
+            if key not in previous_set:
+                added.append(lead)
+            elif stored_digests.get(key) != digest:
+                changed.append(lead)
+
+        removed_keys = [key for key in previous_keys if key not in current]
+        removed = self.store.get_leads_by_keys(removed_keys)
+
+        # Only new and changed leads cost a write
+        self.store.add_leads(added + changed)
+        self.store.record_query(query_key, niche, location, num_results, list(current.keys()))
+
+        delta = self._delta(True, [lead for lead, _ in current.values()])
+        delta.update({
+            'added': added,
+            'changed': changed,
+            'removed': removed,
+            'unchanged': len(current) - len(added) - len(changed)
+        })
+        return delta
+
+    def search_many(self, queries: Iterable[Tuple[str, str, int]], force: bool = False) -> List[Dict]:
+        """
+        Search several queries incrementally
+
+        Args:
+            queries (Iterable[Tuple[str, str, int]]): (niche, location, num_results) tuples
+            force (bool): Fetch even if the last fetch is still fresh
+
+        Returns:
+            List[Dict]: One delta per query, see search()
+        """
+        return [self.search(niche, location, num_results, force) for niche, location, num_results in queries]
+
+    @staticmethod
+    def _delta(fetched: bool, leads: List[Dict]) -> Dict:
+        """Build a delta in which nothing changed"""
+        return {
+            'fetched': fetched,
+            'leads': leads,
+            'added': [],
+            'changed': [],
+            'removed': [],
+            'unchanged': len(leads)
+        }
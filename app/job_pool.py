@@ -0,0 +1,317 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+
+# Job and task states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+# Task function signature: (task arguments) -> result. A list result, or the 'leads'
+# of a dict result, is streamed into the job's leads as soon as the task finishes.
+# The arguments also carry 'cancel_check', which long tasks call between steps.
+TaskFunction = Callable[[Dict], Any]
+
+
+def _result_leads(result: Any) -> List[Dict]:
+    """Leads carried by a task result: the list itself, or a dict's 'leads'"""
+    if isinstance(result, list):
+        return result
+    if isinstance(result, dict):
+        return result.get('leads') or []
+    return []
+
+
+class JobLimitError(RuntimeError):
+    """Raised when a session or the whole process already has its maximum of active jobs"""
+
+
+class JobCancelled(Exception):
+    """Raised by a job's cancel check to stop a task that is already running"""
+
+
+class Job:
+    def __init__(self, session_id: str, label: str, func: TaskFunction, tasks: List[Dict],
+                 concurrency: int = 1):
+        """
+        A background run of one or more tasks, e.g. one search per query
+
+        Tasks run in order, up to concurrency at a time; leads found by each
+        task are appended as soon as it finishes, so readers can show partial
+        results while the rest is still running. Cancellation is checked
+        before each task starts, and running tasks get a 'cancel_check' in
+        their arguments that raises JobCancelled once the job is cancelled.
+
+        Args:
+            session_id (str): Session that submitted the job
+            label (str): Short description shown in the UI
+            func (TaskFunction): Called with each task's arguments
+            tasks (List[Dict]): Task arguments; a 'label' key names the task in progress reports
+            concurrency (int): Tasks of this job running at once
+        """
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.label = label
+        self.state = QUEUED
+        self.error: Optional[str] = None
+        self.results: List[Any] = [None] * len(tasks)
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.concurrency = max(1, concurrency)
+
+        self._func = func
+        self._args = tasks
+        self._tasks = [{'label': task.get('label', f"Task {index + 1}"), 'state': QUEUED,
+                        'leads': 0, 'seconds': None, 'error': None}
+                       for index, task in enumerate(tasks)]
+        self._leads: List[Dict] = []
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def cancel(self):
+        """Ask the job to stop; running tasks stop at their next cancel check, the remaining ones are skipped"""
+        self._cancel.set()
+    
+    def check_cancelled(self):
+        """Raise JobCancelled if the job was cancelled"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def leads_since(self, offset: int = 0) -> List[Dict]:
+        """
+        Leads found so far, starting at an offset
+
+        Args:
+            offset (int): Number of leads the caller already has
+
+        Returns:
+            List[Dict]: Leads found after the first offset ones
+        """
+        with self._lock:
+            return self._leads[offset:]
+
+    def progress(self) -> Dict:
+        """
+        Snapshot of the job's progress
+
+        Returns:
+            Dict: 'state', 'done' and 'total' tasks, 'fraction', 'leads',
+            'elapsed' and 'eta' seconds (None until a task has finished),
+            'error' and a copy of the per-task 'tasks' states
+        """
+        with self._lock:
+            tasks = [dict(task) for task in self._tasks]
+            leads = len(self._leads)
+
+        done = sum(1 for task in tasks if task['state'] in FINISHED_STATES)
+        total = len(tasks)
+        elapsed = None
+        eta = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            if done and not self.finished:
+                eta = elapsed / done * (total - done)
+
+        return {
+            'state': self.state,
+            'done': done,
+            'total': total,
+            'fraction': done / total if total else 1.0,
+            'leads': leads,
+            'elapsed': elapsed,
+            'eta': eta,
+            'error': self.error,
+            'tasks': tasks
+        }
+
+    def _run(self):
+        """Run the tasks on the calling worker thread, plus concurrency - 1 helper threads"""
+        self.started_at = time.time()
+        if self._cancel.is_set():
+            self._finish(CANCELLED)
+            return
+        self.state = RUNNING
+
+        if self.concurrency == 1 or len(self._args) <= 1:
+            for index in range(len(self._args)):
+                self._run_task(index)
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="lead-job-task") as executor:
+                list(executor.map(self._run_task, range(len(self._args))))
+
+        states = [task['state'] for task in self._tasks]
+        if CANCELLED in states:
+            self._finish(CANCELLED)
+        elif states and states.count(FAILED) == len(states):
+            self._finish(FAILED)
+        else:
+            self._finish(DONE)
+
+    def _run_task(self, index: int):
+        """Run one task, or skip it if the job was cancelled"""
+        task = self._tasks[index]
+        if self._cancel.is_set():
+            with self._lock:
+                task['state'] = CANCELLED
+            return
+
+        with self._lock:
+            task['state'] = RUNNING
+        started = time.time()
+        try:
+            result = self._func(dict(self._args[index], cancel_check=self.check_cancelled))
+        except JobCancelled:
+            with self._lock:
+                task.update(state=CANCELLED, seconds=time.time() - started)
+            return
+        except Exception as e:
+            with self._lock:
+                task.update(state=FAILED, error=str(e), seconds=time.time() - started)
+            self.error = str(e)
+            return
+
+        leads = _result_leads(result)
+        with self._lock:
+            self.results[index] = result
+            self._leads.extend(leads)
+            task.update(state=DONE, leads=len(leads), seconds=time.time() - started)
+
+    def _finish(self, state: str):
+        self.finished_at = time.time()
+        self.state = state
+
+
+class JobPool:
+    def __init__(self, max_workers: int = None, max_per_session: int = None,
+                 max_active: int = None, keep_finished: int = 10, finished_ttl: float = 3600):
+        """
+        Bounded pool of background jobs shared by every session of the app
+
+        At most max_workers jobs run at once; further jobs wait in the
+        queue. Submitting is refused once a session has max_per_session
+        unfinished jobs, or the whole process has max_active, so one session
+        can't fill the queue for everybody else.
+
+        Args:
+            max_workers (int): Jobs running at once, defaults to Config.JOB_MAX_WORKERS
+            max_per_session (int): Unfinished jobs allowed per session, defaults to Config.JOB_MAX_PER_SESSION
+            max_active (int): Unfinished jobs allowed in total, defaults to Config.JOB_MAX_ACTIVE
+            keep_finished (int): Finished jobs kept per session for display
+            finished_ttl (float): Seconds a finished job is kept at most, so
+                                  jobs of abandoned sessions are dropped too
+        """
+        self.max_workers = max_workers or Config.JOB_MAX_WORKERS
+        self.max_per_session = max_per_session or Config.JOB_MAX_PER_SESSION
+        self.max_active = max_active or Config.JOB_MAX_ACTIVE
+        self.keep_finished = keep_finished
+        self.finished_ttl = finished_ttl
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="lead-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session_id: str, label: str, func: TaskFunction, tasks: List[Dict],
+               concurrency: int = 1) -> Job:
+        """
+        Queue a job
+
+        Args:
+            session_id (str): Session submitting the job
+            label (str): Short description shown in the UI
+            func (TaskFunction): Called with each task's arguments
+            tasks (List[Dict]): Task arguments, started in order
+            concurrency (int): Tasks of the job running at once
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            JobLimitError: If the session or the process is at its job limit
+        """
+        with self._lock:
+            active = [job for job in self._jobs.values() if not job.finished]
+            if sum(1 for job in active if job.session_id == session_id) >= self.max_per_session:
+                raise JobLimitError(f"At most {self.max_per_session} jobs can run per session; "
+                                    f"wait for one to finish or cancel it")
+            if len(active) >= self.max_active:
+                raise JobLimitError("The app is busy with other jobs, please try again shortly")
+
+            self._prune()
+            job = Job(session_id, label, func, tasks, concurrency)
+            self._jobs[job.id] = job
+
+        self._executor.submit(job._run)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Job by ID, or None if unknown or pruned"""
+        return self._jobs.get(job_id)
+
+    def jobs(self, session_id: str) -> List[Job]:
+        """Jobs of one session, oldest first"""
+        with self._lock:
+            return [job for job in self._jobs.values() if job.session_id == session_id]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job
+
+        Returns:
+            bool: True if the job exists and had not finished yet
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def discard(self, job_id: str):
+        """Forget a finished job once its caller has taken the outcome"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+
+    def _prune(self):
+        """Forget finished jobs older than finished_ttl, and each session's oldest beyond keep_finished (lock held)"""
+        expired = time.time() - self.finished_ttl
+        by_session: Dict[str, List[Job]] = {}
+        for job in list(self._jobs.values()):
+            if not job.finished:
+                continue
+            if job.finished_at < expired:
+                del self._jobs[job.id]
+            else:
+                by_session.setdefault(job.session_id, []).append(job)
+        
+        for finished in by_session.values():
+            for job in finished[:max(0, len(finished) - self.keep_finished)]:
+                del self._jobs[job.id]
+
+    def stats(self) -> Dict:
+        """Queued, running and finished job counts"""
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+        return {
+            'queued': states.count(QUEUED),
+            'running': states.count(RUNNING),
+            'finished': sum(1 for state in states if state in FINISHED_STATES)
+        }
+
+    def shutdown(self):
+        """Cancel unfinished jobs and stop the workers"""
+        for job in list(self._jobs.values()):
+            job.cancel()
+        self._executor.shutdown(wait=True)
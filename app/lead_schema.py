@@ -0,0 +1,126 @@
+import hashlib
+import re
+from typing import Dict, List
+from urllib.parse import urlparse
+
+# Output columns as (sheet header, lead dictionary field), in column order
+LEAD_COLUMNS = [
+    ('Business Name', 'business_name'),
+    ('Website', 'website'),
+    ('Address', 'address'),
+    ('Phone', 'phone'),
+    ('Contact Info', 'contact_info'),
+    ('Niche', 'niche'),
+    ('Location', 'location'),
+    ('Description', 'description'),
+    ('Source URL', 'source_url'),
+    ('Search Date', 'search_date')
+]
+
+HEADER_TO_FIELD: Dict[str, str] = dict(LEAD_COLUMNS)
+LEAD_HEADERS: List[str] = [header for header, _ in LEAD_COLUMNS]
+LEAD_FIELDS: List[str] = [field for _, field in LEAD_COLUMNS]
+
+# Columns that change on every search and therefore don't count as a content change
+VOLATILE_FIELDS = {'search_date'}
+
+
+def lead_row(lead: Dict) -> List[str]:
+    """
+    Flatten a lead into text cells in column order
+
+    Args:
+        lead (Dict): Lead dictionary
+
+    Returns:
+        List[str]: One string per LEAD_FIELDS entry, missing values as ''
+    """
+    return ['' if lead.get(field) is None else str(lead.get(field)) for field in LEAD_FIELDS]
+
+
+def normalize_business_name(name: str) -> str:
+    """
+    Normalize a business name for identity comparisons
+
+    Args:
+        name (str): Raw business name
+
+    Returns:
+        str: Lowercased name with punctuation and repeated whitespace removed
+    """
+    name = re.sub(r'[^\w\s]', ' ', (name or '').lower())
+    return ' '.join(name.split())
+
+
+def normalize_domain(website: str) -> str:
+    """
+    Normalize a website URL down to its bare domain
+
+    Args:
+        website (str): Website URL (with or without scheme)
+
+    Returns:
+        str: Lowercased domain without "www." or port
+    """
+    website = (website or '').strip().lower()
+    if not website:
+        return ''
+    if '://' not in website:
+        website = f"//{website}"
+
+    domain = urlparse(website).netloc.split(':')[0]
+    if domain.startswith('www.'):
+        domain = domain[4:]
+
+    return domain
+
+
+def normalize_query(niche: str, location: str, num_results: int) -> str:
+    """
+    Build the identity key of a search query
+
+    Args:
+        niche (str): Business niche/category
+        location (str): Location to search in
+        num_results (int): Number of results requested
+
+    Returns:
+        str: Key that ignores case and repeated whitespace
+    """
+    niche = ' '.join((niche or '').lower().split())
+    location = ' '.join((location or '').lower().split())
+    return f"{niche}|{location}|{num_results}"
+
+
+def lead_key(lead: Dict) -> str:
+    """
+    Build a stable identity key for a lead
+
+    Args:
+        lead (Dict): Lead dictionary
+
+    Returns:
+        str: Hash of the normalized business name and domain
+    """
+    identity = f"{normalize_business_name(lead.get('business_name', ''))}|{normalize_domain(lead.get('website', ''))}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def row_digest(row: List, headers: List[str]) -> str:
+    """
+    Hash the non-volatile cells of a sheet row
+
+    Args:
+        row (List): Cell values in header order
+        headers (List[str]): Column headers for the row
+
+    Returns:
+        str: Digest that changes whenever the lead's content changes
+    """
+    digest = hashlib.sha1()
+    for header, value in zip(headers, row):
+        if HEADER_TO_FIELD.get(header) in VOLATILE_FIELDS:
+            continue
+        digest.update(str(value).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()[:16]
@@ -4,17 +4,22 @@ import json
 from typing import List, Dict, Optional
 from urllib.parse import urlparse
 import time
+from serp_parser import loads, parse_search_results
 
 class LeadFinder:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, archive=None):
         """
         Initialize the LeadFinder with SerpAPI key
         
         Args:
             api_key (str): SerpAPI key for searching
+            archive (ResponseArchive): Optional archive every raw response is written to
         """
         self.api_key = api_key
         self.base_url = "https://serpapi.com/search"
+        self.archive = archive
+        # Reuse connections to SerpAPI across searches
+        self.session = requests.Session()
     
     def search_leads(self, niche: str, location: str, num_results: int = 20) -> List[Dict]:
         """
@@ -35,7 +40,17 @@ class LeadFinder:
         
         try:
             # Perform Google search using SerpAPI
-            search_results = self._perform_search(search_query, num_results)
+            raw_response = self._fetch_search(search_query, num_results)
+            
+            # Keep the raw response so history can be reprocessed later
+            if self.archive is not None:
+                try:
+                    self.archive.add(niche, location, num_results, raw_response)
+                except Exception as e:
+                    print(f"Error archiving search response: {str(e)}")
+            
+            # Decode only the result arrays the extractors read
+            search_results = parse_search_results(raw_response)
             
             # Extract leads from search results
             leads = self._extract_leads_from_results(search_results, niche, location)
@@ -57,6 +72,19 @@ class LeadFinder:
         Returns:
             Dict: Search results from SerpAPI
         """
+        return loads(self._fetch_search(query, num_results))
+    
+    def _fetch_search(self, query: str, num_results: int) -> bytes:
+        """
+        Fetch the raw Google search response from SerpAPI
+        
+        Args:
+            query (str): Search query
+            num_results (int): Number of results to fetch
+            
+        Returns:
+            bytes: Undecoded JSON response body
+        """
         params = {
             'q': query,
             'api_key': self.api_key,
@@ -66,10 +94,10 @@ class LeadFinder:
             'hl': 'en'   # Language
         }
         
-        response = requests.get(self.base_url, params=params)
+        response = self.session.get(self.base_url, params=params)
         response.raise_for_status()
         
-        return response.json()
+        return response.content
     
     def _extract_leads_from_results(self, search_results: Dict, niche: str, location: str) -> List[Dict]:
         """
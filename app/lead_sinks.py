@@ -0,0 +1,277 @@
+import csv
+import gzip
+import io
+import itertools
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Dict, IO, Iterable, Iterator, List, Union
+
+from lead_schema import LEAD_FIELDS, LEAD_HEADERS, lead_key, lead_row
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+# Low-cardinality columns stored dictionary-encoded in Parquet
+DICTIONARY_FIELDS = {'niche', 'location'}
+
+# Download formats as label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('.csv', 'text/csv'),
+    'CSV (gzip)': ('.csv.gz', 'application/gzip'),
+    'Parquet': ('.parquet', 'application/vnd.apache.parquet')
+}
+
+
+def _batched(leads: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Split an iterable of leads into lists of at most size leads"""
+    iterator = iter(leads)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class LeadSink(ABC):
+    """
+    Destination for a stream of leads
+
+    Sinks use the same columns, in the same order, as GoogleSheetsWriter.
+    write() consumes any iterable of lead dictionaries in batches of
+    batch_size, so only one batch is held in memory at a time. Sinks are
+    context managers and must be closed to flush their output. Subclasses
+    implement _write_batch.
+    """
+
+    def __init__(self, batch_size: int = 10000):
+        self.batch_size = batch_size
+        self.rows_written = 0
+
+    def write(self, leads: Iterable[Dict]) -> int:
+        """
+        Write leads to the sink
+
+        Args:
+            leads (Iterable[Dict]): Lead dictionaries, e.g. a generator
+
+        Returns:
+            int: Number of leads written by this call
+        """
+        written = 0
+        for batch in _batched(leads, self.batch_size):
+            self._write_batch(batch)
+            written += len(batch)
+        self.rows_written += written
+        return written
+
+    @abstractmethod
+    def _write_batch(self, leads: List[Dict]):
+        """Write one batch of at most batch_size leads"""
+
+    def close(self):
+        """Flush and release the output"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvSink(LeadSink):
+    def __init__(self, target: Union[str, IO], compress: bool = False, batch_size: int = 10000):
+        """
+        Stream leads to a CSV file, optionally gzip-compressed
+
+        The header row uses the sheet headers ('Business Name', ...).
+
+        Args:
+            target (Union[str, IO]): File path, or a binary file object to write into
+            compress (bool): gzip the output
+            batch_size (int): Leads per write batch
+        """
+        super().__init__(batch_size)
+        self._owns_file = isinstance(target, str)
+        raw = open(target, 'wb') if self._owns_file else target
+        self._raw = raw
+        self._gzip = gzip.GzipFile(fileobj=raw, mode='wb') if compress else None
+        self._text = io.TextIOWrapper(self._gzip or raw, encoding='utf-8', newline='')
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(LEAD_HEADERS)
+
+    def _write_batch(self, leads: List[Dict]):
+        self._writer.writerows(lead_row(lead) for lead in leads)
+        self._text.flush()
+
+    def close(self):
+        if self._text is None:
+            return
+        self._text.flush()
+        # Detach so closing the wrapper doesn't close a caller-owned file
+        self._text.detach()
+        self._text = None
+        if self._gzip is not None:
+            self._gzip.close()
+        if self._owns_file:
+            self._raw.close()
+        else:
+            self._raw.flush()
+
+
+class ParquetSink(LeadSink):
+    def __init__(self, target: Union[str, IO], row_group_size: int = 50000, compression: str = 'zstd'):
+        """
+        Stream leads to a Parquet file, one row group per batch
+
+        Niche and location are dictionary-encoded, all other columns are
+        strings named after the lead fields ('business_name', ...).
+
+        Args:
+            target (Union[str, IO]): File path, or a binary file object to write into
+            row_group_size (int): Leads per row group (and per batch in memory)
+            compression (str): Parquet compression codec
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet output: pip install pyarrow")
+
+        super().__init__(row_group_size)
+        self.schema = pa.schema([
+            pa.field(field, pa.dictionary(pa.int32(), pa.string()) if field in DICTIONARY_FIELDS else pa.string())
+            for field in LEAD_FIELDS
+        ])
+        self._writer = pq.ParquetWriter(target, self.schema, compression=compression)
+
+    def _write_batch(self, leads: List[Dict]):
+        rows = [lead_row(lead) for lead in leads]
+        arrays = []
+        for index, field in enumerate(self.schema):
+            array = pa.array([row[index] for row in rows], type=pa.string())
+            if field.name in DICTIONARY_FIELDS:
+                array = array.dictionary_encode()
+            arrays.append(array)
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class SqliteSink(LeadSink):
+    def __init__(self, path: str, table: str = "leads", batch_size: int = 10000):
+        """
+        Stream leads into a SQLite table with batched inserts
+
+        Each batch is inserted with executemany inside one transaction. Rows
+        are keyed by the lead key, so re-writing a lead replaces it.
+
+        Args:
+            path (str): SQLite database file
+            table (str): Table name
+            batch_size (int): Leads per transaction
+        """
+        super().__init__(batch_size)
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+
+        self.table = table
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        columns = ', '.join(f"{field} TEXT" for field in LEAD_FIELDS)
+        with self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (lead_key TEXT PRIMARY KEY, {columns})"
+            )
+
+        placeholders = ', '.join('?' for _ in range(len(LEAD_FIELDS) + 1))
+        self._insert = f"INSERT OR REPLACE INTO {table} (lead_key, {', '.join(LEAD_FIELDS)}) VALUES ({placeholders})"
+
+    def _write_batch(self, leads: List[Dict]):
+        with self._connection:
+            self._connection.executemany(self._insert, ([lead_key(lead)] + lead_row(lead) for lead in leads))
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class GoogleSheetsSink(LeadSink):
+    def __init__(self, writer, spreadsheet_id: str, sheet_name: str = "Leads", batch_size: int = 5000):
+        """
+        Stream leads into Google Sheets through a GoogleSheetsWriter
+
+        Each batch is upserted, so re-sent leads don't create duplicate rows.
+
+        Args:
+            writer (GoogleSheetsWriter): Authorized writer
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            sheet_name (str): Name of the sheet to write to
+            batch_size (int): Leads per upsert
+        """
+        super().__init__(batch_size)
+        self.writer = writer
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+
+    def _write_batch(self, leads: List[Dict]):
+        if not self.writer.upsert_leads(leads, self.spreadsheet_id, self.sheet_name):
+            raise Exception(f"Failed to write {len(leads)} leads to Google Sheets")
+
+
+def export_leads(leads: Iterable[Dict], extension: str, target: IO, batch_size: int = 10000) -> int:
+    """
+    Stream leads into a binary file object in one of the EXPORT_FORMATS
+
+    Leads are converted and written batch_size at a time, so only the
+    encoded output grows, never a full in-memory copy of the rows.
+
+    Args:
+        leads (Iterable[Dict]): Leads to export
+        extension (str): '.csv', '.csv.gz' or '.parquet'
+        target (IO): Binary file object to write into; left open
+        batch_size (int): Leads per write batch (and per Parquet row group)
+
+    Returns:
+        int: Number of leads written
+    """
+    if extension == '.csv.gz':
+        sink = CsvSink(target, compress=True, batch_size=batch_size)
+    elif extension == '.csv':
+        sink = CsvSink(target, batch_size=batch_size)
+    elif extension == '.parquet':
+        sink = ParquetSink(target, row_group_size=batch_size)
+    else:
+        raise ValueError(f"Unsupported export format: {extension}")
+
+    with sink:
+        return sink.write(leads)
+
+
+def open_sink(path: str, **kwargs) -> LeadSink:
+    """
+    Open a file sink based on the file extension
+
+    Args:
+        path (str): Output path ending in .csv, .csv.gz, .parquet, .db, .sqlite or .sqlite3
+        **kwargs: Extra arguments for the sink
+
+    Returns:
+        LeadSink: Sink writing to path
+    """
+    lowered = path.lower()
+    if lowered.endswith('.csv.gz'):
+        return CsvSink(path, compress=True, **kwargs)
+    if lowered.endswith('.csv'):
+        return CsvSink(path, **kwargs)
+    if lowered.endswith('.parquet'):
+        return ParquetSink(path, **kwargs)
+    if lowered.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SqliteSink(path, **kwargs)
+    raise ValueError(f"Unsupported output format: {path}")
@@ -0,0 +1,411 @@
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lead_schema import LEAD_FIELDS, LEAD_HEADERS, lead_key, lead_row, normalize_domain, row_digest
+from lead_sinks import _batched
+from config import Config
+
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_FIELD_COLUMNS = ',\n    '.join(f"{field} TEXT NOT NULL DEFAULT ''" for field in LEAD_FIELDS)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    lead_key TEXT NOT NULL UNIQUE,
+    {_FIELD_COLUMNS},
+    domain TEXT NOT NULL DEFAULT '',
+    digest TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_leads_domain ON leads (domain);
+CREATE INDEX IF NOT EXISTS idx_leads_phone ON leads (phone);
+CREATE INDEX IF NOT EXISTS idx_leads_niche_location ON leads (niche COLLATE NOCASE, location COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_leads_location ON leads (location COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS queries (
+    query_key TEXT PRIMARY KEY,
+    niche TEXT NOT NULL,
+    location TEXT NOT NULL,
+    num_results INTEGER NOT NULL,
+    last_fetched TEXT NOT NULL,
+    lead_keys TEXT NOT NULL
+);
+
+-- Append-only change feed: one row per lead insert or content change
+CREATE TABLE IF NOT EXISTS lead_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    lead_key TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    changed_at TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS lead_changes_insert AFTER INSERT ON leads BEGIN
+    INSERT INTO lead_changes (lead_key, operation, changed_at)
+    VALUES (new.lead_key, 'insert', new.last_seen);
+END;
+CREATE TRIGGER IF NOT EXISTS lead_changes_update AFTER UPDATE OF digest ON leads
+WHEN old.digest != new.digest BEGIN
+    INSERT INTO lead_changes (lead_key, operation, changed_at)
+    VALUES (new.lead_key, 'update', new.last_seen);
+END;
+"""
+
+# Full-text index kept in sync with the leads table by triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5(
+    business_name, description, content='leads', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS leads_fts_insert AFTER INSERT ON leads BEGIN
+    INSERT INTO leads_fts (rowid, business_name, description)
+    VALUES (new.id, new.business_name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS leads_fts_delete AFTER DELETE ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, business_name, description)
+    VALUES ('delete', old.id, old.business_name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS leads_fts_update AFTER UPDATE OF business_name, description ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, business_name, description)
+    VALUES ('delete', old.id, old.business_name, old.description);
+    INSERT INTO leads_fts (rowid, business_name, description)
+    VALUES (new.id, new.business_name, new.description);
+END;
+"""
+
+_UPSERT = f"""
+INSERT INTO leads (lead_key, {', '.join(LEAD_FIELDS)}, domain, digest, first_seen, last_seen)
+VALUES ({', '.join('?' for _ in range(len(LEAD_FIELDS) + 5))})
+ON CONFLICT (lead_key) DO UPDATE SET
+    {', '.join(f'{field} = excluded.{field}' for field in LEAD_FIELDS)},
+    domain = excluded.domain,
+    digest = excluded.digest,
+    last_seen = excluded.last_seen
+"""
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix"""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+class LeadStore:
+    def __init__(self, path: Optional[str] = None):
+        """
+        Persistent local store of leads in SQLite
+
+        Leads are keyed by lead_key and use the same columns as the sheet,
+        plus the normalized domain, a content digest and first/last seen
+        timestamps. Business name and description are full-text indexed.
+
+        Args:
+            path (str): Database file, defaults to Config.LEAD_STORE_PATH
+        """
+        self.path = path or Config.LEAD_STORE_PATH
+        # One connection shared across Streamlit script threads, serialized by a lock
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            try:
+                self._connection.executescript(_FTS_SCHEMA)
+                self.full_text = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5, text search falls back to LIKE
+                self.full_text = False
+
+    def add_leads(self, leads: Iterable[Dict], batch_size: int = 5000) -> int:
+        """
+        Insert or update leads in bulk
+
+        Args:
+            leads (Iterable[Dict]): Lead dictionaries
+            batch_size (int): Leads per transaction
+
+        Returns:
+            int: Number of leads written
+        """
+        written = 0
+        for batch in _batched(leads, batch_size):
+            now = datetime.now().strftime(_TIMESTAMP_FORMAT)
+            rows = []
+            for lead in batch:
+                row = lead_row(lead)
+                rows.append(
+                    [lead_key(lead)] + row +
+                    [normalize_domain(lead.get('website', '')), row_digest(row, LEAD_HEADERS), now, now]
+                )
+            with self._lock, self._connection:
+                self._connection.executemany(_UPSERT, rows)
+            written += len(rows)
+        return written
+
+    def has_lead(self, lead: Dict) -> bool:
+        """
+        Check whether a business is already in the store
+
+        Args:
+            lead (Dict): Lead with at least business_name and website
+
+        Returns:
+            bool: True if a lead with the same key exists
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM leads WHERE lead_key = ?", (lead_key(lead),)
+            ).fetchone()
+        return row is not None
+
+    def find_leads(self, niche: Optional[str] = None, location: Optional[str] = None,
+                   domain: Optional[str] = None, phone: Optional[str] = None,
+                   has_phone: Optional[bool] = None, text: Optional[str] = None,
+                   limit: int = 100, offset: int = 0) -> List[Dict]:
+        """
+        Query stored leads
+
+        Args:
+            niche (str): Exact niche, case-insensitive
+            location (str): Exact location, case-insensitive
+            domain (str): Website domain (normalized before matching)
+            phone (str): Exact phone number
+            has_phone (bool): Only leads with (True) or without (False) a phone
+            text (str): Words to match in business name or description
+            limit (int): Maximum number of leads to return
+            offset (int): Number of matching leads to skip
+
+        Returns:
+            List[Dict]: Matching leads, best text matches or newest first
+        """
+        source, where, params, order = self._filter(niche, location, domain, phone, has_phone, text)
+        query = (
+            f"SELECT {', '.join(f'leads.{field}' for field in LEAD_FIELDS)} FROM {source} "
+            f"{where} ORDER BY {order} LIMIT ? OFFSET ?"
+        )
+        params.extend([limit, offset])
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def _filter(self, niche: Optional[str], location: Optional[str], domain: Optional[str],
+                phone: Optional[str], has_phone: Optional[bool], text: Optional[str]) -> Tuple[str, str, List, str]:
+        """Table source, WHERE clause, parameters and ORDER BY of a find_leads query"""
+        conditions = []
+        params: List = []
+
+        if niche:
+            conditions.append("leads.niche = ? COLLATE NOCASE")
+            params.append(niche)
+        if location:
+            conditions.append("leads.location = ? COLLATE NOCASE")
+            params.append(location)
+        if domain:
+            conditions.append("leads.domain = ?")
+            params.append(normalize_domain(domain))
+        if phone:
+            conditions.append("leads.phone = ?")
+            params.append(phone)
+        if has_phone is not None:
+            conditions.append("leads.phone != ''" if has_phone else "leads.phone = ''")
+
+        source = "leads"
+        order = "leads.last_seen DESC, leads.id DESC"
+        if text and _fts_query(text):
+            if self.full_text:
+                source = "leads_fts JOIN leads ON leads.id = leads_fts.rowid"
+                conditions.append("leads_fts MATCH ?")
+                params.append(_fts_query(text))
+                order = "bm25(leads_fts)"
+            else:
+                for word in re.findall(r'\w+', text):
+                    conditions.append("(leads.business_name LIKE ? OR leads.description LIKE ?)")
+                    params.extend([f"%{word}%", f"%{word}%"])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return source, where, params, order
+
+    def get_digests(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the stored content digests for a set of lead keys
+
+        Args:
+            keys (Iterable[str]): Lead keys
+
+        Returns:
+            Dict[str, str]: Digest by lead key, for the keys that exist
+        """
+        digests = {}
+        for batch in _batched(keys, 500):
+            placeholders = ', '.join('?' for _ in batch)
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT lead_key, digest FROM leads WHERE lead_key IN ({placeholders})", batch
+                ).fetchall()
+            digests.update((row['lead_key'], row['digest']) for row in rows)
+        return digests
+
+    def get_leads_by_keys(self, keys: List[str]) -> List[Dict]:
+        """
+        Load leads by key, in the order of the keys given
+
+        Args:
+            keys (List[str]): Lead keys
+
+        Returns:
+            List[Dict]: Stored leads (missing keys are skipped)
+        """
+        found = {}
+        columns = ', '.join(LEAD_FIELDS)
+        for batch in _batched(keys, 500):
+            placeholders = ', '.join('?' for _ in batch)
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT lead_key, {columns} FROM leads WHERE lead_key IN ({placeholders})", batch
+                ).fetchall()
+            for row in rows:
+                found[row['lead_key']] = {field: row[field] for field in LEAD_FIELDS}
+        return [found[key] for key in keys if key in found]
+
+    def get_query(self, query_key: str) -> Optional[Dict]:
+        """
+        Get the last fetch of a search query
+
+        Args:
+            query_key (str): Normalized query key
+
+        Returns:
+            Optional[Dict]: niche, location, num_results, last_fetched (datetime)
+            and lead_keys of the last fetch, or None if never fetched
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM queries WHERE query_key = ?", (query_key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        query = dict(row)
+        query['last_fetched'] = datetime.strptime(query['last_fetched'], _TIMESTAMP_FORMAT)
+        query['lead_keys'] = json.loads(query['lead_keys'])
+        return query
+
+    def record_query(self, query_key: str, niche: str, location: str, num_results: int,
+                     lead_keys: List[str], fetched_at: Optional[datetime] = None):
+        """
+        Record that a search query was fetched and which leads it returned
+
+        Args:
+            query_key (str): Normalized query key
+            niche (str): Niche searched
+            location (str): Location searched
+            num_results (int): Number of results requested
+            lead_keys (List[str]): Keys of the leads the search returned
+            fetched_at (datetime): Fetch time, defaults to now
+        """
+        fetched_at = (fetched_at or datetime.now()).strftime(_TIMESTAMP_FORMAT)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO queries (query_key, niche, location, num_results, last_fetched, lead_keys) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (query_key, niche, location, num_results, fetched_at, json.dumps(lead_keys))
+            )
+
+    def get_changes(self, cursor: int = 0, limit: int = 500) -> Dict:
+        """
+        Get a page of lead changes after a cursor
+
+        Args:
+            cursor (int): Sequence number of the last change already processed (0 for all)
+            limit (int): Maximum number of changes to return
+
+        Returns:
+            Dict: 'changes' (List[Dict] with seq, operation, changed_at and the
+            lead's current fields), 'cursor' (sequence number to pass next
+            time) and 'has_more' (bool)
+        """
+        columns = ', '.join(f'leads.{field}' for field in LEAD_FIELDS)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT lead_changes.seq, lead_changes.operation, lead_changes.changed_at, {columns} "
+                "FROM lead_changes JOIN leads ON leads.lead_key = lead_changes.lead_key "
+                "WHERE lead_changes.seq > ? ORDER BY lead_changes.seq LIMIT ?",
+                (cursor, limit + 1)
+            ).fetchall()
+
+        has_more = len(rows) > limit
+        changes = [dict(row) for row in rows[:limit]]
+        return {
+            'changes': changes,
+            'cursor': changes[-1]['seq'] if changes else cursor,
+            'has_more': has_more
+        }
+
+    def iter_changes(self, cursor: int = 0, page_size: int = 500) -> Iterator[Dict]:
+        """
+        Iterate over all changes after a cursor, one page at a time
+
+        Args:
+            cursor (int): Sequence number of the last change already processed
+            page_size (int): Changes loaded per query
+
+        Yields:
+            Dict: Change with seq, operation, changed_at and the lead's fields
+        """
+        while True:
+            page = self.get_changes(cursor, page_size)
+            yield from page['changes']
+            if not page['has_more']:
+                return
+            cursor = page['cursor']
+
+    def latest_cursor(self) -> int:
+        """Get the sequence number of the newest change (0 if none)"""
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(MAX(seq), 0) FROM lead_changes").fetchone()[0]
+
+    def prune_changes(self, before: int) -> int:
+        """
+        Delete changes every consumer has already processed
+
+        Sequence numbers are never reused, so cursors stay valid after pruning.
+
+        Args:
+            before (int): Delete changes with a sequence number up to and including this
+
+        Returns:
+            int: Number of changes deleted
+        """
+        with self._lock, self._connection:
+            return self._connection.execute("DELETE FROM lead_changes WHERE seq <= ?", (before,)).rowcount
+
+    def count(self, niche: Optional[str] = None, location: Optional[str] = None,
+              domain: Optional[str] = None, phone: Optional[str] = None,
+              has_phone: Optional[bool] = None, text: Optional[str] = None) -> int:
+        """
+        Count stored leads, with the same filters as find_leads
+
+        Args:
+            niche (str): Only count this niche
+            location (str): Only count this location
+            domain (str): Only count this website domain
+            phone (str): Only count this phone number
+            has_phone (bool): Only count leads with (True) or without (False) a phone
+            text (str): Only count leads matching these words
+
+        Returns:
+            int: Number of leads
+        """
+        source, where, params, _ = self._filter(niche, location, domain, phone, has_phone, text)
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,139 @@
+import math
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from lead_schema import LEAD_FIELDS, lead_row, normalize_domain
+from lead_sinks import DICTIONARY_FIELDS, _batched
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # The paginated table is optional
+    pa = None
+    pc = None
+
+# Columns of the table: the lead fields plus the website's bare domain for filtering
+TABLE_COLUMNS = LEAD_FIELDS + ['domain']
+
+
+class LeadTable:
+    def __init__(self, leads: Iterable[Dict] = (), batch_size: int = 10000):
+        """
+        Columnar, read-only lead set for paginated display
+
+        Leads are held once as an Arrow table, with niche and location
+        dictionary-encoded and a normalized 'domain' column added. Filters
+        run as vectorized compute kernels and only the requested page is
+        turned into a DataFrame, so the frontend never receives the whole set.
+
+        Args:
+            leads (Iterable[Dict]): Leads to hold
+            batch_size (int): Leads converted per record batch
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for the lead table: pip install pyarrow")
+
+        self.schema = pa.schema([
+            pa.field(column, pa.dictionary(pa.int32(), pa.string()) if column in DICTIONARY_FIELDS else pa.string())
+            for column in TABLE_COLUMNS
+        ])
+        batches = [self._record_batch(batch) for batch in _batched(leads, batch_size)]
+        self.table = pa.Table.from_batches(batches, schema=self.schema)
+
+    @classmethod
+    def _wrap(cls, table) -> 'LeadTable':
+        """LeadTable around an existing Arrow table with the same schema"""
+        lead_table = cls.__new__(cls)
+        lead_table.schema = table.schema
+        lead_table.table = table
+        return lead_table
+
+    def _record_batch(self, leads: List[Dict]):
+        rows = [lead_row(lead) for lead in leads]
+        website = LEAD_FIELDS.index('website')
+        arrays = []
+        for index, field in enumerate(self.schema):
+            if field.name == 'domain':
+                values = [normalize_domain(row[website]) for row in rows]
+            else:
+                values = [row[index] for row in rows]
+            array = pa.array(values, type=pa.string())
+            if field.name in DICTIONARY_FIELDS:
+                array = array.dictionary_encode()
+            arrays.append(array)
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def values(self, column: str) -> List[str]:
+        """Distinct non-empty values of a column, sorted"""
+        return sorted(value for value in self.table[column].unique().to_pylist() if value)
+
+    def filter(self, niche: Optional[str] = None, location: Optional[str] = None,
+               has_phone: Optional[bool] = None, domain: Optional[str] = None) -> 'LeadTable':
+        """
+        Leads matching every given filter
+
+        Args:
+            niche (str): Exact niche
+            location (str): Exact location
+            has_phone (bool): True for leads with a phone number, False for leads without
+            domain (str): Text the website domain contains (case-insensitive)
+
+        Returns:
+            LeadTable: Matching leads; the same table if no filter is given
+        """
+        conditions = []
+        if niche:
+            conditions.append(pc.equal(self.table['niche'], niche))
+        if location:
+            conditions.append(pc.equal(self.table['location'], location))
+        if has_phone is not None:
+            has = pc.not_equal(self.table['phone'], '')
+            conditions.append(has if has_phone else pc.invert(has))
+        if domain and domain.strip():
+            conditions.append(pc.match_substring(self.table['domain'], domain.strip(), ignore_case=True))
+
+        if not conditions:
+            return self
+
+        mask = conditions[0]
+        for condition in conditions[1:]:
+            mask = pc.and_(mask, condition)
+        return LeadTable._wrap(self.table.filter(mask))
+
+    def page_count(self, page_size: int) -> int:
+        """Number of pages of page_size rows, at least 1"""
+        return max(1, math.ceil(len(self) / page_size))
+
+    def page(self, number: int, page_size: int, columns: Optional[List[str]] = None):
+        """
+        One page of leads as a DataFrame
+
+        Args:
+            number (int): Page number, starting at 1
+            page_size (int): Rows per page
+            columns (List[str]): Columns to include, defaults to the lead fields
+
+        Returns:
+            pandas.DataFrame: The page's rows, only the projected columns
+        """
+        page = self.table.slice((number - 1) * page_size, page_size)
+        return page.select(columns or LEAD_FIELDS).to_pandas()
+
+    def iter_leads(self, batch_size: int = 10000) -> Iterator[Dict]:
+        """
+        Leads as dictionaries with the lead fields, converted one batch at a time
+
+        Args:
+            batch_size (int): Rows converted at once
+
+        Yields:
+            Dict: One lead per row
+        """
+        for batch in self.table.select(LEAD_FIELDS).to_batches(max_chunksize=batch_size):
+            yield from batch.to_pylist()
+
+    def to_leads(self) -> List[Dict]:
+        """All leads as dictionaries"""
+        return list(self.iter_leads())
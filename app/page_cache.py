@@ -0,0 +1,138 @@
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from config import Config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    encoding TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access);
+"""
+
+
+class PageCache:
+    def __init__(self, path: Optional[str] = None, max_mb: Optional[int] = None):
+        """
+        Disk cache of fetched pages with their HTTP validators
+
+        Bodies are stored zlib-compressed together with their ETag and
+        Last-Modified headers, so a later fetch can revalidate with a
+        conditional GET and reuse the stored body on 304 Not Modified. The
+        least recently used pages are evicted once the compressed bodies
+        exceed max_mb.
+
+        Args:
+            path (str): SQLite file for the cache, defaults to Config.PAGE_CACHE_PATH
+            max_mb (int): Size budget for compressed bodies, defaults to Config.PAGE_CACHE_MB
+        """
+        self.path = path or Config.PAGE_CACHE_PATH
+        self.max_bytes = (max_mb or Config.PAGE_CACHE_MB) * 1024 * 1024
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+            self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a cached page
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            Optional[Dict]: 'etag', 'last_modified', 'encoding' and 'body' (bytes), or None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, encoding, body FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+
+        etag, last_modified, encoding, body = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': encoding,
+            'body': zlib.decompress(body)
+        }
+
+    def put(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str],
+            encoding: Optional[str] = None):
+        """
+        Store a page, evicting least recently used pages if over budget
+
+        Pages without an ETag or Last-Modified can't be revalidated and are
+        not stored.
+
+        Args:
+            url (str): Page URL
+            body (bytes): Raw response body
+            etag (str): ETag response header
+            last_modified (str): Last-Modified response header
+            encoding (str): Character encoding of the body
+        """
+        if not etag and not last_modified:
+            return
+
+        compressed = zlib.compress(body, 6)
+        if len(compressed) > self.max_bytes:
+            return
+
+        with self._lock, self._connection:
+            previous = self._connection.execute("SELECT size FROM pages WHERE url = ?", (url,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, encoding, body, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, encoding, compressed, len(compressed), time.time())
+            )
+            self._size += len(compressed) - (previous[0] if previous else 0)
+            self.stats['stores'] += 1
+            self._evict()
+
+    def touch(self, url: str):
+        """Mark a page as recently used, e.g. after a 304 revalidation"""
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+
+    def _evict(self):
+        """Drop least recently used pages until under the size budget (lock held)"""
+        while self._size > self.max_bytes:
+            rows = self._connection.execute(
+                "SELECT url, size FROM pages ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                return
+            for url, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self._connection.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self._size -= size
+                self.stats['evictions'] += 1
+
+    @property
+    def size_bytes(self) -> int:
+        """Compressed size of all cached bodies"""
+        return self._size
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            self._connection.close()
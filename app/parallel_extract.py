@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lead_schema import LEAD_FIELDS, lead_key, lead_row
+from serp_parser import parse_search_results
+
+# Columns shipped back from workers: the lead key followed by the sheet fields
+BATCH_COLUMNS = ['lead_key'] + LEAD_FIELDS
+
+# Extractor of the current worker process, created once by _init_worker
+_extract = None
+
+
+def _init_worker():
+    """Create the extractor once per worker process"""
+    global _extract
+    from lead_search import LeadFinder
+    _extract = LeadFinder('')._extract_leads_from_results
+
+
+def _new_batch() -> Dict[str, List[str]]:
+    return {column: [] for column in BATCH_COLUMNS}
+
+
+def _extract_batch(responses: Iterable[Tuple[str, str, bytes]]) -> Tuple[int, int, Dict[str, List[str]]]:
+    """
+    Extract leads from raw responses into a deduplicated columnar batch
+
+    Args:
+        responses (Iterable[Tuple[str, str, bytes]]): (niche, location, raw response)
+
+    Returns:
+        Tuple[int, int, Dict[str, List[str]]]: Responses processed, leads
+        extracted before deduplication, and one list of values per column
+    """
+    if _extract is None:
+        _init_worker()
+
+    batch = _new_batch()
+    columns = [batch[column] for column in BATCH_COLUMNS]
+    seen = set()
+    processed = extracted = 0
+
+    for niche, location, raw in responses:
+        processed += 1
+        for lead in _extract(parse_search_results(raw), niche, location):
+            extracted += 1
+            key = lead_key(lead)
+            if key in seen:
+                continue
+            seen.add(key)
+            for column, value in zip(columns, [key] + lead_row(lead)):
+                column.append(value)
+
+    return processed, extracted, batch
+
+
+def _extract_archive_shard(shard: Tuple[str, List[Tuple[int, int]]]) -> Tuple[int, int, Dict[str, List[str]]]:
+    """Worker task: read a run of frames from one archive segment and extract them"""
+    from response_archive import read_frames, split_record
+
+    path, frames = shard
+
+    def responses():
+        for record in read_frames(path, frames):
+            header, raw = split_record(record)
+            yield header['niche'], header['location'], raw
+
+    return _extract_batch(responses())
+
+
+def _extract_response_shard(shard: List[Tuple[str, str, bytes]]) -> Tuple[int, int, Dict[str, List[str]]]:
+    """Worker task: extract a list of in-memory responses"""
+    return _extract_batch(shard)
+
+
+class _Merger:
+    """Global deduplication of worker batches, keeping the first occurrence in shard order"""
+
+    def __init__(self):
+        self.columns = _new_batch()
+        self.seen = set()
+        self.responses = 0
+        self.extracted = 0
+
+    def add(self, result: Tuple[int, int, Dict[str, List[str]]]):
+        processed, extracted, batch = result
+        self.responses += processed
+        self.extracted += extracted
+
+        keys = batch['lead_key']
+        keep = [index for index, key in enumerate(keys) if key not in self.seen]
+        self.seen.update(keys)
+        if len(keep) == len(keys):
+            for column in BATCH_COLUMNS:
+                self.columns[column].extend(batch[column])
+        else:
+            for column in BATCH_COLUMNS:
+                values = batch[column]
+                self.columns[column].extend(values[index] for index in keep)
+
+    def result(self) -> Dict:
+        unique = len(self.columns['lead_key'])
+        return {
+            'columns': self.columns,
+            'responses': self.responses,
+            'extracted': self.extracted,
+            'unique': unique,
+            'duplicates': self.extracted - unique
+        }
+
+
+def _run(task, shards: List, workers: Optional[int]) -> Dict:
+    """Run shards on a process pool (or inline for one worker) and merge the batches"""
+    merger = _Merger()
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(shards) <= 1:
+        for shard in shards:
+            merger.add(task(shard))
+        return merger.result()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        # map() returns results in shard order, so dedup keeps the earliest lead
+        for result in executor.map(task, shards, chunksize=1):
+            merger.add(result)
+    return merger.result()
+
+
+def extract_archive(archive, workers: Optional[int] = None, shard_size: int = 256,
+                    latest_only: bool = False, since: Optional[str] = None) -> Dict:
+    """
+    Re-extract leads from archived responses on a process pool
+
+    Segments are split into shards of shard_size records; each worker
+    reads its frames from the memory-mapped segment itself, so only
+    offsets travel to the workers and only columnar batches travel back.
+
+    Args:
+        archive (ResponseArchive): Archive to reprocess
+        workers (int): Worker processes, defaults to the number of CPUs
+        shard_size (int): Archived responses per task
+        latest_only (bool): Only the latest response of each query
+        since (str): Only responses fetched at or after this time
+
+    Returns:
+        Dict: 'columns' (lead_key plus one list per lead field, globally
+        deduplicated), 'responses', 'extracted', 'unique' and 'duplicates' counts
+    """
+    shards = []
+    for segment in archive.segments():
+        frames = [(entry['offset'], entry['length'])
+                  for entry in archive.entries(segment, latest_only, since)]
+        path = os.path.join(archive.directory, segment)
+        for start in range(0, len(frames), shard_size):
+            shards.append((path, frames[start:start + shard_size]))
+
+    return _run(_extract_archive_shard, shards, workers)
+
+
+def extract_responses(responses: Iterable[Tuple[str, str, bytes]], workers: Optional[int] = None,
+                      shard_size: int = 64) -> Dict:
+    """
+    Extract leads from raw responses on a process pool
+
+    Args:
+        responses (Iterable[Tuple[str, str, bytes]]): (niche, location, raw response body)
+        workers (int): Worker processes, defaults to the number of CPUs
+        shard_size (int): Responses per task
+
+    Returns:
+        Dict: Same as extract_archive
+    """
+    responses = list(responses)
+    shards = [responses[start:start + shard_size] for start in range(0, len(responses), shard_size)]
+    return _run(_extract_response_shard, shards, workers)
+
+
+def iter_leads(columns: Dict[str, List[str]]) -> Iterator[Dict]:
+    """
+    Turn a columnar batch back into lead dictionaries
+
+    Args:
+        columns (Dict[str, List[str]]): Columns as returned in 'columns'
+
+    Yields:
+        Dict: One lead per row, with the lead fields
+    """
+    for row in zip(*(columns[field] for field in LEAD_FIELDS)):
+        yield dict(zip(LEAD_FIELDS, row))
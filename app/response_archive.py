@@ -0,0 +1,423 @@
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import Config
+from lead_schema import normalize_query
+from serp_parser import parse_search_results
+
+try:
+    import zstandard
+except ImportError:  # Archiving is optional
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, only threads are locked out there
+    fcntl = None
+
+INDEX_FILE = "index.jsonl"
+LOCK_FILE = "archive.lock"
+RESPONSE_MARKER = b', "response": '
+SEGMENT_PATTERN = "segment-{:06d}.jsonl.zst"
+
+# Extractor signature: (search_results, niche, location) -> leads
+Extractor = Callable[[Dict, str, str], List[Dict]]
+
+
+def _default_extractor() -> Extractor:
+    """Extraction as done by a live search"""
+    from lead_search import LeadFinder
+    return LeadFinder('')._extract_leads_from_results
+
+
+def _segment_number(segment: str) -> int:
+    """Sequence number of a segment file name"""
+    return int(segment.split('-')[1].split('.')[0])
+
+
+def read_frames(path: str, frames: List[Tuple[int, int]]) -> Iterator[bytes]:
+    """
+    Decompress records from a segment file through a memory map
+
+    Args:
+        path (str): Segment file path
+        frames (List[Tuple[int, int]]): (offset, length) of each frame to read
+
+    Yields:
+        bytes: Record JSON, in the order given
+    """
+    if not frames or os.path.getsize(path) == 0:
+        return
+
+    decompressor = zstandard.ZstdDecompressor()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            for offset, length in frames:
+                with view[offset:offset + length] as frame:
+                    record = decompressor.decompress(frame)
+                yield record
+        finally:
+            view.release()
+
+
+def split_record(record: bytes) -> Tuple[Dict, bytes]:
+    """
+    Split an archived record into its decoded header and the raw response
+
+    Args:
+        record (bytes): Record JSON as stored in a segment
+
+    Returns:
+        Tuple[Dict, bytes]: key, niche, location, num_results and fetched_at,
+        and the undecoded response body
+    """
+    split = record.index(RESPONSE_MARKER)
+    header = json.loads(record[:split] + b'}')
+    return header, record[split + len(RESPONSE_MARKER):].rstrip()[:-1]
+
+
+class ResponseArchive:
+    def __init__(self, directory: Optional[str] = None, segment_mb: int = 64, level: int = 3,
+                 max_mb: Optional[int] = None, max_age_days: Optional[float] = None):
+        """
+        Append-only archive of raw SerpAPI responses
+
+        Each response is written as one JSONL record, compressed as its own
+        zstd frame and appended to the current segment file; segments roll
+        over at segment_mb. A small JSONL index maps each query key to the
+        segment, offset and length of its latest record, so single responses
+        can be read back without scanning.
+
+        Several processes may share the directory: appends to the segment and
+        the index are made under a file lock, and index lines written by other
+        processes are picked up before the index is used. Whole segments are
+        deleted, oldest first, once the archive exceeds max_mb or a segment is
+        older than max_age_days; this is checked on start-up and whenever a
+        new segment is started.
+
+        Args:
+            directory (str): Archive directory, defaults to Config.RESPONSE_ARCHIVE_DIR
+            segment_mb (int): Compressed size at which a new segment is started
+            level (int): zstd compression level
+            max_mb (int): Size of all segments kept, defaults to
+                          Config.RESPONSE_ARCHIVE_MAX_MB (0 for no limit)
+            max_age_days (float): Age after which a segment is deleted, defaults to
+                                  Config.RESPONSE_ARCHIVE_MAX_AGE_DAYS (0 for no limit)
+        """
+        if zstandard is None:
+            raise ImportError("zstandard is required for the response archive: pip install zstandard")
+
+        self.directory = directory or Config.RESPONSE_ARCHIVE_DIR
+        self.segment_bytes = segment_mb * 1024 * 1024
+        self.max_bytes = (Config.RESPONSE_ARCHIVE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+        self.max_age_seconds = (Config.RESPONSE_ARCHIVE_MAX_AGE_DAYS if max_age_days is None
+                                else max_age_days) * 86400
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._lock = threading.RLock()
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Latest record per query key, and every record per segment
+        self.index: Dict[str, Dict] = {}
+        self._records: Dict[str, List[Dict]] = {}
+        self._index_offset = 0
+        self._index_inode = None
+        self._refresh_index()
+
+        segments = self.segments()
+        self._segment_number = _segment_number(segments[-1]) if segments else 1
+        if self.max_bytes or self.max_age_seconds:
+            self.prune()
+
+    def segments(self) -> List[str]:
+        """Segment file names, oldest first"""
+        return sorted(name for name in os.listdir(self.directory)
+                      if name.startswith('segment-') and name.endswith('.jsonl.zst'))
+
+    @contextmanager
+    def _locked(self):
+        """Lock the archive against other threads and other processes sharing the directory"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.directory, LOCK_FILE), 'a') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh_index(self):
+        """Read index lines appended since the last read, by this or another process"""
+        path = os.path.join(self.directory, INDEX_FILE)
+        with self._lock:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+
+            inode = stat.st_ino if stat is not None else None
+            if inode != self._index_inode:
+                # Rewritten by prune(), possibly in another process
+                self.index, self._records, self._index_offset = {}, {}, 0
+                self._index_inode = inode
+            if stat is None or stat.st_size <= self._index_offset:
+                return
+
+            with open(path, 'rb') as f:
+                f.seek(self._index_offset)
+                data = f.read()
+
+            # A line without its newline is still being written (or was torn by a crash)
+            end = data.rfind(b'\n') + 1
+            for line in data[:end].splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.index[entry['key']] = entry
+                self._records.setdefault(entry['segment'], []).append(entry)
+            self._index_offset += end
+
+    def add(self, niche: str, location: str, num_results: int, raw_response: bytes,
+            fetched_at: Optional[datetime] = None) -> Dict:
+        """
+        Archive a raw response
+
+        The response bytes are embedded into the record as-is, without
+        decoding and re-encoding them.
+
+        Args:
+            niche (str): Niche searched
+            location (str): Location searched
+            num_results (int): Number of results requested
+            raw_response (bytes): Response body as returned by SerpAPI
+            fetched_at (datetime): Fetch time, defaults to now
+
+        Returns:
+            Dict: Index entry of the record
+        """
+        key = normalize_query(niche, location, num_results)
+        fetched_at = (fetched_at or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+        header = json.dumps({
+            'key': key,
+            'niche': niche,
+            'location': location,
+            'num_results': num_results,
+            'fetched_at': fetched_at
+        })
+        record = header[:-1].encode('utf-8') + RESPONSE_MARKER + raw_response.strip() + b'}\n'
+        frame = self._compressor.compress(record)
+
+        with self._locked():
+            self._refresh_index()
+
+            # Other processes may have started newer segments
+            segments = self.segments()
+            if segments:
+                self._segment_number = max(self._segment_number, _segment_number(segments[-1]))
+            segment = SEGMENT_PATTERN.format(self._segment_number)
+            path = os.path.join(self.directory, segment)
+            rolled_over = os.path.exists(path) and os.path.getsize(path) + len(frame) > self.segment_bytes
+            if rolled_over:
+                self._segment_number += 1
+                segment = SEGMENT_PATTERN.format(self._segment_number)
+                path = os.path.join(self.directory, segment)
+
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(frame)
+
+            entry = {'key': key, 'segment': segment, 'offset': offset, 'length': len(frame),
+                     'fetched_at': fetched_at}
+            # The index is written after the frame, so it never points at missing data
+            with open(os.path.join(self.directory, INDEX_FILE), 'ab') as f:
+                if f.tell() > self._index_offset:
+                    # Finish a line torn by a crash, so it doesn't swallow this one
+                    f.write(b'\n')
+                f.write(json.dumps(entry).encode('utf-8') + b'\n')
+                self._index_offset = f.tell()
+                self._index_inode = os.fstat(f.fileno()).st_ino
+
+            self.index[key] = entry
+            self._records.setdefault(segment, []).append(entry)
+
+            if rolled_over and (self.max_bytes or self.max_age_seconds):
+                self._prune()
+
+        return entry
+
+    def prune(self) -> List[str]:
+        """
+        Delete segments beyond the size and age limits
+
+        Returns:
+            List[str]: Names of the deleted segments
+        """
+        with self._locked():
+            self._refresh_index()
+            return self._prune()
+
+    def _prune(self) -> List[str]:
+        """Delete old segments and drop their records from the index (archive lock held)"""
+        segments = self.segments()
+        stats = {name: os.stat(os.path.join(self.directory, name)) for name in segments}
+        total = sum(stat.st_size for stat in stats.values())
+        cutoff = time.time() - self.max_age_seconds if self.max_age_seconds else None
+
+        # Oldest first, never the segment being appended to
+        removed = []
+        for name in segments[:-1]:
+            stat = stats[name]
+            if not (self.max_bytes and total > self.max_bytes) and not (cutoff and stat.st_mtime < cutoff):
+                break
+            removed.append(name)
+            total -= stat.st_size
+        if not removed:
+            return removed
+
+        # Rewrite the index before deleting, so it never points at missing segments
+        kept = [entry for name in segments if name not in removed for entry in self._records.get(name, [])]
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.index_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b''.join(json.dumps(entry).encode('utf-8') + b'\n' for entry in kept))
+            os.replace(temp_path, os.path.join(self.directory, INDEX_FILE))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        for name in removed:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+        self._index_inode = None
+        self._refresh_index()
+        return removed
+
+    def get(self, niche: str, location: str, num_results: int) -> Optional[Dict]:
+        """
+        Read the latest archived response for a query
+
+        Args:
+            niche (str): Niche searched
+            location (str): Location searched
+            num_results (int): Number of results requested
+
+        Returns:
+            Optional[Dict]: Record with key, niche, location, num_results,
+            fetched_at and response, or None if never archived
+        """
+        self._refresh_index()
+        entry = self.index.get(normalize_query(niche, location, num_results))
+        if entry is None:
+            return None
+
+        with open(os.path.join(self.directory, entry['segment']), 'rb') as f:
+            f.seek(entry['offset'])
+            frame = f.read(entry['length'])
+        return json.loads(zstandard.ZstdDecompressor().decompress(frame))
+
+    def entries(self, segment: str, latest_only: bool = False, since: Optional[str] = None) -> List[Dict]:
+        """
+        Index entries of the records in one segment, in file order
+
+        Args:
+            segment (str): Segment file name
+            latest_only (bool): Skip records superseded by a newer fetch of the same query
+            since (str): Only records fetched at or after this 'YYYY-MM-DD HH:MM:SS' time
+
+        Returns:
+            List[Dict]: Entries with key, segment, offset, length and fetched_at
+        """
+        self._refresh_index()
+        selected = []
+        for entry in self._records.get(segment, []):
+            if latest_only and self.index.get(entry['key']) is not entry:
+                continue
+            if since and entry['fetched_at'] < since:
+                continue
+            selected.append(entry)
+        return selected
+
+    def _iter_frames(self, segment: str, latest_only: bool = False,
+                     since: Optional[str] = None) -> Iterator[bytes]:
+        """Iterate over the decompressed records of one segment"""
+        entries = self.entries(segment, latest_only, since)
+        yield from read_frames(os.path.join(self.directory, segment),
+                               [(entry['offset'], entry['length']) for entry in entries])
+
+    def iter_segment(self, segment: str, latest_only: bool = False,
+                     since: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Iterate over the fully decoded records of one segment
+
+        Args:
+            segment (str): Segment file name
+            latest_only (bool): Skip records superseded by a newer fetch of the same query
+            since (str): Only records fetched at or after this 'YYYY-MM-DD HH:MM:SS' time
+
+        Yields:
+            Dict: Archived record
+        """
+        for record in self._iter_frames(segment, latest_only, since):
+            yield json.loads(record)
+
+    def replay(self, extract: Optional[Extractor] = None, workers: int = 4,
+               latest_only: bool = False, since: Optional[str] = None,
+               segments: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Feed archived responses back through the lead extractors
+
+        Segments are processed in parallel, one worker per segment.
+
+        Args:
+            extract (Extractor): Extraction function, defaults to LeadFinder's
+            workers (int): Segments processed at once
+            latest_only (bool): Only the latest response of each query
+            since (str): Only responses fetched at or after this time
+            segments (Iterable[str]): Segments to replay, defaults to all
+
+        Yields:
+            Dict: 'key', 'niche', 'location', 'num_results', 'fetched_at' and the
+            re-extracted 'leads' for each archived response
+        """
+        extract = extract or _default_extractor()
+
+        def replay_segment(segment: str) -> List[Dict]:
+            results = []
+            for record in self._iter_frames(segment, latest_only, since):
+                header, raw_response = split_record(record)
+                header['leads'] = extract(parse_search_results(raw_response), header['niche'], header['location'])
+                results.append(header)
+            return results
+
+        segments = list(segments or self.segments())
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive-replay") as executor:
+            # One round of segments at a time, so finished results don't pile up
+            for start in range(0, len(segments), workers):
+                for results in executor.map(replay_segment, segments[start:start + workers]):
+                    yield from results
+
+    def stats(self) -> Dict:
+        """Archive size and record counts"""
+        self._refresh_index()
+        segments = self.segments()
+        return {
+            'segments': len(segments),
+            'records': sum(len(entries) for entries in self._records.values()),
+            'queries': len(self.index),
+            'bytes': sum(os.path.getsize(os.path.join(self.directory, name)) for name in segments)
+        }
@@ -0,0 +1,150 @@
+import codecs
+import json
+import re
+from typing import Dict, List, Union
+
+try:
+    import orjson
+except ImportError:  # Faster full decoding is optional
+    orjson = None
+
+# Top-level arrays the lead extractors read; everything else is skipped
+RESULT_KEYS = ('organic_results', 'local_results')
+
+_COLON = re.compile(rb'\s*:\s*')
+_decoder = json.JSONDecoder()
+
+# Structural bytes kept when checking how deeply a key is nested
+_STRUCTURE = b'"{}[]'
+_NOT_STRUCTURE = bytes(byte for byte in range(256) if byte not in _STRUCTURE)
+_SCAN_CHUNK = 256 * 1024
+_BACKSLASH = ord('\\')
+
+# Bytes decoded for one result array. 100 organic results (SerpAPI's maximum per
+# request) fit comfortably; anything longer is decoded with the whole document.
+_VALUE_WINDOW = 256 * 1024
+
+
+def loads(raw: Union[bytes, str]):
+    """Decode a complete JSON document, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _local_places(local_results) -> List:
+    """Google returns local results either as a list or as {'places': [...]}"""
+    if isinstance(local_results, dict):
+        return local_results.get('places', [])
+    return local_results or []
+
+
+def parse_search_results(raw: bytes) -> Dict[str, List]:
+    """
+    Decode only the result arrays of a SerpAPI response
+
+    SerpAPI responses also carry ads, knowledge graph, inline images
+    (often base64 thumbnails), related searches and pagination, none of
+    which the extractors use. Each result key is located in the raw bytes
+    and only its value is decoded, so the rest of the document is never
+    turned into Python objects. If a key appears more than once, isn't a
+    member of the top-level object (for example only nested inside the
+    knowledge graph), or its value doesn't fit the decode window, the whole
+    document is decoded instead.
+
+    Args:
+        raw (bytes): Raw JSON response body
+
+    Returns:
+        Dict[str, List]: 'organic_results' and 'local_results' lists (possibly empty)
+    """
+    results: Dict[str, List] = {}
+
+    for key in RESULT_KEYS:
+        token = b'"' + key.encode('ascii') + b'"'
+        position = raw.find(token)
+        if position < 0:
+            results[key] = []
+            continue
+
+        colon = _COLON.match(raw, position + len(token))
+        if colon is None or raw.find(token, position + 1) >= 0:
+            return _parse_full(raw)
+
+        # Only a key of the top-level object counts, not one nested in e.g. the knowledge graph
+        if _depth_at(raw, position) != 1:
+            return _parse_full(raw)
+
+        value = _decode_value(raw, colon.end())
+        if value is None:
+            return _parse_full(raw)
+        results[key] = value
+
+    results['local_results'] = _local_places(results['local_results'])
+    return results
+
+
+def _depth_at(raw: bytes, position: int) -> int:
+    """
+    Count the objects and arrays enclosing a byte offset
+
+    The document before the offset is reduced, one chunk at a time, to its
+    quotes and brackets (escaped backslashes and quotes are dropped first),
+    so only a small copy of the structure is kept. The pieces between
+    quote pairs are string contents, whose brackets don't count.
+
+    Args:
+        raw (bytes): JSON document
+        position (int): Offset outside of any string
+
+    Returns:
+        int: Nesting depth, 1 for members of the top-level object
+    """
+    parts = []
+    start = 0
+    while start < position:
+        end = min(position, start + _SCAN_CHUNK)
+        # Don't split an escape sequence between two chunks
+        while start < end < position and raw[end - 1] == _BACKSLASH:
+            end -= 1
+        if end == start:
+            end = position
+
+        chunk = raw[start:end]
+        if b'\\' in chunk:
+            chunk = chunk.replace(b'\\\\', b'').replace(b'\\"', b'')
+        parts.append(chunk.translate(None, _NOT_STRUCTURE))
+        start = end
+
+    outside = b''.join(b''.join(parts).split(b'"')[0::2])
+    return outside.count(b'{') + outside.count(b'[') - outside.count(b'}') - outside.count(b']')
+
+
+def _decode_value(raw: bytes, start: int):
+    """
+    Decode the JSON value starting at a byte offset
+
+    Only a window of the document is decoded to text and parsed; raw_decode
+    stops at the end of the value and ignores what follows, so memory stays
+    proportional to the window rather than to the rest of the document.
+
+    Returns:
+        The decoded value, or None if it is invalid or longer than the window
+    """
+    end = min(len(raw), start + _VALUE_WINDOW)
+    # Incremental decoder so a character split by the window edge is held back
+    text = codecs.getincrementaldecoder('utf-8')().decode(memoryview(raw)[start:end], final=end == len(raw))
+    try:
+        value, _ = _decoder.raw_decode(text)
+    except ValueError:
+        return None
+    return value
+
+
+def _parse_full(raw: bytes) -> Dict[str, List]:
+    """Decode the whole document and keep the result arrays"""
+    document = loads(raw)
+    return {
+        'organic_results': document.get('organic_results') or [],
+        'local_results': _local_places(document.get('local_results'))
+    }
@@ -0,0 +1,114 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+
+def estimate_size(rows: List[List[str]]) -> int:
+    """
+    Estimate the memory held by a grid of cell values
+
+    Args:
+        rows (List[List[str]]): Cell values
+
+    Returns:
+        int: Approximate size in bytes, including list overhead
+    """
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for cell in row:
+            size += sys.getsizeof(cell)
+    return size
+
+
+class SheetContentCache:
+    def __init__(self, max_bytes: int):
+        """
+        LRU cache of worksheet contents tagged with the revision they were read at
+
+        An entry is only served while the caller-supplied revision matches the
+        one it was stored with, so a cheap metadata call is enough to decide
+        whether a full re-read is needed. The total estimated size of cached
+        contents is kept under max_bytes by evicting least recently used
+        worksheets.
+
+        Args:
+            max_bytes (int): Memory budget for cached contents
+        """
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Dict]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: Hashable, revision: str) -> Optional[List[List[str]]]:
+        """
+        Get cached contents if they are still at the given revision
+
+        Args:
+            key (Hashable): Worksheet identifier
+            revision (str): Current revision of the spreadsheet
+
+        Returns:
+            Optional[List[List[str]]]: Cached rows (not to be modified), or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['revision'] != revision:
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry['rows']
+
+    def put(self, key: Hashable, revision: str, rows: List[List[str]]):
+        """
+        Store the contents of a worksheet at a revision
+
+        Args:
+            key (Hashable): Worksheet identifier
+            revision (str): Revision the rows were read or written at
+            rows (List[List[str]]): Worksheet contents
+        """
+        size = estimate_size(rows)
+
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = {'revision': revision, 'rows': rows, 'size': size}
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, match=None):
+        """
+        Drop cached entries
+
+        Args:
+            match (Callable): Predicate on keys, or None to drop everything
+        """
+        with self._lock:
+            for key in [k for k in self._entries if match is None or match(k)]:
+                self._discard(key)
+
+    def _discard(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry['size']
+
+    def stats(self) -> Dict:
+        """
+        Get cache usage statistics
+
+        Returns:
+            Dict: Entry count, bytes used, budget and hit/miss/eviction counters
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes)
@@ -0,0 +1,100 @@
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Union
+
+import gspread
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+
+class SheetsBackend(ABC):
+    """
+    Interface between GoogleSheetsWriter and the spreadsheet service
+
+    A backend turns a credentials source (a path to a service account JSON
+    file, or the parsed JSON as a dict) into an authorized client. The client
+    must behave like a gspread client: open_by_key() and create() returning
+    spreadsheets, whose worksheets support the gspread Worksheet calls the
+    writer makes (update, batch_update, append_rows, batch_get, clear, ...).
+    """
+
+    @abstractmethod
+    def fingerprint(self, source: Union[str, Dict]) -> str:
+        """
+        Identify the credentials so authorized clients can be cached per account
+
+        Args:
+            source (Union[str, Dict]): Service account JSON file path or contents
+
+        Returns:
+            str: Stable identifier for the credentials
+        """
+
+    @abstractmethod
+    def load_credentials(self, source: Union[str, Dict], scopes: List[str]) -> Any:
+        """
+        Load credentials for authorize()
+
+        Args:
+            source (Union[str, Dict]): Service account JSON file path or contents
+            scopes (List[str]): OAuth scopes to request
+
+        Returns:
+            Any: Credentials object, or None if the backend doesn't need one
+        """
+
+    @abstractmethod
+    def authorize(self, credentials: Any) -> Any:
+        """
+        Build an authorized client
+
+        Args:
+            credentials (Any): Credentials returned by load_credentials()
+
+        Returns:
+            Any: gspread-compatible client
+        """
+
+    def authorize_pooled(self, credentials: Any, pool_size: int) -> Any:
+        """
+        Build an authorized client with its own connection pool
+
+        Writers making many calls at once use this, so sizing their pool
+        doesn't touch the connections of clients shared by other writers.
+        Backends without connection pools can keep this default.
+
+        Args:
+            credentials (Any): Credentials returned by load_credentials()
+            pool_size (int): Connections to keep open per host
+
+        Returns:
+            Any: gspread-compatible client
+        """
+        return self.authorize(credentials)
+
+
+class GspreadBackend(SheetsBackend):
+    """Backend talking to the real Google Sheets API through gspread"""
+
+    def fingerprint(self, source: Union[str, Dict]) -> str:
+        if isinstance(source, dict):
+            return hashlib.sha256(json.dumps(source, sort_keys=True).encode('utf-8')).hexdigest()
+        with open(source, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def load_credentials(self, source: Union[str, Dict], scopes: List[str]) -> Credentials:
+        # Credentials built from a dict never touch the filesystem
+        if isinstance(source, dict):
+            return Credentials.from_service_account_info(source, scopes=scopes)
+        return Credentials.from_service_account_file(source, scopes=scopes)
+
+    def authorize(self, credentials: Credentials) -> gspread.Client:
+        return gspread.authorize(credentials)
+
+    def authorize_pooled(self, credentials: Credentials, pool_size: int) -> gspread.Client:
+        session = AuthorizedSession(credentials)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        return gspread.authorize(credentials, session=session)
@@ -0,0 +1,197 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from config import Config
+
+# HTTP status codes that mean "try again later" rather than "this call is wrong"
+RETRYABLE_STATUS_CODES = {429, 503}
+
+# Length of the sliding window the per-minute budgets apply to
+QUOTA_WINDOW_SECONDS = 60.0
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Get the HTTP status code of an API error, if it has one"""
+    response = getattr(error, 'response', None)
+    code = getattr(response, 'status_code', None)
+    if code is None:
+        code = getattr(error, 'code', None)
+    return code if isinstance(code, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Get the server-suggested delay from a Retry-After header, if any"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+class QuotaScheduler:
+    def __init__(self, read_per_minute: int = 60, write_per_minute: int = 60,
+                 max_retries: int = 5, base_backoff: float = 1.0, max_backoff: float = 64.0):
+        """
+        Schedule Google Sheets API calls so they stay under per-minute quotas
+
+        Calls are classified as reads or writes. Each class has its own
+        sliding one-minute budget; callers over budget wait in FIFO order until
+        a slot frees up. Calls rejected with 429/503 are retried with
+        exponential backoff and jitter.
+
+        Args:
+            read_per_minute (int): Read requests allowed per minute
+            write_per_minute (int): Write requests allowed per minute
+            max_retries (int): Retries for a call rejected with 429/503
+            base_backoff (float): First retry delay in seconds
+            max_backoff (float): Upper bound for a single retry delay
+        """
+        self.budgets = {'read': read_per_minute, 'write': write_per_minute}
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._condition = threading.Condition()
+        self._sent = {kind: deque() for kind in self.budgets}
+        self._queues = {kind: deque() for kind in self.budgets}
+        self._stats = {
+            'calls': 0,
+            'retries': 0,
+            'throttled': 0,
+            'failed': 0,
+            'waits': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0
+        }
+
+    def _acquire(self, kind: str):
+        """
+        Block until a request of the given kind fits in the budget
+
+        Args:
+            kind (str): 'read' or 'write'
+        """
+        budget = self.budgets[kind]
+        sent = self._sent[kind]
+        queue = self._queues[kind]
+        ticket = object()
+        started = time.monotonic()
+
+        with self._condition:
+            queue.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    while sent and now - sent[0] >= QUOTA_WINDOW_SECONDS:
+                        sent.popleft()
+
+                    if queue[0] is ticket and len(sent) < budget:
+                        sent.append(now)
+                        break
+
+                    # Sleep until the oldest request leaves the window (or we're woken)
+                    timeout = QUOTA_WINDOW_SECONDS - (now - sent[0]) if len(sent) >= budget else None
+                    self._condition.wait(timeout)
+            finally:
+                queue.remove(ticket)
+                self._condition.notify_all()
+
+            waited = time.monotonic() - started
+            self._stats['calls'] += 1
+            if waited > 0.001:
+                self._stats['waits'] += 1
+                self._stats['total_wait_seconds'] += waited
+                self._stats['max_wait_seconds'] = max(self._stats['max_wait_seconds'], waited)
+
+    def call(self, kind: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run an API call within the quota, retrying 429/503 responses
+
+        Args:
+            kind (str): 'read' or 'write'
+            func (Callable): API call to make
+            *args, **kwargs: Arguments for the call
+
+        Returns:
+            Any: Result of the call
+        """
+        attempt = 0
+        while True:
+            self._acquire(kind)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                code = _status_code(e)
+                if code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    if code in RETRYABLE_STATUS_CODES:
+                        with self._condition:
+                            self._stats['failed'] += 1
+                    raise
+
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+                    delay += random.uniform(0, delay / 2)
+
+                with self._condition:
+                    self._stats['retries'] += 1
+                    if code == 429:
+                        self._stats['throttled'] += 1
+
+                attempt += 1
+                time.sleep(delay)
+
+    def read(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a read request within the quota"""
+        return self.call('read', func, *args, **kwargs)
+
+    def write(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a write request within the quota"""
+        return self.call('write', func, *args, **kwargs)
+
+    def metrics(self) -> Dict:
+        """
+        Get queue depth, wait time and retry metrics
+
+        Returns:
+            Dict: Current queue depths, requests in the current window and
+                  cumulative call/wait/retry counters
+        """
+        with self._condition:
+            now = time.monotonic()
+            metrics = dict(self._stats)
+            metrics['queue_depth'] = {kind: len(queue) for kind, queue in self._queues.items()}
+            metrics['window_usage'] = {
+                kind: sum(1 for sent_at in sent if now - sent_at < QUOTA_WINDOW_SECONDS)
+                for kind, sent in self._sent.items()
+            }
+            metrics['budgets'] = dict(self.budgets)
+            metrics['avg_wait_seconds'] = (
+                metrics['total_wait_seconds'] / metrics['waits'] if metrics['waits'] else 0.0
+            )
+            return metrics
+
+
+_scheduler: Optional[QuotaScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> QuotaScheduler:
+    """
+    Get the process-wide quota scheduler shared by all Sheets writers
+
+    Returns:
+        QuotaScheduler: Scheduler configured from Config
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = QuotaScheduler(
+                read_per_minute=Config.SHEETS_READ_REQUESTS_PER_MINUTE,
+                write_per_minute=Config.SHEETS_WRITE_REQUESTS_PER_MINUTE,
+                max_retries=Config.SHEETS_MAX_RETRIES
+            )
+        return _scheduler
@@ -1,70 +1,354 @@
 import gspread
 from google.oauth2.service_account import Credentials
-from typing import List, Dict
+from google.auth.transport.requests import Request
+from typing import List, Dict, Tuple, Callable, Any, Iterator
 import pandas as pd
-from datetime import datetime
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from lead_schema import LEAD_COLUMNS, HEADER_TO_FIELD, lead_key, row_digest
+from sheets_quota import QuotaScheduler, get_scheduler
+from sheets_backend import SheetsBackend, GspreadBackend
+from config import Config
+from sheet_cache import SheetContentCache
+from token_cache import TokenCache, get_token_cache
+
+# Refresh access tokens this long before they expire so that a request never
+# has to pay for a token exchange (or a 401 retry) in the middle of a save
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Process-wide handle caches shared by every GoogleSheetsWriter instance.
+# Clients are keyed by a fingerprint of the service account credentials (plus
+# the pool size for writers with their own connection pool), spreadsheets and
+# worksheets by (fingerprint, spreadsheet_id[, sheet_name]).
+_client_cache: Dict[str, Tuple[Credentials, Any]] = {}
+_spreadsheet_cache: Dict[Tuple[str, str], gspread.Spreadsheet] = {}
+_worksheet_cache: Dict[Tuple[str, str, str], gspread.Worksheet] = {}
+_cache_lock = threading.RLock()
+
+# Hidden bookkeeping columns written by upsert_leads right after the lead columns
+KEY_HEADER = 'Lead Key'
+DIGEST_HEADER = 'Row Hash'
+
+# Key -> (row number, content digest) indexes per worksheet, tagged with the
+# spreadsheet revision they were built from
+_key_index_cache: Dict[Tuple[str, str, str], Dict] = {}
+
+# Worksheet listing per-shard row counts, written by save_leads_sharded
+SHARD_INDEX_HEADERS = ['Shard', 'Rows', 'Updated At']
+
+# Characters Google Sheets doesn't allow in worksheet titles
+_INVALID_TITLE_CHARS = re.compile(r"[\[\]\*\?:/\\']")
+
+# Last known contents of worksheets, tagged with the spreadsheet revision they
+# were read or written at. Shared by diff saves and get_existing_leads.
+_content_cache = SheetContentCache(Config.SHEETS_READ_CACHE_MB * 1024 * 1024)
+
+
+def _is_missing_sheet_error(error: Exception) -> bool:
+    """Check whether an API error means a cached spreadsheet/worksheet is gone"""
+    if isinstance(error, (gspread.WorksheetNotFound, gspread.SpreadsheetNotFound)):
+        return True
+    if isinstance(error, gspread.exceptions.APIError):
+        code = getattr(error, 'code', None) or getattr(error.response, 'status_code', None)
+        if code == 404:
+            return True
+        # Writing to a deleted worksheet is reported as an unparseable range
+        return code == 400 and 'Unable to parse range' in str(error)
+    return False
+
+
+def clear_handle_cache():
+    """Drop all cached clients, spreadsheets and worksheets"""
+    with _cache_lock:
+        _client_cache.clear()
+        _spreadsheet_cache.clear()
+        _worksheet_cache.clear()
+        _key_index_cache.clear()
+    _content_cache.invalidate()
+
+
+def _trim_row(row: List) -> List:
+    """Drop trailing empty cells from a row"""
+    end = len(row)
+    while end and row[end - 1] == '':
+        end -= 1
+    return list(row[:end])
+
+
+def _column_letter(col: int) -> str:
+    """Convert a 1-based column number to its A1 letter(s)"""
+    return re.sub(r'\d', '', gspread.utils.rowcol_to_a1(1, col))
+
+
+def _record_keys(headers: List[str]) -> List[str]:
+    """Map sheet headers to lead record keys, e.g. 'Business Name' -> 'business_name'"""
+    return [header.lower().replace(' ', '_') for header in headers]
+
+
+def _shard_title(prefix: str, value: str) -> str:
+    """Build a valid worksheet title for a shard"""
+    value = _INVALID_TITLE_CHARS.sub(' ', value or '')
+    value = ' '.join(value.split()) or 'Unknown'
+    return f"{prefix} - {value}"[:100]
+
+
+def _first_row_of_range(a1_range: str) -> int:
+    """Get the first row number of an A1 range such as 'Leads!A12:L20'"""
+    return int(re.search(r'!?[A-Z]+(\d+)', a1_range.split('!')[-1]).group(1))
+
 
 class GoogleSheetsWriter:
-    def __init__(self, credentials_path: str):
+    def __init__(self, credentials_path: str = None, scheduler: QuotaScheduler = None,
+                 backend: SheetsBackend = None, credentials_info: Dict = None,
+                 token_cache: TokenCache = None, pool_size: int = None):
         """
         Initialize Google Sheets writer with service account credentials
         
+        Authorized clients are cached per credentials fingerprint, so creating
+        several writers for the same service account only authenticates once.
+        Access tokens are cached per service account email (in memory and, if
+        configured, in an encrypted file shared by workers). All API calls go
+        through a quota scheduler, which by default is shared by every writer
+        in the process.
+        
         Args:
             credentials_path (str): Path to Google service account JSON file
+            scheduler (QuotaScheduler): Quota scheduler, defaults to the process-wide one
+            backend (SheetsBackend): Spreadsheet service, defaults to the real
+                                     Google Sheets API (see fake_sheets for an
+                                     in-memory one)
+            credentials_info (Dict): Parsed service account JSON, used instead of
+                                     credentials_path without writing a file
+            token_cache (TokenCache): Access token cache, defaults to the process-wide one
+            pool_size (int): Use a client with its own pool of this many
+                             connections instead of the shared client
         """
         self.credentials_path = credentials_path
+        self.credentials_info = credentials_info
+        self.scheduler = scheduler or get_scheduler()
+        self.backend = backend or GspreadBackend()
+        self.token_cache = token_cache or get_token_cache()
+        self.pool_size = pool_size
         self.scope = [
             'https://spreadsheets.google.com/feeds',
             'https://www.googleapis.com/auth/drive'
         ]
         self.client = None
+        self.credentials = None
+        self.fingerprint = None
         self._authenticate()
     
     def _authenticate(self):
-        """Authenticate with Google Sheets API"""
+        """Authenticate with Google Sheets API, reusing a cached client if possible"""
         try:
-            credentials = Credentials.from_service_account_file(
-                self.credentials_path, 
-                scopes=self.scope
-            )
-            self.client = gspread.authorize(credentials)
+            source = self.credentials_info if self.credentials_info is not None else self.credentials_path
+            self.fingerprint = self.backend.fingerprint(source)
+            if self.pool_size:
+                # Separate cache entries, so handles are bound to the pooled client
+                self.fingerprint = f"{self.fingerprint}|pool:{self.pool_size}"
+            
+            with _cache_lock:
+                cached = _client_cache.get(self.fingerprint)
+                if cached is None:
+                    credentials = self.backend.load_credentials(source, self.scope)
+                    if self.pool_size:
+                        client = self.backend.authorize_pooled(credentials, self.pool_size)
+                    else:
+                        client = self.backend.authorize(credentials)
+                    cached = (credentials, client)
+                    _client_cache[self.fingerprint] = cached
+            
+            self.credentials, self.client = cached
         except Exception as e:
             raise Exception(f"Failed to authenticate with Google Sheets: {str(e)}")
     
-    def save_leads(self, leads: List[Dict], spreadsheet_id: str, sheet_name: str = "Leads") -> bool:
+    def _ensure_fresh_token(self):
+        """Refresh the access token if it is missing or about to expire"""
+        credentials = self.credentials
+        if credentials is None:
+            return
+        
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if credentials.token and credentials.expiry and credentials.expiry - now > TOKEN_REFRESH_MARGIN:
+            return
+        
+        with _cache_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if credentials.token and credentials.expiry and credentials.expiry - now > TOKEN_REFRESH_MARGIN:
+                return
+            
+            # Reuse a token minted earlier by this or another worker process
+            token_key = f"{credentials.service_account_email}|{' '.join(sorted(self.scope))}"
+            cached_token = self.token_cache.get(token_key)
+            if cached_token is not None and cached_token[1] - now > TOKEN_REFRESH_MARGIN:
+                credentials.token, credentials.expiry = cached_token
+                return
+            
+            credentials.refresh(Request())
+            self.token_cache.put(token_key, credentials.token, credentials.expiry)
+    
+    def _open_spreadsheet(self, spreadsheet_id: str) -> gspread.Spreadsheet:
+        """
+        Open a spreadsheet, reusing the cached handle when available
+        
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            
+        Returns:
+            gspread.Spreadsheet: Spreadsheet handle
+        """
+        self._ensure_fresh_token()
+        cache_key = (self.fingerprint, spreadsheet_id)
+        
+        spreadsheet = _spreadsheet_cache.get(cache_key)
+        if spreadsheet is None:
+            spreadsheet = self.scheduler.read(self.client.open_by_key, spreadsheet_id)
+            with _cache_lock:
+                _spreadsheet_cache[cache_key] = spreadsheet
+        
+        return spreadsheet
+    
+    def _get_worksheet(self, spreadsheet_id: str, sheet_name: str, create: bool = False) -> Tuple[gspread.Worksheet, bool]:
+        """
+        Get a worksheet handle, reusing the cached handle when available
+        
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            sheet_name (str): Name of the worksheet
+            create (bool): Create the worksheet if it doesn't exist
+            
+        Returns:
+            Tuple[gspread.Worksheet, bool]: Worksheet and whether it was just created
+        """
+        cache_key = (self.fingerprint, spreadsheet_id, sheet_name)
+        
+        worksheet = _worksheet_cache.get(cache_key)
+        if worksheet is not None:
+            self._ensure_fresh_token()
+            return worksheet, False
+        
+        spreadsheet = self._open_spreadsheet(spreadsheet_id)
+        created = False
+        try:
+            worksheet = self.scheduler.read(spreadsheet.worksheet, sheet_name)
+        except gspread.WorksheetNotFound:
+            if not create:
+                raise
+            worksheet = self.scheduler.write(spreadsheet.add_worksheet, title=sheet_name, rows=1000, cols=20)
+            created = True
+        
+        with _cache_lock:
+            _worksheet_cache[cache_key] = worksheet
+        
+        return worksheet, created
+    
+    def _invalidate(self, spreadsheet_id: str, sheet_name: str = None):
+        """
+        Forget cached handles for a spreadsheet (or a single worksheet of it)
+        
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            sheet_name (str): Worksheet name, or None to drop every worksheet
+        """
+        with _cache_lock:
+            if sheet_name is None:
+                _spreadsheet_cache.pop((self.fingerprint, spreadsheet_id), None)
+                for cache in (_worksheet_cache, _key_index_cache):
+                    for key in [k for k in cache if k[:2] == (self.fingerprint, spreadsheet_id)]:
+                        del cache[key]
+                _content_cache.invalidate(lambda k: k[:2] == (self.fingerprint, spreadsheet_id))
+            else:
+                _worksheet_cache.pop((self.fingerprint, spreadsheet_id, sheet_name), None)
+                _key_index_cache.pop((self.fingerprint, spreadsheet_id, sheet_name), None)
+                _content_cache.invalidate(lambda k: k == (self.fingerprint, spreadsheet_id, sheet_name))
+    
+    def _run_on_worksheet(self, spreadsheet_id: str, sheet_name: str,
+                          operation: Callable[[gspread.Worksheet, bool], Any], create: bool = False) -> Any:
+        """
+        Run an operation against a (cached) worksheet
+        
+        If the API reports that the cached spreadsheet or worksheet no longer
+        exists, the cached handles are dropped and the operation is retried once
+        against freshly looked-up handles.
+        
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            sheet_name (str): Name of the worksheet
+            operation (Callable): Called with (worksheet, created)
+            create (bool): Create the worksheet if it doesn't exist
+            
+        Returns:
+            Any: Result of the operation
+        """
+        try:
+            worksheet, created = self._get_worksheet(spreadsheet_id, sheet_name, create)
+            return operation(worksheet, created)
+        except Exception as e:
+            if not _is_missing_sheet_error(e):
+                raise
+            self._invalidate(spreadsheet_id)
+        
+        worksheet, created = self._get_worksheet(spreadsheet_id, sheet_name, create)
+        return operation(worksheet, created)
+    
+    def save_leads(self, leads: List[Dict], spreadsheet_id: str, sheet_name: str = "Leads", diff: bool = False) -> bool:
         """
         Save leads data to Google Sheets
         
+        By default the sheet is cleared and rewritten. With diff=True the new
+        rows are compared against a cached snapshot of the sheet and only the
+        changed row ranges are sent, so the sheet is never empty mid-write.
+        
         Args:
             leads (List[Dict]): List of lead dictionaries
             spreadsheet_id (str): Google Sheets spreadsheet ID
             sheet_name (str): Name of the sheet to write to
+            diff (bool): Only write rows that differ from the current contents
             
         Returns:
             bool: True if successful, False otherwise
         """
+        return self._save_leads(leads, spreadsheet_id, sheet_name, diff)
+    
+    def _save_leads(self, leads: List[Dict], spreadsheet_id: str, sheet_name: str, diff: bool,
+                    new_sheet: bool = False) -> bool:
+        """
+        save_leads, optionally for a worksheet the caller has just created
+        
+        Args:
+            new_sheet (bool): The worksheet is known to be empty, so it is
+                              written without clearing or diffing it first
+        """
         try:
-            # Open the spreadsheet
-            spreadsheet = self.client.open_by_key(spreadsheet_id)
-            
-            # Try to get existing sheet, create if doesn't exist
-            try:
-                worksheet = spreadsheet.worksheet(sheet_name)
-            except gspread.WorksheetNotFound:
-                worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=20)
-            
             # Prepare data for writing
             headers = self._get_headers()
             data_rows = self._prepare_data_rows(leads, headers)
             
-            # Clear existing data and write new data
-            worksheet.clear()
-            worksheet.update('A1', [headers])
-            if data_rows:
-                worksheet.update('A2', data_rows)
+            def write(worksheet, created):
+                created = created or new_sheet
+                if diff and not created:
+                    # Formats the sheet itself when needed, before caching its revision
+                    self._write_diff(worksheet, [headers] + data_rows)
+                    return worksheet, False
+                
+                # Clear existing data and write new data
+                if not created:
+                    self.scheduler.write(worksheet.clear)
+                self._ensure_rows(worksheet, len(data_rows) + 1)
+                self.scheduler.write(worksheet.update, 'A1', [headers])
+                if data_rows:
+                    self.scheduler.write(worksheet.update, 'A2', data_rows)
+                return worksheet, True
+            
+            # Get (or create) the sheet and write to it
+            worksheet, needs_format = self._run_on_worksheet(spreadsheet_id, sheet_name, write, create=True)
             
             # Format the sheet
-            self._format_sheet(worksheet, len(headers), len(data_rows) + 1)
+            if needs_format:
+                self._format_sheet(worksheet, len(headers), len(data_rows) + 1)
             
             return True
             
@@ -72,20 +356,86 @@ class GoogleSheetsWriter:
             print(f"Error saving to Google Sheets: {str(e)}")
             return False
     
+    def _ensure_rows(self, worksheet, num_rows: int):
+        """
+        Grow the worksheet grid so that it has at least num_rows rows
+        
+        Args:
+            worksheet: Google Sheets worksheet object
+            num_rows (int): Number of rows about to be written
+        """
+        if num_rows > worksheet.row_count:
+            self.scheduler.write(worksheet.add_rows, num_rows - worksheet.row_count)
+    
+    def _write_diff(self, worksheet, values: List[List]):
+        """
+        Write only the rows that differ from the worksheet's current contents
+        
+        The current contents come from a snapshot cached per worksheet, which is
+        reused while the spreadsheet's revision is unchanged. Runs of changed
+        rows are sent in a single batch update and rows past the end of the new
+        data are removed with a single delete request. If the header or the
+        row count changed the sheet is re-formatted before the revision is
+        read back, so the formatting doesn't invalidate the new snapshot.
+        
+        Args:
+            worksheet: Google Sheets worksheet object
+            values (List[List]): Header row followed by the data rows
+        """
+        cache_key = (self.fingerprint, worksheet.spreadsheet.id, worksheet.title)
+        revision = self.scheduler.read(worksheet.spreadsheet.get_lastUpdateTime)
+        
+        current = _content_cache.get(cache_key, revision)
+        if current is None:
+            current = self.scheduler.read(worksheet.get_all_values)
+        
+        # The API hands back strings with trailing blanks, compare like for like
+        new_rows = [_trim_row(['' if value is None else str(value) for value in row]) for row in values]
+        old_rows = [_trim_row(row) for row in current]
+        
+        # Group consecutive changed rows into ranges
+        changed_ranges = []
+        run_start = None
+        for i in range(len(new_rows) + 1):
+            changed = i < len(new_rows) and (i >= len(old_rows) or new_rows[i] != old_rows[i])
+            if changed and run_start is None:
+                run_start = i
+            elif not changed and run_start is not None:
+                changed_ranges.append((run_start, i))
+                run_start = None
+        
+        # Make room for rows past the end of the grid
+        self._ensure_rows(worksheet, len(new_rows))
+        
+        if changed_ranges:
+            updates = []
+            for start, end in changed_ranges:
+                # Pad to the old width so stale cells to the right are blanked
+                width = max(len(row) for row in new_rows[start:end] + old_rows[start:end])
+                block = [row + [''] * (width - len(row)) for row in new_rows[start:end]]
+                updates.append({
+                    'range': f'A{start + 1}:{_column_letter(width)}{end}',
+                    'values': block
+                })
+            self.scheduler.write(worksheet.batch_update, updates)
+        
+        # Trim rows left over from a longer previous save
+        if len(old_rows) > len(new_rows):
+            self.scheduler.write(worksheet.delete_rows, len(new_rows) + 1, len(old_rows))
+        
+        header_changed = not old_rows or old_rows[0] != new_rows[0]
+        needs_format = header_changed or len(old_rows) != len(new_rows)
+        if needs_format:
+            self._format_sheet(worksheet, len(values[0]), len(values))
+        
+        wrote = bool(changed_ranges) or len(old_rows) > len(new_rows)
+        if wrote or needs_format:
+            revision = self.scheduler.read(worksheet.spreadsheet.get_lastUpdateTime)
+        _content_cache.put(cache_key, revision, new_rows)
+    
     def _get_headers(self) -> List[str]:
         """Get the headers for the leads data"""
-        return [
-            'Business Name',
-            'Website',
-            'Address',
-            'Phone',
-            'Contact Info',
-            'Niche',
-            'Location',
-            'Description',
-            'Source URL',
-            'Search Date'
-        ]
+        return [header for header, _ in LEAD_COLUMNS]
     
     def _prepare_data_rows(self, leads: List[Dict], headers: List[str]) -> List[List]:
         """
@@ -98,80 +448,88 @@ class GoogleSheetsWriter:
         Returns:
             List[List]: Data rows ready for Google Sheets
         """
-        data_rows = []
-        
-        for lead in leads:
-            row = []
-            for header in headers:
-                # Map headers to lead data fields
-                if header == 'Business Name':
-                    row.append(lead.get('business_name', ''))
-                elif header == 'Website':
-                    row.append(lead.get('website', ''))
-                elif header == 'Address':
-                    row.append(lead.get('address', ''))
-                elif header == 'Phone':
-                    row.append(lead.get('phone', ''))
-                elif header == 'Contact Info':
-                    row.append(lead.get('contact_info', ''))
-                elif header == 'Niche':
-                    row.append(lead.get('niche', ''))
-                elif header == 'Location':
-                    row.append(lead.get('location', ''))
-                elif header == 'Description':
-                    row.append(lead.get('description', ''))
-                elif header == 'Source URL':
-                    row.append(lead.get('source_url', ''))
-                elif header == 'Search Date':
-                    row.append(lead.get('search_date', ''))
-                else:
-                    row.append('')
-            
-            data_rows.append(row)
+        # Map headers to lead data fields once, unknown headers become empty cells
+        fields = [HEADER_TO_FIELD.get(header) for header in headers]
         
-        return data_rows
+        return [
+            [lead.get(field, '') if field else '' for field in fields]
+            for lead in leads
+        ]
     
     def _format_sheet(self, worksheet, num_cols: int, num_rows: int):
         """
         Format the Google Sheet for better readability
         
+        Header styling, column widths and borders go out in a single batch
+        update request.
+        
         Args:
             worksheet: Google Sheets worksheet object
             num_cols (int): Number of columns
             num_rows (int): Number of rows
         """
         try:
-            # Format header row
-            worksheet.format('A1:J1', {
-                'backgroundColor': {
-                    'red': 0.2,
-                    'green': 0.6,
-                    'blue': 0.9
+            header_range = {
+                'sheetId': worksheet.id,
+                'startRowIndex': 0,
+                'endRowIndex': 1,
+                'startColumnIndex': 0,
+                'endColumnIndex': num_cols
+            }
+            
+            self.scheduler.write(worksheet.spreadsheet.batch_update, {'requests': [
+                # Format header row
+                {
+                    'repeatCell': {
+                        'range': header_range,
+                        'cell': {'userEnteredFormat': {
+                            'backgroundColor': {
+                                'red': 0.2,
+                                'green': 0.6,
+                                'blue': 0.9
+                            },
+                            'textFormat': {
+                                'bold': True,
+                                'foregroundColor': {
+                                    'red': 1,
+                                    'green': 1,
+                                    'blue': 1
+                                }
+                            },
+                            'horizontalAlignment': 'CENTER'
+                        }},
+                        'fields': 'userEnteredFormat(backgroundColor,textFormat,horizontalAlignment)'
+                    }
                 },
-                'textFormat': {
-                    'bold': True,
-                    'foregroundColor': {
-                        'red': 1,
-                        'green': 1,
-                        'blue': 1
+                # Set column widths
+                {
+                    'updateDimensionProperties': {
+                        'range': {
+                            'sheetId': worksheet.id,
+                            'dimension': 'COLUMNS',
+                            'startIndex': 0,
+                            'endIndex': num_cols
+                        },
+                        'properties': {'pixelSize': 150},
+                        'fields': 'pixelSize'
                     }
                 },
-                'horizontalAlignment': 'CENTER'
-            })
-            
-            # Auto-resize columns
-            for col in range(1, num_cols + 1):
-                worksheet.set_column_width(col, 150)
-            
-            # Add borders
-            worksheet.format(f'A1:J{num_rows}', {
-                'borders': {
-                    'top': {'style': 'SOLID'},
-                    'bottom': {'style': 'SOLID'},
-                    'left': {'style': 'SOLID'},
-                    'right': {'style': 'SOLID'}
+                # Add borders
+                {
+                    'repeatCell': {
+                        'range': dict(header_range, endRowIndex=num_rows),
+                        'cell': {'userEnteredFormat': {
+                            'borders': {
+                                'top': {'style': 'SOLID'},
+                                'bottom': {'style': 'SOLID'},
+                                'left': {'style': 'SOLID'},
+                                'right': {'style': 'SOLID'}
+                            }
+                        }},
+                        'fields': 'userEnteredFormat.borders'
+                    }
                 }
-            })
+            ]})
             
         except Exception as e:
             print(f"Warning: Could not format sheet: {str(e)}")
@@ -189,30 +547,27 @@ class GoogleSheetsWriter:
             bool: True if successful, False otherwise
         """
         try:
-            # Open the spreadsheet
-            spreadsheet = self.client.open_by_key(spreadsheet_id)
-            
-            # Try to get existing sheet, create if doesn't exist
-            try:
-                worksheet = spreadsheet.worksheet(sheet_name)
-            except gspread.WorksheetNotFound:
-                worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=20)
-                # Add headers for new sheet
-                headers = self._get_headers()
-                worksheet.update('A1', [headers])
-            
             # Prepare data for writing
             headers = self._get_headers()
             data_rows = self._prepare_data_rows(leads, headers)
             
-            # Append data to existing sheet
-            if data_rows:
-                # Find the next empty row
-                all_values = worksheet.get_all_values()
-                next_row = len(all_values) + 1
+            def append(worksheet, created):
+                if created:
+                    # Add headers for new sheet
+                    self.scheduler.write(worksheet.update, 'A1', [headers])
                 
-                # Append data
-                worksheet.update(f'A{next_row}', data_rows)
+                # Append data to existing sheet
+                if data_rows:
+                    # Find the next empty row
+                    all_values = self.scheduler.read(worksheet.get_all_values)
+                    next_row = len(all_values) + 1
+                    self._ensure_rows(worksheet, next_row + len(data_rows) - 1)
+                    
+                    # Append data
+                    self.scheduler.write(worksheet.update, f'A{next_row}', data_rows)
+            
+            # Get (or create) the sheet and append to it
+            self._run_on_worksheet(spreadsheet_id, sheet_name, append, create=True)
             
             return True
             
@@ -220,42 +575,390 @@ class GoogleSheetsWriter:
             print(f"Error appending to Google Sheets: {str(e)}")
             return False
     
-    def get_existing_leads(self, spreadsheet_id: str, sheet_name: str = "Leads") -> List[Dict]:
+    def upsert_leads(self, leads: List[Dict], spreadsheet_id: str, sheet_name: str = "Leads") -> bool:
+        """
+        Insert new leads and update changed ones without rewriting the sheet
+        
+        Every row carries two hidden columns: a key (hash of the normalized
+        business name and domain) and a digest of the row's content. The
+        key -> row index is cached locally and reused while the spreadsheet's
+        revision is unchanged, so only new rows are appended and only rows whose
+        content changed are rewritten. Unchanged leads send no cells at all.
+        
+        Args:
+            leads (List[Dict]): List of lead dictionaries
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            sheet_name (str): Name of the sheet to write to
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            headers = self._get_headers()
+            all_headers = headers + [KEY_HEADER, DIGEST_HEADER]
+            last_col = _column_letter(len(all_headers))
+            
+            # Key the incoming rows, later duplicates of the same lead win
+            keyed_rows = {}
+            for lead, row in zip(leads, self._prepare_data_rows(leads, headers)):
+                keyed_rows[lead_key(lead)] = row
+            
+            def upsert(worksheet, created):
+                index = self._load_key_index(worksheet, headers, all_headers, created)
+                rows = index['rows']
+                
+                new_rows = []
+                updates = []
+                # Index changes, applied only once the writes went through
+                written = {}
+                for key, row in keyed_rows.items():
+                    digest = row_digest(row, headers)
+                    entry = rows.get(key)
+                    if entry is None:
+                        new_rows.append(row + [key, digest])
+                    elif entry[1] != digest:
+                        updates.append({
+                            'range': f'A{entry[0]}:{last_col}{entry[0]}',
+                            'values': [row + [key, digest]]
+                        })
+                        written[key] = (entry[0], digest)
+                
+                try:
+                    # Targeted range updates for changed rows, in one request
+                    if updates:
+                        self.scheduler.write(worksheet.batch_update, updates)
+                    
+                    # Append new rows after the existing table, in one request
+                    if new_rows:
+                        response = self.scheduler.write(worksheet.append_rows, new_rows, table_range='A1')
+                        first_row = _first_row_of_range(response['updates']['updatedRange'])
+                        for offset, row in enumerate(new_rows):
+                            written[row[-2]] = (first_row + offset, row[-1])
+                except Exception:
+                    # A failed or partial write leaves the sheet unknown, rebuild the index next time
+                    with _cache_lock:
+                        _key_index_cache.pop((self.fingerprint, spreadsheet_id, sheet_name), None)
+                    raise
+                
+                rows.update(written)
+                
+                # Our own writes bump the revision, record it so the index stays valid
+                if updates or new_rows or index['revision'] is None:
+                    index['revision'] = self.scheduler.read(worksheet.spreadsheet.get_lastUpdateTime)
+            
+            self._run_on_worksheet(spreadsheet_id, sheet_name, upsert, create=True)
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error upserting to Google Sheets: {str(e)}")
+            return False
+    
+    def save_leads_sharded(self, leads: List[Dict], spreadsheet_id: str, shard_by: str = "niche",
+                           sheet_prefix: str = "Leads", num_shards: int = 8, mode: str = "save",
+                           index_sheet: str = "Leads Index") -> bool:
+        """
+        Save leads split across several worksheets of one spreadsheet
+        
+        Leads are routed to a worksheet per niche, per location or per hash
+        bucket. Missing worksheets are created in a single batch request and
+        the shards are written concurrently. A small index worksheet keeps the
+        row count of every shard, so readers don't have to scan the shards.
+        
+        Args:
+            leads (List[Dict]): List of lead dictionaries
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            shard_by (str): 'niche', 'location' or 'hash'
+            sheet_prefix (str): Prefix of the shard worksheet titles
+            num_shards (int): Number of hash buckets when shard_by='hash'
+            mode (str): 'save' (replace, diff-based), 'append' or 'upsert'
+            index_sheet (str): Name of the shard index worksheet
+            
+        Returns:
+            bool: True if every shard was written, False otherwise
+        """
+        try:
+            if shard_by not in ('niche', 'location', 'hash'):
+                raise ValueError(f"Unknown shard key: {shard_by}")
+            if mode not in ('save', 'append', 'upsert'):
+                raise ValueError(f"Unknown write mode: {mode}")
+            
+            # Route leads to shards, grouping niche/location values case-insensitively
+            shards: Dict[str, List[Dict]] = {}
+            titles: Dict[str, str] = {}
+            for lead in leads:
+                if shard_by == 'hash':
+                    bucket = int(lead_key(lead), 16) % num_shards
+                    title = f"{sheet_prefix} {bucket:02d}"
+                else:
+                    value = str(lead.get(shard_by) or '')
+                    title = titles.setdefault(value.strip().lower(), _shard_title(sheet_prefix, value))
+                shards.setdefault(title, []).append(lead)
+            
+            created = self._create_worksheets(
+                spreadsheet_id,
+                {title: len(shard_leads) + 1 for title, shard_leads in shards.items()},
+                extra_titles=[index_sheet]
+            )
+            
+            def write_shard(title):
+                shard_leads = shards[title]
+                if mode == 'upsert':
+                    return self.upsert_leads(shard_leads, spreadsheet_id, title)
+                if mode == 'append' and title not in created:
+                    return self.append_leads(shard_leads, spreadsheet_id, title)
+                # New shards (and 'save' mode) need a full write including headers;
+                # shards created above are empty, so they aren't cleared first
+                return self._save_leads(shard_leads, spreadsheet_id, title, diff=title not in created,
+                                        new_sheet=title in created)
+            
+            titles_in_order = sorted(shards)
+            with ThreadPoolExecutor(max_workers=Config.SHEETS_MAX_CONCURRENCY) as executor:
+                results = dict(zip(titles_in_order, executor.map(write_shard, titles_in_order)))
+            
+            # Row counts per shard for the index
+            counts = {}
+            for title in titles_in_order:
+                if not results[title]:
+                    continue
+                if mode == 'upsert':
+                    # Distinct keys, repeated leads in the batch share one row
+                    index = _key_index_cache.get((self.fingerprint, spreadsheet_id, title))
+                    counts[title] = len(index['rows']) if index else None
+                elif mode == 'save' or title in created:
+                    counts[title] = len(shards[title])
+                else:
+                    counts[title] = ('+', len(shards[title]))
+            
+            self._update_shard_index(spreadsheet_id, index_sheet, counts)
+            
+            return all(results.values())
+            
+        except Exception as e:
+            print(f"Error saving sharded leads to Google Sheets: {str(e)}")
+            return False
+    
+    def _create_worksheets(self, spreadsheet_id: str, row_counts: Dict[str, int], extra_titles: List[str] = None) -> set:
+        """
+        Make sure worksheets exist, creating all missing ones in one batch request
+        
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            row_counts (Dict[str, int]): Worksheet title -> rows needed
+            extra_titles (List[str]): Further worksheets to create with default size
+            
+        Returns:
+            set: Titles of the worksheets that were created
+        """
+        spreadsheet = self._open_spreadsheet(spreadsheet_id)
+        wanted = dict(row_counts)
+        for title in extra_titles or []:
+            wanted.setdefault(title, 0)
+        
+        def cache_worksheets():
+            worksheets = self.scheduler.read(spreadsheet.worksheets)
+            with _cache_lock:
+                for worksheet in worksheets:
+                    _worksheet_cache[(self.fingerprint, spreadsheet_id, worksheet.title)] = worksheet
+            return {worksheet.title for worksheet in worksheets}
+        
+        existing = cache_worksheets()
+        missing = [title for title in wanted if title not in existing]
+        if not missing:
+            return set()
+        
+        self.scheduler.write(spreadsheet.batch_update, {'requests': [
+            {
+                'addSheet': {
+                    'properties': {
+                        'title': title,
+                        'gridProperties': {
+                            'rowCount': max(1000, wanted[title]),
+                            'columnCount': 20
+                        }
+                    }
+                }
+            }
+            for title in missing
+        ]})
+        
+        # Pick up handles for the new worksheets in one listing
+        cache_worksheets()
+        
+        return set(missing)
+    
+    def _update_shard_index(self, spreadsheet_id: str, index_sheet: str, counts: Dict[str, Any]):
+        """
+        Merge shard row counts into the index worksheet
+        
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            index_sheet (str): Name of the shard index worksheet
+            counts (Dict[str, Any]): Shard title -> row count, ('+', n) to add
+                                     n rows, or None if unknown
+        """
+        def update(worksheet, created):
+            rows = {}
+            if not created:
+                for row in self.scheduler.read(worksheet.get_all_values)[1:]:
+                    if row and row[0]:
+                        rows[row[0]] = row[1:3]
+            
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for title, count in counts.items():
+                previous = int(rows[title][0]) if title in rows and str(rows[title][0]).isdigit() else 0
+                if isinstance(count, tuple):
+                    count = previous + count[1]
+                rows[title] = [count if count is not None else previous, timestamp]
+            
+            values = [SHARD_INDEX_HEADERS] + [[title] + rows[title] for title in sorted(rows)]
+            self._ensure_rows(worksheet, len(values))
+            self.scheduler.write(worksheet.update, 'A1', values)
+        
+        self._run_on_worksheet(spreadsheet_id, index_sheet, update, create=True)
+    
+    def get_shard_index(self, spreadsheet_id: str, index_sheet: str = "Leads Index") -> Dict[str, int]:
+        """
+        Get the row count of every shard from the index worksheet
+        
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            index_sheet (str): Name of the shard index worksheet
+            
+        Returns:
+            Dict[str, int]: Shard worksheet title -> number of lead rows
+        """
+        try:
+            values = self._run_on_worksheet(
+                spreadsheet_id, index_sheet, lambda worksheet, created: self.scheduler.read(worksheet.get_all_values)
+            )
+            return {
+                row[0]: int(row[1]) if len(row) > 1 and str(row[1]).isdigit() else 0
+                for row in values[1:] if row and row[0]
+            }
+        except Exception as e:
+            print(f"Error reading shard index from Google Sheets: {str(e)}")
+            return {}
+    
+    def _load_key_index(self, worksheet, headers: List[str], all_headers: List[str], created: bool) -> Dict:
+        """
+        Get the key -> row index for a worksheet, rebuilding it if the sheet changed
+        
+        Args:
+            worksheet: Google Sheets worksheet object
+            headers (List[str]): Lead column headers
+            all_headers (List[str]): Lead headers plus the hidden key columns
+            created (bool): Whether the worksheet was just created
+            
+        Returns:
+            Dict: Index with 'revision' and 'rows' (key -> (row number, digest))
+        """
+        cache_key = (self.fingerprint, worksheet.spreadsheet.id, worksheet.title)
+        revision = None
+        
+        if not created:
+            revision = self.scheduler.read(worksheet.spreadsheet.get_lastUpdateTime)
+            index = _key_index_cache.get(cache_key)
+            if index is not None and index['revision'] == revision:
+                return index
+        
+        index = {'revision': revision, 'rows': {}}
+        header_row = []
+        
+        if not created:
+            # Only the identity columns are needed, never the full sheet
+            key_col = _column_letter(len(headers) + 1)
+            last_col = _column_letter(len(all_headers))
+            header_values, identity_values, key_values = self.scheduler.read(
+                worksheet.batch_get, ['1:1', 'A2:B', f'{key_col}2:{last_col}']
+            )
+            header_row = header_values[0] if header_values else []
+            
+            for offset in range(max(len(identity_values), len(key_values))):
+                identity_cells = identity_values[offset] if offset < len(identity_values) else []
+                key_cells = key_values[offset] if offset < len(key_values) else []
+                
+                if key_cells and key_cells[0]:
+                    key = key_cells[0]
+                    digest = key_cells[1] if len(key_cells) > 1 else ''
+                elif identity_cells and any(identity_cells):
+                    # Row written without key columns, derive its key and force a rewrite
+                    key = lead_key({
+                        'business_name': identity_cells[0],
+                        'website': identity_cells[1] if len(identity_cells) > 1 else ''
+                    })
+                    digest = ''
+                else:
+                    continue
+                
+                index['rows'][key] = (offset + 2, digest)
+        
+        if header_row[:len(all_headers)] != all_headers:
+            # Write headers including the key columns and hide the key columns
+            index['revision'] = None
+            self.scheduler.write(worksheet.update, 'A1', [all_headers])
+            self.scheduler.write(worksheet.spreadsheet.batch_update, {
+                'requests': [{
+                    'updateDimensionProperties': {
+                        'range': {
+                            'sheetId': worksheet.id,
+                            'dimension': 'COLUMNS',
+                            'startIndex': len(headers),
+                            'endIndex': len(all_headers)
+                        },
+                        'properties': {'hiddenByUser': True},
+                        'fields': 'hiddenByUser'
+                    }
+                }]
+            })
+        
+        with _cache_lock:
+            _key_index_cache[cache_key] = index
+        
+        return index
+    
+    def get_existing_leads(self, spreadsheet_id: str, sheet_name: str = "Leads", use_cache: bool = True) -> List[Dict]:
         """
         Get existing leads from Google Sheet
         
+        With use_cache, the spreadsheet's modified time is checked first (a cheap
+        Drive metadata call) and the sheet is only downloaded again if it changed
+        since the contents were last read or written by this process.
+        
         Args:
             spreadsheet_id (str): Google Sheets spreadsheet ID
             sheet_name (str): Name of the sheet to read from
+            use_cache (bool): Serve unchanged contents from the local cache
             
         Returns:
             List[Dict]: List of existing leads
         """
         try:
-            # Open the spreadsheet
-            spreadsheet = self.client.open_by_key(spreadsheet_id)
-            
-            # Get the worksheet
-            worksheet = spreadsheet.worksheet(sheet_name)
+            def read(worksheet, created):
+                if not use_cache:
+                    return self.scheduler.read(worksheet.get_all_values)
+                
+                cache_key = (self.fingerprint, spreadsheet_id, sheet_name)
+                revision = self.scheduler.read(worksheet.spreadsheet.get_lastUpdateTime)
+                values = _content_cache.get(cache_key, revision)
+                if values is None:
+                    values = self.scheduler.read(worksheet.get_all_values)
+                    _content_cache.put(cache_key, revision, values)
+                return values
             
-            # Get all values
-            all_values = worksheet.get_all_values()
+            # Get all values from the (cached) worksheet
+            all_values = self._run_on_worksheet(spreadsheet_id, sheet_name, read)
             
             if len(all_values) < 2:  # No data or only headers
                 return []
             
-            # Convert to list of dictionaries
-            headers = all_values[0]
-            leads = []
-            
-            for row in all_values[1:]:
-                lead = {}
-                for i, header in enumerate(headers):
-                    if i < len(row):
-                        lead[header.lower().replace(' ', '_')] = row[i]
-                    else:
-                        lead[header.lower().replace(' ', '_')] = ''
-                leads.append(lead)
+            # Convert to list of dictionaries, mapping headers to keys once
+            keys = _record_keys(all_values[0])
+            width = len(keys)
+            leads = [
+                dict(zip(keys, row[:width] + [''] * (width - len(row))))
+                for row in all_values[1:]
+            ]
             
             return leads
             
@@ -263,6 +966,95 @@ class GoogleSheetsWriter:
             print(f"Error reading from Google Sheets: {str(e)}")
             return []
     
+    def iter_existing_leads(self, spreadsheet_id: str, sheet_name: str = "Leads", page_size: int = 500,
+                            columns: List[str] = None, as_dataframe: bool = False) -> Iterator:
+        """
+        Stream existing leads from Google Sheet in bounded pages
+        
+        Rows are fetched page_size at a time, so memory stays flat and the first
+        leads are available after a single page request. Headers are read and
+        mapped to record keys once. The API leaves out trailing empty rows of
+        each range, so every page also fetches an anchor column (the lead key
+        column of upserted sheets, otherwise the first column), and blank rows
+        at the end of a page are only yielded once a later page has data.
+        Reading stops at the first empty page or if an error occurs (which is
+        printed, like get_existing_leads).
+        
+        Args:
+            spreadsheet_id (str): Google Sheets spreadsheet ID
+            sheet_name (str): Name of the sheet to read from
+            page_size (int): Number of rows fetched per request
+            columns (List[str]): Headers (e.g. 'Phone') or keys (e.g. 'phone') to
+                                 fetch, or None for every column
+            as_dataframe (bool): Yield one DataFrame per page instead of dicts
+            
+        Yields:
+            Dict or pd.DataFrame: One lead per row, or one DataFrame per page
+        """
+        try:
+            worksheet, _ = self._get_worksheet(spreadsheet_id, sheet_name)
+            headers = self.scheduler.read(worksheet.row_values, 1)
+            all_keys = _record_keys(headers)
+            
+            # Resolve the selected columns to positions once
+            if columns:
+                wanted = set(columns)
+                positions = [i for i, (header, key) in enumerate(zip(headers, all_keys))
+                             if header in wanted or key in wanted]
+            else:
+                positions = list(range(len(headers)))
+            if not positions:
+                return
+            keys = [all_keys[i] for i in positions]
+            
+            # Contiguous column spans, each fetched as one range per page
+            spans = []
+            for position in positions:
+                if spans and spans[-1][1] == position:
+                    spans[-1][1] = position + 1
+                else:
+                    spans.append([position, position + 1])
+            
+            # Column that is filled on every row, for telling sparse columns from the end of the data
+            anchor = headers.index(KEY_HEADER) if KEY_HEADER in headers else 0
+            anchor_column = [] if anchor in positions else [_column_letter(anchor + 1)]
+            
+            start = 2
+            blank_rows = 0
+            while True:
+                end = start + page_size - 1
+                ranges = [f'{_column_letter(first + 1)}{start}:{_column_letter(last)}{end}' for first, last in spans]
+                ranges += [f'{column}{start}:{column}{end}' for column in anchor_column]
+                blocks = self.scheduler.read(worksheet.batch_get, ranges)
+                num_rows = max((len(block) for block in blocks), default=0)
+                if num_rows == 0:
+                    return
+                
+                # Blank rows held back from the previous page turned out to be interior
+                page = [[''] * len(keys) for _ in range(blank_rows)]
+                for offset in range(num_rows):
+                    row = []
+                    for (first, last), block in zip(spans, blocks):
+                        cells = block[offset] if offset < len(block) else []
+                        row.extend(cells[:last - first] + [''] * (last - first - len(cells)))
+                    page.append(row)
+                
+                if as_dataframe:
+                    if page:
+                        yield pd.DataFrame(page, columns=keys)
+                else:
+                    for row in page:
+                        yield dict(zip(keys, row))
+                
+                blank_rows = page_size - num_rows
+                start = end + 1
+                
+        except Exception as e:
+            if _is_missing_sheet_error(e):
+                self._invalidate(spreadsheet_id)
+            print(f"Error reading from Google Sheets: {str(e)}")
+            return
+    
     def create_spreadsheet(self, title: str) -> str:
         """
         Create a new Google Spreadsheet
@@ -274,7 +1066,10 @@ class GoogleSheetsWriter:
             str: Spreadsheet ID
         """
         try:
-            spreadsheet = self.client.create(title)
+            self._ensure_fresh_token()
+            spreadsheet = self.scheduler.write(self.client.create, title)
+            with _cache_lock:
+                _spreadsheet_cache[(self.fingerprint, spreadsheet.id)] = spreadsheet
             return spreadsheet.id
         except Exception as e:
             raise Exception(f"Failed to create spreadsheet: {str(e)}")
@@ -289,7 +1084,7 @@ class GoogleSheetsWriter:
             role (str): Role (reader, writer, owner)
         """
         try:
-            spreadsheet = self.client.open_by_key(spreadsheet_id)
-            spreadsheet.share(email, perm_type='user', role=role)
+            spreadsheet = self._open_spreadsheet(spreadsheet_id)
+            self.scheduler.write(spreadsheet.share, email, perm_type='user', role=role)
         except Exception as e:
             print(f"Error sharing spreadsheet: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,182 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from config import Config
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # Encrypted disk cache is optional
+    Fernet = None
+    InvalidToken = Exception
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, fall back to unlocked writes
+    fcntl = None
+
+_EXPIRY_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, like google-auth's _helpers.utcnow()"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC, the form google-auth keeps expiry in"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _fernet_key(secret: str) -> bytes:
+    """Derive a Fernet key from an arbitrary secret string"""
+    return base64.urlsafe_b64encode(hashlib.sha256(secret.encode('utf-8')).digest())
+
+
+class TokenCache:
+    def __init__(self, path: Optional[str] = None, secret: Optional[str] = None):
+        """
+        Cache of OAuth access tokens keyed by service account email
+
+        Tokens are always kept in memory. When a path and secret are given they
+        are also written to an encrypted file, so other worker processes using
+        the same service account can reuse a token instead of minting their own.
+
+        Args:
+            path (str): File for the shared encrypted cache, or None for memory only
+            secret (str): Secret the disk cache is encrypted with
+        """
+        self.path = path
+        self._memory: Dict[str, Tuple[str, datetime]] = {}
+        self._lock = threading.Lock()
+        self._fernet = None
+
+        if path and secret:
+            if Fernet is None:
+                print("Warning: cryptography is not installed, token cache stays in memory only")
+            else:
+                self._fernet = Fernet(_fernet_key(secret))
+
+    def get(self, key: str) -> Optional[Tuple[str, datetime]]:
+        """
+        Get a cached token
+
+        Args:
+            key (str): Service account email (plus scopes)
+
+        Returns:
+            Optional[Tuple[str, datetime]]: Access token and its naive UTC expiry
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+
+        entry = self._read_disk().get(key)
+        if entry is None:
+            return None
+
+        token = (entry['token'], datetime.strptime(entry['expiry'], _EXPIRY_FORMAT))
+        with self._lock:
+            self._memory[key] = token
+        return token
+
+    def put(self, key: str, token: str, expiry: datetime):
+        """
+        Store a token in memory and, if enabled, in the shared disk cache
+
+        Args:
+            key (str): Service account email (plus scopes)
+            token (str): Access token
+            expiry (datetime): Expiry of the token, naive UTC or timezone-aware
+        """
+        expiry = _naive_utc(expiry)
+        with self._lock:
+            self._memory[key] = (token, expiry)
+
+        if self._fernet is None:
+            return
+
+        try:
+            with self._file_lock():
+                entries = self._read_disk()
+                entries[key] = {'token': token, 'expiry': expiry.strftime(_EXPIRY_FORMAT)}
+
+                # Drop tokens that have already expired
+                now = _utcnow().strftime(_EXPIRY_FORMAT)
+                entries = {k: v for k, v in entries.items() if v['expiry'] > now}
+
+                self._write_disk(entries)
+        except OSError as e:
+            print(f"Warning: Could not write token cache: {str(e)}")
+
+    def _read_disk(self) -> Dict[str, Dict]:
+        """Load and decrypt the disk cache, treating any problem as empty"""
+        if self._fernet is None or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'rb') as f:
+                return json.loads(self._fernet.decrypt(f.read()))
+        except (OSError, ValueError, InvalidToken):
+            return {}
+
+    def _write_disk(self, entries: Dict[str, Dict]):
+        """Encrypt and atomically replace the disk cache"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.token_cache_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._fernet.encrypt(json.dumps(entries).encode('utf-8')))
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _file_lock(self):
+        """Lock the cache file against concurrent writers in other processes"""
+        return _FileLock(f"{self.path}.lock")
+
+
+class _FileLock:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._file = open(self.path, 'a')
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+_token_cache: Optional[TokenCache] = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache() -> TokenCache:
+    """
+    Get the process-wide token cache
+
+    Returns:
+        TokenCache: Cache configured from TOKEN_CACHE_PATH and TOKEN_CACHE_SECRET
+    """
+    global _token_cache
+    with _token_cache_lock:
+        if _token_cache is None:
+            _token_cache = TokenCache(Config.TOKEN_CACHE_PATH, Config.TOKEN_CACHE_SECRET)
+        return _token_cache
@@ -0,0 +1,358 @@
+import html
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from page_cache import PageCache
+
+USER_AGENT = "LeadFinderBot/1.0 (+https://github.com/SHREYANSHx07/location_AI)"
+
+# Paths tried when the home page doesn't link to a contact page
+CONTACT_PATHS = ['/contact', '/contact-us']
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERN = re.compile(r'\+?\(?\d[\d\s\-().]{8,}\d')
+MAILTO_PATTERN = re.compile(r'href=["\']mailto:([^"\'?]+)', re.IGNORECASE)
+TEL_PATTERN = re.compile(r'href=["\']tel:([^"\']+)', re.IGNORECASE)
+LINK_PATTERN = re.compile(r'<a\s[^>]*href=["\']([^"\'#]+)["\'][^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+ADDRESS_TAG_PATTERN = re.compile(r'<address[^>]*>(.*?)</address>', re.IGNORECASE | re.DOTALL)
+JSON_LD_PATTERN = re.compile(r'<script[^>]*application/ld\+json[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Matches of EMAIL_PATTERN that are really asset names such as logo@2x.png
+_ASSET_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.css', '.js')
+
+
+def _html_to_text(page: str) -> str:
+    """Strip scripts, styles and tags from HTML"""
+    text = TAG_PATTERN.sub(' ', SCRIPT_STYLE_PATTERN.sub(' ', page))
+    return ' '.join(html.unescape(text).split())
+
+
+def _unique(values: List[str]) -> List[str]:
+    """Deduplicate while keeping the first occurrence order"""
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def _find_postal_addresses(node) -> List[str]:
+    """Collect schema.org PostalAddress values from parsed JSON-LD"""
+    addresses = []
+    if isinstance(node, list):
+        for item in node:
+            addresses.extend(_find_postal_addresses(item))
+    elif isinstance(node, dict):
+        address = node.get('address')
+        if isinstance(address, str):
+            addresses.append(address)
+        elif isinstance(address, dict) and address.get('streetAddress'):
+            parts = [address.get(field) for field in
+                     ('streetAddress', 'addressLocality', 'addressRegion', 'postalCode', 'addressCountry')]
+            addresses.append(', '.join(str(part) for part in parts if isinstance(part, str) and part))
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                addresses.extend(_find_postal_addresses(value))
+    return addresses
+
+
+def extract_contacts(page: str) -> Dict[str, List[str]]:
+    """
+    Extract contact details from an HTML page
+
+    Args:
+        page (str): HTML source
+
+    Returns:
+        Dict[str, List[str]]: 'emails', 'phones' and 'addresses' found, in page order
+    """
+    text = _html_to_text(page)
+
+    emails = [html.unescape(email).strip() for email in MAILTO_PATTERN.findall(page)]
+    emails += EMAIL_PATTERN.findall(text)
+    emails = [email.lower() for email in emails if not email.lower().endswith(_ASSET_SUFFIXES)]
+
+    phones = [html.unescape(phone).strip() for phone in TEL_PATTERN.findall(page)]
+    phones += [match.strip() for match in PHONE_PATTERN.findall(text)]
+    # Keep numbers with a plausible number of digits
+    phones = [phone for phone in phones if 10 <= len(re.sub(r'\D', '', phone)) <= 15]
+
+    addresses = []
+    for block in JSON_LD_PATTERN.findall(page):
+        try:
+            addresses.extend(_find_postal_addresses(json.loads(block)))
+        except ValueError:
+            continue
+    addresses += [_html_to_text(block) for block in ADDRESS_TAG_PATTERN.findall(page)]
+
+    return {
+        'emails': _unique(emails),
+        'phones': _unique(phones),
+        'addresses': _unique(addresses)
+    }
+
+
+class _HostState:
+    """Per-host politeness state: connection slots, request spacing and robots rules"""
+
+    def __init__(self, concurrency: int):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.lock = threading.Lock()
+        self.next_request = 0.0
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_lock = threading.Lock()
+
+
+class WebsiteEnricher:
+    def __init__(self, max_concurrency: Optional[int] = None, host_concurrency: Optional[int] = None,
+                 host_delay: Optional[float] = None, timeout: Optional[float] = None,
+                 max_page_kb: Optional[int] = None, respect_robots: bool = True,
+                 session: Optional[requests.Session] = None, page_cache: Optional[PageCache] = None):
+        """
+        Fetch lead websites concurrently and extract contact details
+
+        Each website's home page and contact page are fetched. A cap shared
+        by all callers of the enricher limits fetches in flight; per host, at most host_concurrency fetches
+        run at once, spaced at least host_delay seconds apart (or the
+        robots.txt Crawl-delay, if longer). robots.txt is fetched once per host
+        and cached. Every fetch is limited in time and size. With a page
+        cache, pages fetched before are revalidated with a conditional GET and
+        a 304 reuses the cached body.
+
+        Args:
+            max_concurrency (int): Fetches in flight across all hosts
+            host_concurrency (int): Fetches in flight per host
+            host_delay (float): Minimum seconds between requests to one host
+            timeout (float): Seconds allowed per fetch, including the body
+            max_page_kb (int): Bytes read per page, in KB; the rest is discarded
+            respect_robots (bool): Skip pages robots.txt disallows
+            session (requests.Session): Session to fetch with
+            page_cache (PageCache): Cache of previously fetched pages
+        """
+        self.max_concurrency = max_concurrency or Config.ENRICH_MAX_CONCURRENCY
+        self.host_concurrency = host_concurrency or Config.ENRICH_HOST_CONCURRENCY
+        self.host_delay = Config.ENRICH_HOST_DELAY if host_delay is None else host_delay
+        self.timeout = timeout or Config.ENRICH_TIMEOUT
+        self.max_bytes = (max_page_kb or Config.ENRICH_MAX_PAGE_KB) * 1024
+        self.respect_robots = respect_robots
+        self.page_cache = page_cache
+
+        self.session = session or requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency, pool_maxsize=self.host_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._hosts: Dict[str, _HostState] = {}
+        self._hosts_lock = threading.Lock()
+        self.stats = {'pages': 0, 'bytes': 0, 'errors': 0, 'robots_blocked': 0, 'truncated': 0,
+                      'not_modified': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += amount
+
+    def _host(self, netloc: str) -> _HostState:
+        with self._hosts_lock:
+            state = self._hosts.get(netloc)
+            if state is None:
+                state = self._hosts[netloc] = _HostState(self.host_concurrency)
+            return state
+
+    def _download(self, url: str) -> Tuple[Optional[int], str]:
+        """
+        Fetch a URL within the size and time limits, respecting host politeness
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            Tuple[Optional[int], str]: HTTP status (None on network errors) and decoded body
+        """
+        state = self._host(urlparse(url).netloc)
+        with state.slots:
+            with state.lock:
+                delay = self.host_delay
+                if state.robots is not None:
+                    delay = max(delay, float(state.robots.crawl_delay(USER_AGENT) or 0))
+                now = time.monotonic()
+                wait = state.next_request - now
+                state.next_request = max(now, state.next_request) + delay
+            if wait > 0:
+                time.sleep(wait)
+
+            # Shared by every caller of this enricher, so concurrent enrich_leads calls can't add up
+            with self._slots:
+                cached = self.page_cache.get(url) if self.page_cache is not None else None
+                headers = {}
+                if cached is not None:
+                    if cached['etag']:
+                        headers['If-None-Match'] = cached['etag']
+                    if cached['last_modified']:
+                        headers['If-Modified-Since'] = cached['last_modified']
+
+                deadline = time.monotonic() + self.timeout
+                try:
+                    with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                        if response.status_code == 304 and cached is not None:
+                            self._count('not_modified')
+                            self.page_cache.touch(url)
+                            return 200, cached['body'].decode(cached['encoding'] or 'utf-8', errors='replace')
+
+                        body = bytearray()
+                        for chunk in response.iter_content(chunk_size=16384):
+                            body.extend(chunk)
+                            if len(body) >= self.max_bytes:
+                                del body[self.max_bytes:]
+                                self._count('truncated')
+                                break
+                            if time.monotonic() > deadline:
+                                raise requests.Timeout(f"Reading {url} took longer than {self.timeout}s")
+
+                        self._count('pages')
+                        self._count('bytes', len(body))
+                        encoding = response.encoding or 'utf-8'
+                        if self.page_cache is not None and response.status_code == 200:
+                            self.page_cache.put(url, bytes(body), response.headers.get('ETag'),
+                                                response.headers.get('Last-Modified'), encoding)
+                        return response.status_code, body.decode(encoding, errors='replace')
+                except (requests.RequestException, LookupError) as e:
+                    self._count('errors')
+                    print(f"Error fetching {url}: {str(e)}")
+                    return None, ''
+
+    def _allowed(self, url: str) -> bool:
+        """Check robots.txt for a URL, fetching it once per host"""
+        if not self.respect_robots:
+            return True
+
+        parsed = urlparse(url)
+        state = self._host(parsed.netloc)
+        with state.robots_lock:
+            if state.robots is None:
+                robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+                status, body = self._download(robots_url)
+                robots = RobotFileParser(robots_url)
+                if status in (401, 403):
+                    robots.disallow_all = True
+                elif status is not None and status < 400:
+                    robots.parse(body.splitlines())
+                else:
+                    # Missing robots.txt (or unreachable host) means no restrictions
+                    robots.allow_all = True
+                state.robots = robots
+
+        if state.robots.can_fetch(USER_AGENT, url):
+            return True
+        self._count('robots_blocked')
+        return False
+
+    def fetch_page(self, url: str) -> str:
+        """
+        Fetch a page if robots.txt allows it
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            str: Page HTML, or '' if blocked, failed or not successful
+        """
+        if not self._allowed(url):
+            return ''
+        status, body = self._download(url)
+        return body if status is not None and status < 400 else ''
+
+    def enrich_website(self, website: str) -> Dict[str, List[str]]:
+        """
+        Extract contact details from a website's home and contact pages
+
+        Args:
+            website (str): Website URL
+
+        Returns:
+            Dict[str, List[str]]: 'emails', 'phones' and 'addresses', plus 'pages' fetched
+        """
+        if not website.startswith(('http://', 'https://')):
+            website = f"https://{website}"
+        home = f"{website.rstrip('/')}/"
+        netloc = urlparse(home).netloc
+
+        pages = [home]
+        home_page = self.fetch_page(home)
+
+        # Follow a contact link on the same site, or guess the usual paths
+        contact_links = []
+        for href, label in LINK_PATTERN.findall(home_page):
+            link = urljoin(home, html.unescape(href))
+            if 'contact' in (href + label).lower() and urlparse(link).netloc == netloc:
+                contact_links.append(link)
+        contact_links = _unique(contact_links)[:1] or [urljoin(home, path) for path in CONTACT_PATHS]
+
+        contacts = extract_contacts(home_page)
+        for link in contact_links:
+            contact_page = self.fetch_page(link)
+            pages.append(link)
+            if contact_page:
+                found = extract_contacts(contact_page)
+                for field in ('emails', 'phones', 'addresses'):
+                    contacts[field] = _unique(contacts[field] + found[field])
+                break
+
+        contacts['pages'] = pages
+        return contacts
+
+    def enrich_leads(self, leads: List[Dict], cancel_check: Callable[[], None] = None) -> List[Dict]:
+        """
+        Fill in missing phone, address and email details from lead websites
+
+        Websites shared by several leads are fetched once. Existing values
+        are kept; only empty fields are filled.
+
+        Args:
+            leads (List[Dict]): Leads with a 'website' field
+            cancel_check (Callable): Called before each website; an exception
+                                     it raises stops the enrichment and is re-raised
+
+        Returns:
+            List[Dict]: Copies of the leads with enriched contact details
+        """
+        websites = _unique([lead.get('website', '') for lead in leads])
+
+        def enrich(website):
+            if cancel_check is not None:
+                cancel_check()
+            return self.enrich_website(website)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="enricher") as executor:
+            results = dict(zip(websites, executor.map(enrich, websites)))
+
+        enriched = []
+        for lead in leads:
+            lead = dict(lead)
+            contacts = results.get(lead.get('website', ''))
+            if contacts:
+                if not lead.get('phone') and contacts['phones']:
+                    lead['phone'] = contacts['phones'][0]
+                if not lead.get('address') and contacts['addresses']:
+                    lead['address'] = contacts['addresses'][0]
+
+                contact_info = lead.get('contact_info', '') or ''
+                additions = []
+                if 'Phone:' not in contact_info and lead.get('phone'):
+                    additions.append(f"Phone: {lead['phone']}")
+                if 'Email:' not in contact_info and contacts['emails']:
+                    additions.append(f"Email: {contacts['emails'][0]}")
+                lead['contact_info'] = ', '.join([part for part in [contact_info] + additions if part])
+            enriched.append(lead)
+
+        return enriched
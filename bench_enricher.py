@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Lead Finder Automation - Website Enricher Benchmark
+
+Starts local HTTP fixture servers that imitate small business websites
+(home page, contact page, robots.txt, oversized and slow pages) and runs the
+WebsiteEnricher against them, so concurrency limits, politeness and
+extraction can be checked without touching real websites.
+
+Usage:
+    python bench_enricher.py --hosts 4 --sites 40 --latency 0.05
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app directory (and the tests' fixture server) to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+sys.path.insert(0, str(Path(__file__).parent / "tests"))
+
+from fixture_server import FixtureServer
+from page_cache import PageCache
+from website_enricher import WebsiteEnricher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebsiteEnricher against local fixture sites")
+    parser.add_argument('--hosts', type=int, default=4, help="Fixture servers (distinct hosts)")
+    parser.add_argument('--sites', type=int, default=40, help="Websites to enrich, spread over the hosts")
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument('--concurrency', type=int, default=16, help="Global fetch concurrency")
+    parser.add_argument('--host-concurrency', type=int, default=2, help="Fetches in flight per host")
+    parser.add_argument('--host-delay', type=float, default=0.0, help="Seconds between requests to one host")
+    args = parser.parse_args()
+
+    servers = [FixtureServer(args.latency) for _ in range(args.hosts)]
+    for server in servers:
+        server.__enter__()
+
+    try:
+        leads = [
+            {'business_name': f"Site {i}", 'website': f"{servers[i % args.hosts].url}/site{i}"}
+            for i in range(args.sites)
+        ]
+
+        enricher = WebsiteEnricher(max_concurrency=args.concurrency, host_concurrency=args.host_concurrency,
+                                   host_delay=args.host_delay, timeout=1.0, max_page_kb=256)
+        started = time.perf_counter()
+        enriched = enricher.enrich_leads(leads)
+        elapsed = time.perf_counter() - started
+
+        complete = sum(1 for lead in enriched if lead.get('phone') and lead.get('address') and 'Email:' in lead.get('contact_info', ''))
+        print(f"Enriched {complete}/{len(leads)} leads in {elapsed:.2f}s")
+        print(f"Example: {enriched[0]}")
+        print(f"Stats: {enricher.stats}")
+        print(f"Peak concurrent requests per host: {[server.peak_active for server in servers]} "
+              f"(limit {args.host_concurrency})")
+
+        # Re-enrich through a page cache: the second pass should be all 304s
+        cache_dir = tempfile.mkdtemp()
+        cache = PageCache(os.path.join(cache_dir, 'pages.db'), max_mb=16)
+        for label in ('cold cache', 'warm cache'):
+            before = sum(server.not_modified for server in servers)
+            cached_enricher = WebsiteEnricher(max_concurrency=args.concurrency, host_concurrency=args.host_concurrency,
+                                              host_delay=args.host_delay, timeout=1.0, max_page_kb=256,
+                                              page_cache=cache)
+            started = time.perf_counter()
+            cached_enricher.enrich_leads(leads)
+            print(f"Re-enrich ({label}): {time.perf_counter() - started:.2f}s, "
+                  f"{cached_enricher.stats['bytes']} body bytes, "
+                  f"{sum(server.not_modified for server in servers) - before} x 304")
+        print(f"Page cache: {cache.stats}, {cache.size_bytes} bytes on disk")
+        cache.close()
+
+        # Limits and robots.txt
+        base = servers[0].url
+        print(f"Disallowed by robots.txt: {enricher.fetch_page(f'{base}/private/page') == ''}")
+        started = time.perf_counter()
+        huge = enricher.fetch_page(f"{base}/huge")
+        print(f"Oversized page truncated to {len(huge) // 1024} KB in {time.perf_counter() - started:.2f}s")
+        started = time.perf_counter()
+        slow = enricher.fetch_page(f"{base}/slow")
+        print(f"Slow page gave up after {time.perf_counter() - started:.2f}s (empty: {slow == ''})")
+    finally:
+        for server in servers:
+            server.__exit__(None, None, None)
+
+
+if __name__ == "__main__":
+    main()
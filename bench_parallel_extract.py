@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Lead Finder Automation - Parallel Extraction Benchmark
+
+Fills a temporary response archive with synthetic SerpAPI responses and
+re-extracts it with a growing number of worker processes, reporting
+throughput, speedup over one process and the global dedup result.
+
+Usage:
+    python bench_parallel_extract.py --responses 2000 --workers 1 2 4 8
+"""
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from bench_serp_parsing import make_response
+from parallel_extract import extract_archive
+from response_archive import ResponseArchive
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark process-pool extraction of archived responses")
+    parser.add_argument('--responses', type=int, default=2000, help="Archived responses to reprocess")
+    parser.add_argument('--queries', type=int, default=200, help="Distinct queries (responses repeat leads)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="Worker counts to compare")
+    parser.add_argument('--shard-size', type=int, default=64, help="Responses per task")
+    args = parser.parse_args()
+
+    raw = make_response(organic=100, images=20, related=200)
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = ResponseArchive(directory, segment_mb=16)
+        for i in range(args.responses):
+            archive.add(f"Niche {i % args.queries}", "Pune", 100, raw)
+        print(f"Archive: {archive.stats()}")
+
+        baseline = None
+        for workers in args.workers:
+            started = time.perf_counter()
+            # The extractors print progress notes; keep the report readable
+            with redirect_stdout(io.StringIO()):
+                result = extract_archive(archive, workers=workers, shard_size=args.shard_size)
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+
+            print(f"{workers:>2} workers: {elapsed:6.2f}s, {result['responses'] / elapsed:8.0f} responses/s, "
+                  f"speedup {baseline / elapsed:4.2f}x, {result['extracted']} leads extracted, "
+                  f"{result['unique']} unique")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Lead Finder Automation - SerpAPI Parsing Benchmark
+
+Builds a large SerpAPI-shaped response (ads, knowledge graph, base64 inline
+images, related searches, pagination around the organic and local results)
+and compares decode time and peak memory of:
+
+- json.loads on the whole body (what response.json() does)
+- orjson.loads on the whole body (if orjson is installed)
+- serp_parser.parse_search_results, which decodes only the result arrays
+
+The selective parse is first checked against json.loads, on that response
+and on one whose only local_results key is nested in the knowledge graph.
+
+Usage:
+    python bench_serp_parsing.py --organic 100 --images 300 --related 3000
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from serp_parser import orjson, parse_search_results
+
+
+def make_response(organic, images, related):
+    """Build a synthetic SerpAPI response body"""
+    return json.dumps({
+        'search_metadata': {'id': 'bench', 'status': 'Success'},
+        'search_parameters': {'q': 'dentists in pune', 'engine': 'google'},
+        'ads': [
+            {'title': f"Ad {i}", 'link': "https://ads.example.com", 'extensions': ["Open now"] * 10,
+             'sitelinks': [{'title': "More", 'link': "https://ads.example.com/more"}] * 5}
+            for i in range(200)
+        ],
+        'local_results': {
+            'places': [
+                {'position': i, 'title': f"Clinic {i}", 'address': f"{i} MG Road, Pune",
+                 'phone': "+91 20 1234 5678", 'gps_coordinates': {'latitude': 18.5, 'longitude': 73.8}}
+                for i in range(20)
+            ],
+            'more_locations_link': "https://www.google.com/search?tbm=lcl"
+        },
+        'knowledge_graph': {'title': "Dentists", 'description': "d" * 2000,
+                            'profiles': [{'name': "Profile", 'link': "https://example.com"}] * 50},
+        'inline_images': [
+            {'thumbnail': "data:image/jpeg;base64," + "A" * 3000, 'source': "https://example.com", 'title': "Image"}
+            for _ in range(images)
+        ],
+        'organic_results': [
+            {'position': i, 'title': f"Smile Dental Clinic {i} - Home", 'link': f"https://clinic{i}.example.com/",
+             'snippet': "Call +91 20 5555 0000 for family dentistry, orthodontics and implants. " * 3,
+             'sitelinks': {'inline': [{'title': "Contact", 'link': "https://example.com/contact"}] * 4}}
+            for i in range(organic)
+        ],
+        'related_searches': [
+            {'query': f"dentist near me {i}", 'link': "https://www.google.com/search?q=dentist"}
+            for i in range(related)
+        ],
+        'pagination': {'current': 1, 'other_pages': {str(i): "https://www.google.com/search" for i in range(2, 11)}},
+        'serpapi_pagination': {'current': 1, 'next': "https://serpapi.com/search"}
+    }).encode('utf-8')
+
+
+def make_nested_response(organic):
+    """
+    Build a response whose only 'local_results' key is nested in the knowledge graph
+
+    The selective parse must not take the nested array for the top-level one.
+    """
+    document = json.loads(make_response(organic, 0, 0))
+    del document['local_results']
+    document['knowledge_graph']['local_results'] = [{'title': "WRONG {not [a] top-level} key"}]
+    return json.dumps(document).encode('utf-8')
+
+
+def check_equivalence(raw):
+    """Exit with an error if the selective parse disagrees with decoding the whole body"""
+    document = json.loads(raw)
+    local = document.get('local_results') or []
+    expected = {
+        'organic_results': document.get('organic_results') or [],
+        'local_results': local.get('places', []) if isinstance(local, dict) else local
+    }
+    if parse_search_results(raw) != expected:
+        sys.exit("parse_search_results disagrees with json.loads")
+
+
+def measure(label, decode, raw, repeat):
+    """Print the best decode time and the peak traced memory of one decode"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode(raw)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    decode(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<32} {best * 1000:>9.2f} ms {peak / 1024 / 1024:>9.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SerpAPI response decoding")
+    parser.add_argument('--organic', type=int, default=100, help="Organic results in the response")
+    parser.add_argument('--images', type=int, default=300, help="Inline images (base64 thumbnails)")
+    parser.add_argument('--related', type=int, default=3000, help="Related searches")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed runs per decoder (best is reported)")
+    args = parser.parse_args()
+
+    raw = make_response(args.organic, args.images, args.related)
+    check_equivalence(raw)
+    check_equivalence(make_nested_response(args.organic))
+    print(f"Response size: {len(raw) / 1024 / 1024:.2f} MB")
+    print(f"{'Decoder':<32} {'Time':>12} {'Peak memory':>12}")
+
+    measure("json.loads (response.json)", json.loads, raw, args.repeat)
+    if orjson is not None:
+        measure("orjson.loads", orjson.loads, raw, args.repeat)
+    else:
+        print("orjson.loads                     not installed")
+    measure("parse_search_results", parse_search_results, raw, args.repeat)
+
+    results = parse_search_results(raw)
+    print(f"Selective parse kept {len(results['organic_results'])} organic and "
+          f"{len(results['local_results'])} local results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Lead Finder Automation - Google Sheets Writer Benchmark
+
+Runs GoogleSheetsWriter operations against the in-memory fake Sheets backend
+and reports API round trips, payload sizes and wall time per operation, so
+changes to the writer can be checked without touching the real Google API.
+
+Usage:
+    python bench_sheets_writer.py --leads 2000 --changed 0.05 --latency 0.05
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from fake_sheets import FakeSheetsBackend
+from sheets_quota import QuotaScheduler
+from sheets_writer import GoogleSheetsWriter
+
+
+def make_leads(count, prefix="Business"):
+    """Build synthetic leads"""
+    return [
+        {
+            'business_name': f"{prefix} {i}",
+            'website': f"https://{prefix.lower()}{i}.example.com",
+            'address': f"{i} Main Street",
+            'phone': f"+1 555 {i:07d}",
+            'contact_info': f"Phone: +1 555 {i:07d}",
+            'niche': "Dentists",
+            'location': "Pune",
+            'description': f"Dental clinic number {i} with a reasonably long snippet of text",
+            'source_url': f"https://{prefix.lower()}{i}.example.com/about",
+            'search_date': "2024-01-01 00:00:00"
+        }
+        for i in range(count)
+    ]
+
+
+def change_leads(leads, fraction):
+    """Modify a fraction of the leads in place"""
+    step = max(1, int(1 / fraction)) if fraction else len(leads) + 1
+    for i in range(0, len(leads), step):
+        leads[i] = dict(leads[i], phone=f"+1 555 999{i:04d}")
+    return leads
+
+
+def measure(backend, label, operation):
+    """Run one operation and print its API cost"""
+    backend.reset_stats()
+    started = time.perf_counter()
+    operation()
+    elapsed = time.perf_counter() - started
+
+    stats = backend.stats
+    methods = ', '.join(f"{name}={count}" for name, count in sorted(stats['by_method'].items()))
+    print(f"{label:<34} {stats['calls']:>5} {stats['request_bytes'] / 1024:>10.1f} "
+          f"{stats['response_bytes'] / 1024:>10.1f} {elapsed:>8.3f}  {methods}")
+
+
+def main():
+    """Run the benchmark scenarios"""
+    parser = argparse.ArgumentParser(description="Benchmark GoogleSheetsWriter against a fake backend")
+    parser.add_argument("--leads", type=int, default=2000, help="Number of leads per save")
+    parser.add_argument("--changed", type=float, default=0.05, help="Fraction of leads changed/added per run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per API call")
+    args = parser.parse_args()
+
+    backend = FakeSheetsBackend(latency=args.latency)
+    scheduler = QuotaScheduler(read_per_minute=10 ** 6, write_per_minute=10 ** 6)
+    writer = GoogleSheetsWriter(backend=backend, scheduler=scheduler)
+    spreadsheet_id = backend.add_spreadsheet(spreadsheet_id="bench").id
+
+    leads = make_leads(args.leads)
+    changed = change_leads([dict(lead) for lead in leads], args.changed)
+    extra = make_leads(max(1, int(args.leads * args.changed)), prefix="New")
+
+    print(f"{'operation':<34} {'calls':>5} {'req KB':>10} {'resp KB':>10} {'seconds':>8}  methods")
+    print("-" * 100)
+
+    measure(backend, "save_leads (new sheet)", lambda: writer.save_leads(leads, spreadsheet_id, "Full"))
+    measure(backend, "save_leads (repeat)", lambda: writer.save_leads(leads, spreadsheet_id, "Full"))
+
+    measure(backend, "save_leads diff (first)", lambda: writer.save_leads(leads, spreadsheet_id, "Diff", diff=True))
+    measure(backend, "save_leads diff (unchanged)", lambda: writer.save_leads(leads, spreadsheet_id, "Diff", diff=True))
+    measure(backend, "save_leads diff (changed)", lambda: writer.save_leads(changed, spreadsheet_id, "Diff", diff=True))
+
+    measure(backend, "upsert_leads (new sheet)", lambda: writer.upsert_leads(leads, spreadsheet_id, "Upsert"))
+    measure(backend, "upsert_leads (changed + new)", lambda: writer.upsert_leads(changed + extra, spreadsheet_id, "Upsert"))
+
+    measure(backend, "append_leads", lambda: writer.append_leads(extra, spreadsheet_id, "Full"))
+    measure(backend, "get_existing_leads", lambda: writer.get_existing_leads(spreadsheet_id, "Full"))
+    measure(backend, "iter_existing_leads (500/page)", lambda: sum(1 for _ in writer.iter_existing_leads(spreadsheet_id, "Full")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from fake_sheets import FakeSheetsBackend  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+from sheets_quota import QuotaScheduler  # noqa: E402
+from sheets_writer import GoogleSheetsWriter, clear_handle_cache  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    """In-memory Sheets service with one spreadsheet, and clean process-wide caches"""
+    clear_handle_cache()
+    backend = FakeSheetsBackend()
+    backend.add_spreadsheet(spreadsheet_id="sheet")
+    yield backend
+    clear_handle_cache()
+
+
+@pytest.fixture
+def writer(backend):
+    """Writer on the fake backend with a quota that never waits"""
+    return GoogleSheetsWriter(backend=backend, scheduler=QuotaScheduler(10**6, 10**6))
+
+
+@pytest.fixture
+def fixture_server():
+    """Local HTTP server with fixture websites, see fixture_server.FixtureServer"""
+    with FixtureServer() as server:
+        yield server
@@ -0,0 +1,140 @@
+"""
+Local HTTP server imitating small business websites
+
+Used by the website enricher tests and by bench_enricher.py, so
+concurrency limits, politeness and extraction can be checked without
+touching real websites.
+"""
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROBOTS_TXT = "User-agent: *\nDisallow: /private\n"
+
+HOME_PAGE = """<html><head><title>Site {site}</title>
+<script type="application/ld+json">
+{{"@type": "Dentist", "name": "Site {site}", "address": {{"@type": "PostalAddress",
+"streetAddress": "{site} Main Street", "addressLocality": "Pune", "postalCode": "411001"}}}}
+</script></head>
+<body><h1>Welcome to Site {site}</h1>
+<a href="/site{site}/contact-us">Contact us</a>
+<a href="mailto:hello{site}@example.com">Email</a>
+<img src="/logo@2x.png"></body></html>"""
+
+CONTACT_PAGE = """<html><body><h1>Contact</h1>
+<p>Call <a href="tel:+91 20 5555 {site:04d}">+91 20 5555 {site:04d}</a></p>
+<address>{site} Main Street<br>Pune 411001</address>
+<p>Write to sales{site}@example.com</p></body></html>"""
+
+
+class FixtureServer:
+    def __init__(self, latency: float = 0.0):
+        """
+        Local HTTP server with fixture pages for every site number
+
+        Routes: /robots.txt, /site<N>/, /site<N>/contact-us, /private/...,
+        /huge (several MB), /slow (sleeps past typical timeouts before
+        answering) and /trickle (sends a large body in small, regular
+        chunks). Site pages carry an ETag and answer matching If-None-Match
+        with 304. Every request's path and start time is kept in log.
+
+        Args:
+            latency (float): Seconds added to every response
+        """
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.active = 0
+        self.peak_active = 0
+        self.log = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    server.log.append((self.path, time.monotonic()))
+                    server.active += 1
+                    server.peak_active = max(server.peak_active, server.active)
+                try:
+                    time.sleep(server.latency)
+                    self._respond()
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def _respond(self):
+                parts = [part for part in self.path.split('/') if part]
+                if self.path == '/robots.txt':
+                    return self._send(200, ROBOTS_TXT, 'text/plain')
+                if self.path == '/huge':
+                    return self._send(200, 'x' * 5 * 1024 * 1024)
+                if self.path == '/slow':
+                    time.sleep(5)
+                    return self._send(200, 'late')
+                if self.path == '/trickle':
+                    return self._trickle(chunks=50, size=16384, interval=0.1)
+                if parts and parts[0].startswith('site') and parts[0][4:].isdigit():
+                    site = int(parts[0][4:])
+                    if len(parts) == 1:
+                        return self._send_page(HOME_PAGE.format(site=site))
+                    if parts[1] == 'contact-us':
+                        return self._send_page(CONTACT_PAGE.format(site=site))
+                self._send(404, 'Not found')
+
+            def _send_page(self, body):
+                etag = f'"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self._send(200, body, etag=etag)
+
+            def _send(self, status, body, content_type='text/html; charset=utf-8', etag=None):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _trickle(self, chunks, size, interval):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(chunks * size))
+                self.end_headers()
+                try:
+                    for _ in range(chunks):
+                        self.wfile.write(b'x' * size)
+                        self.wfile.flush()
+                        time.sleep(interval)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,49 @@
+import asyncio
+
+from google.oauth2.credentials import Credentials
+
+from async_sheets_writer import AsyncGoogleSheetsWriter
+from sheets_backend import GspreadBackend
+from sheets_quota import QuotaScheduler
+from sheets_writer import GoogleSheetsWriter
+
+
+def lead(name):
+    return {'business_name': name, 'website': f"https://{name.lower()}.example.com"}
+
+
+def test_async_writer_uses_its_own_client(backend, writer):
+    async_writer = AsyncGoogleSheetsWriter(backend=backend, scheduler=writer.scheduler, max_concurrency=4)
+
+    assert async_writer.writer.client is not writer.client
+    assert async_writer.writer.fingerprint != writer.fingerprint
+    async_writer.close()
+
+
+def test_pooled_gspread_client_does_not_share_the_session():
+    backend = GspreadBackend()
+    credentials = Credentials(token="token")
+    shared = backend.authorize(credentials)
+    pooled = backend.authorize_pooled(credentials, pool_size=12)
+
+    assert pooled.http_client.session is not shared.http_client.session
+    assert pooled.http_client.session.get_adapter('https://sheets.googleapis.com')._pool_maxsize == 12
+    assert shared.http_client.session.get_adapter('https://sheets.googleapis.com')._pool_maxsize == 10
+
+
+def test_worksheet_locks_are_dropped_and_work_across_loops(backend):
+    async_writer = AsyncGoogleSheetsWriter(backend=backend, scheduler=QuotaScheduler(10**6, 10**6))
+
+    async def save(prefix):
+        jobs = [([lead(f"{prefix}{i}")], "sheet", f"Leads {i % 2}") for i in range(4)]
+        return await async_writer.save_many(jobs, mode="append")
+
+    # A lock created on one loop must not be reused on the next one
+    assert asyncio.run(save("a")) == [True] * 4
+    assert asyncio.run(save("b")) == [True] * 4
+
+    assert len(async_writer._worksheet_locks) == 0
+    leads = GoogleSheetsWriter(backend=backend, scheduler=QuotaScheduler(10**6, 10**6)).get_existing_leads(
+        "sheet", "Leads 0", use_cache=False)
+    assert sorted(row['business_name'] for row in leads) == ["a0", "a2", "b0", "b2"]
+    async_writer.close()
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from incremental_search import IncrementalSearch
+from lead_schema import normalize_query
+from lead_store import LeadStore
+
+
+def lead(name, phone=''):
+    return {'business_name': name, 'website': f"https://{name.lower()}.example.com", 'phone': phone}
+
+
+class FakeFinder:
+    """LeadFinder stand-in returning canned results and counting searches"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def search_leads(self, niche, location, num_results=20):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.db"))
+    yield store
+    store.close()
+
+
+def age_query(store, hours, niche="Dentist", location="Pune", num_results=20):
+    """Pretend a recorded query was last fetched some hours ago"""
+    query_key = normalize_query(niche, location, num_results)
+    query = store.get_query(query_key)
+    store.record_query(query_key, niche, location, num_results, query['lead_keys'],
+                       fetched_at=datetime.now() - timedelta(hours=hours))
+
+
+def names(leads):
+    return sorted(lead['business_name'] for lead in leads)
+
+
+def test_fresh_query_is_served_from_the_store(store):
+    finder = FakeFinder([lead("Acme"), lead("Beta")])
+    search = IncrementalSearch(finder, store, refresh_hours=24, niche_refresh_hours={})
+    first = search.search("Dentist", "Pune")
+    second = search.search("dentist ", "pune")
+
+    assert first['fetched'] and names(first['added']) == ["Acme", "Beta"]
+    assert not second['fetched']
+    assert names(second['leads']) == ["Acme", "Beta"]
+    assert finder.calls == 1
+
+
+def test_stale_query_reports_only_the_delta(store):
+    finder = FakeFinder([lead("Acme", "1"), lead("Beta")], [lead("Acme", "2"), lead("Gamma"), lead("Gamma")])
+    search = IncrementalSearch(finder, store, refresh_hours=24, niche_refresh_hours={})
+    search.search("Dentist", "Pune")
+    age_query(store, 25)
+    delta = search.search("Dentist", "Pune")
+
+    assert delta['fetched']
+    assert names(delta['added']) == ["Gamma"]
+    assert [changed['phone'] for changed in delta['changed']] == ["2"]
+    assert names(delta['removed']) == ["Beta"]
+    assert delta['unchanged'] == 0
+
+
+def test_niche_overrides_the_freshness_window(store):
+    finder = FakeFinder([lead("Acme")], [lead("Acme")])
+    search = IncrementalSearch(finder, store, refresh_hours=24, niche_refresh_hours={' Dentist': 1})
+    search.search("Dentist", "Pune")
+    age_query(store, 2)
+
+    assert search.is_stale("dentist", "Pune")
+    assert search.search("Dentist", "Pune")['unchanged'] == 1
+    assert finder.calls == 2
+
+
+def test_empty_response_does_not_remove_stored_leads(store):
+    finder = FakeFinder([lead("Acme")], [])
+    search = IncrementalSearch(finder, store, refresh_hours=24, niche_refresh_hours={})
+    search.search("Dentist", "Pune")
+    delta = search.search("Dentist", "Pune", force=True)
+
+    assert delta['fetched']
+    assert delta['removed'] == []
+    assert names(delta['leads']) == ["Acme"]
+    assert not search.is_stale("Dentist", "Pune")
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from job_pool import CANCELLED, DONE, JobPool
+
+
+@pytest.fixture
+def pool():
+    pool = JobPool(max_workers=2, max_per_session=5, max_active=10)
+    yield pool
+    pool.shutdown()
+
+
+def wait(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.finished
+
+
+def test_job_streams_leads_from_tasks(pool):
+    job = pool.submit("session", "Job", lambda task: [{'name': task['name']}],
+                      [{'name': "a"}, {'name': "b"}], concurrency=2)
+    wait(job)
+
+    assert job.state == DONE
+    assert sorted(lead['name'] for lead in job.leads_since(0)) == ["a", "b"]
+
+
+def test_cancel_stops_a_running_task(pool):
+    started = threading.Event()
+    steps = []
+
+    def task(arguments):
+        started.set()
+        for step in range(500):
+            arguments['cancel_check']()
+            steps.append(step)
+            time.sleep(0.01)
+        return []
+
+    job = pool.submit("session", "Job", task, [{}])
+    assert started.wait(5)
+    job.cancel()
+    wait(job)
+
+    assert job.state == CANCELLED
+    assert job.progress()['tasks'][0]['state'] == CANCELLED
+    assert len(steps) < 500
+
+
+def test_finished_jobs_of_other_sessions_expire(pool):
+    old = pool.submit("abandoned", "Old", lambda task: [], [{}])
+    wait(old)
+    pool.finished_ttl = 0
+
+    new = pool.submit("active", "New", lambda task: [], [{}])
+
+    assert pool.get(old.id) is None
+    assert pool.get(new.id) is new
+
+
+def test_keeps_the_newest_finished_jobs_per_session(pool):
+    pool.keep_finished = 1
+    first = pool.submit("session", "First", lambda task: [], [{}])
+    wait(first)
+    second = pool.submit("session", "Second", lambda task: [], [{}])
+    wait(second)
+
+    pool.submit("session", "Third", lambda task: [], [{}])
+
+    assert pool.get(first.id) is None
+    assert pool.get(second.id) is second
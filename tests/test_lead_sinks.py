@@ -0,0 +1,48 @@
+import csv
+import io
+import sqlite3
+
+import pytest
+
+from lead_schema import LEAD_HEADERS
+from lead_sinks import CsvSink, LeadSink, SqliteSink, export_leads
+
+
+def lead(name):
+    return {'business_name': name, 'website': f"https://{name.lower()}.example.com"}
+
+
+def test_sink_without_write_batch_fails_on_creation():
+    class Incomplete(LeadSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_csv_export_writes_headers_and_rows_in_batches():
+    target = io.BytesIO()
+
+    assert export_leads((lead(f"Lead{i}") for i in range(5)), '.csv', target, batch_size=2) == 5
+
+    rows = list(csv.reader(io.StringIO(target.getvalue().decode('utf-8'))))
+    assert rows[0] == LEAD_HEADERS
+    assert [row[0] for row in rows[1:]] == [f"Lead{i}" for i in range(5)]
+
+
+def test_csv_sink_counts_rows_across_writes(tmp_path):
+    with CsvSink(str(tmp_path / "leads.csv"), batch_size=2) as sink:
+        sink.write([lead("Acme")])
+        sink.write([lead("Beta"), lead("Gamma")])
+
+    assert sink.rows_written == 3
+
+
+def test_sqlite_sink_replaces_rewritten_leads(tmp_path):
+    path = str(tmp_path / "leads.db")
+    with SqliteSink(path, batch_size=2) as sink:
+        sink.write([lead("Acme"), lead("Beta"), lead("Acme")])
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 2
+    connection.close()
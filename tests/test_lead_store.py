@@ -0,0 +1,61 @@
+import pytest
+
+from lead_store import LeadStore
+
+
+def lead(name, phone=''):
+    return {'business_name': name, 'website': f"https://{name.lower()}.example.com", 'phone': phone}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.db"))
+    yield store
+    store.close()
+
+
+def test_change_feed_records_inserts_and_updates(store):
+    store.add_leads([lead("Acme", "1"), lead("Beta")])
+    cursor = store.latest_cursor()
+
+    # Unchanged leads are not reported again
+    store.add_leads([lead("Acme", "2"), lead("Beta")])
+
+    page = store.get_changes(cursor)
+    assert [(change['operation'], change['business_name'], change['phone']) for change in page['changes']] == [
+        ('update', "Acme", "2")
+    ]
+    assert page['cursor'] == store.latest_cursor()
+    assert not page['has_more']
+    assert store.get_changes(page['cursor'])['changes'] == []
+
+
+def test_change_feed_pages(store):
+    store.add_leads([lead(f"Lead{i}") for i in range(5)])
+
+    first = store.get_changes(0, limit=2)
+    assert len(first['changes']) == 2 and first['has_more']
+    assert [change['business_name'] for change in store.iter_changes(0, page_size=2)] == [
+        f"Lead{i}" for i in range(5)
+    ]
+
+
+def test_cursor_survives_pruning(store):
+    store.add_leads([lead("Acme"), lead("Beta")])
+    cursor = store.latest_cursor()
+
+    assert store.prune_changes(cursor) == 2
+    store.add_leads([lead("Gamma")])
+
+    assert [change['business_name'] for change in store.get_changes(cursor)['changes']] == ["Gamma"]
+
+
+def test_count_uses_find_leads_filters(store):
+    store.add_leads([dict(lead(f"Lead{i}", "1" if i % 2 else ""), niche="Dentist", description="orthodontic care")
+                     for i in range(7)])
+    store.add_leads([dict(lead("Other", "1"), niche="Vet")])
+
+    filters = {'niche': "dentist", 'has_phone': True, 'text': "orthodontic"}
+    assert store.count(**filters) == 3
+    pages = [store.find_leads(limit=2, offset=offset, **filters) for offset in (0, 2)]
+    assert [len(page) for page in pages] == [2, 1]
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from page_cache import PageCache
+from website_enricher import WebsiteEnricher
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.db"), max_mb=1)
+    yield cache
+    cache.close()
+
+
+def test_page_round_trip_with_validators(cache):
+    cache.put("https://acme.example.com/", b"<html>Acme</html>", '"v1"', "Mon, 01 Jan 2024 00:00:00 GMT", 'utf-8')
+
+    assert cache.get("https://acme.example.com/") == {
+        'etag': '"v1"',
+        'last_modified': "Mon, 01 Jan 2024 00:00:00 GMT",
+        'encoding': 'utf-8',
+        'body': b"<html>Acme</html>"
+    }
+    assert cache.get("https://beta.example.com/") is None
+
+
+def test_pages_without_validators_are_not_stored(cache):
+    cache.put("https://acme.example.com/", b"<html>Acme</html>", None, None)
+
+    assert cache.get("https://acme.example.com/") is None
+    assert cache.size_bytes == 0
+
+
+def test_least_recently_used_pages_are_evicted(cache):
+    # Random bytes don't compress, so three pages overflow the 1MB budget
+    for name in ("a", "b"):
+        cache.put(name, os.urandom(400 * 1024), '"v"', None)
+    cache.touch("a")
+    cache.put("c", os.urandom(400 * 1024), '"v"', None)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats['evictions'] == 1
+    assert cache.size_bytes <= cache.max_bytes
+
+
+def test_size_survives_reopening(tmp_path):
+    path = str(tmp_path / "pages.db")
+    cache = PageCache(path, max_mb=1)
+    cache.put("a", os.urandom(1024), '"v"', None)
+    size = cache.size_bytes
+    cache.close()
+
+    reopened = PageCache(path, max_mb=1)
+    assert reopened.size_bytes == size
+    reopened.close()
+
+
+def test_enricher_revalidates_cached_pages(fixture_server, cache):
+    leads = [{'business_name': f"Site {i}", 'website': f"{fixture_server.url}/site{i}"} for i in range(3)]
+    first = WebsiteEnricher(host_delay=0.0, timeout=2.0, page_cache=cache).enrich_leads(leads)
+    enricher = WebsiteEnricher(host_delay=0.0, timeout=2.0, page_cache=cache)
+    second = enricher.enrich_leads(leads)
+
+    assert second == first
+    assert fixture_server.not_modified == 6
+    assert enricher.stats['not_modified'] == 6
+    assert enricher.stats['bytes'] < 200
@@ -0,0 +1,51 @@
+import json
+from datetime import datetime
+
+from parallel_extract import extract_archive, extract_responses, iter_leads
+from response_archive import ResponseArchive
+
+
+def response(*places):
+    return json.dumps({'local_results': {'places': [
+        {'title': title, 'phone': phone, 'website': f"https://{title.lower().replace(' ', '')}.example.com"}
+        for title, phone in places
+    ]}}).encode('utf-8')
+
+
+RESPONSES = [
+    ("Dentist", "Pune", response(("Smile Dental", "1"), ("Tooth Care", "2"))),
+    ("Dentist", "Mumbai", response(("Smile Dental", "3"), ("Bright Teeth", "4"))),
+    ("Vet", "Pune", response(("Paws", "5"), ("Tooth Care", "6"))),
+]
+
+
+def test_dedup_keeps_the_first_lead_in_input_order():
+    result = extract_responses(RESPONSES, workers=1)
+    leads = list(iter_leads(result['columns']))
+
+    assert [(lead['business_name'], lead['phone']) for lead in leads] == [
+        ("Smile Dental", "1"), ("Tooth Care", "2"), ("Bright Teeth", "4"), ("Paws", "5")
+    ]
+    assert (result['responses'], result['extracted'], result['unique'], result['duplicates']) == (3, 6, 4, 2)
+    assert len(set(result['columns']['lead_key'])) == 4
+
+
+def test_process_pool_matches_inline_extraction():
+    inline = extract_responses(RESPONSES, workers=1)
+    pooled = extract_responses(RESPONSES, workers=2, shard_size=1)
+
+    assert pooled == inline
+
+
+def test_extract_archive_reads_frames_in_workers(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"), segment_mb=0)
+    for day, (niche, location, raw) in enumerate(RESPONSES, start=1):
+        archive.add(niche, location, 20, raw, fetched_at=datetime(2024, 1, day))
+
+    pooled = extract_archive(archive, workers=2, shard_size=1)
+    assert pooled == extract_responses(RESPONSES, workers=1)
+
+    recent = extract_archive(archive, workers=2, since="2024-01-02 00:00:00")
+    assert [lead['business_name'] for lead in iter_leads(recent['columns'])] == [
+        "Smile Dental", "Bright Teeth", "Paws", "Tooth Care"
+    ]
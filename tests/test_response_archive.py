@@ -0,0 +1,159 @@
+import base64
+import json
+import multiprocessing
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from response_archive import ResponseArchive
+
+
+def response(*titles):
+    return json.dumps({
+        'search_metadata': {'status': "Success"},
+        'local_results': {'places': [{'title': title, 'phone': "+91 20 1234 5678"} for title in titles]}
+    }, indent=2).encode('utf-8')
+
+
+def titles(search_results, niche, location):
+    """Extractor keeping only the place titles"""
+    return [place['title'] for place in search_results['local_results']]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ResponseArchive(str(tmp_path / "archive"))
+
+
+def test_add_and_get_latest_response(archive):
+    archive.add("Dentist", "Pune", 20, response("Old"), fetched_at=datetime(2024, 1, 1))
+    archive.add("Dentist", "Pune", 20, response("New"), fetched_at=datetime(2024, 2, 1))
+
+    record = archive.get("dentist", "pune", 20)
+    assert record['fetched_at'] == "2024-02-01 00:00:00"
+    assert record['response']['local_results']['places'][0]['title'] == "New"
+    assert archive.get("Vet", "Pune", 20) is None
+    assert archive.stats()['records'] == 2
+    assert archive.stats()['queries'] == 1
+
+
+def test_index_is_reloaded_and_skips_a_torn_last_line(archive):
+    archive.add("Dentist", "Pune", 20, response("Acme"))
+    with open(f"{archive.directory}/index.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"key": "torn')
+
+    reopened = ResponseArchive(archive.directory)
+    assert reopened.get("Dentist", "Pune", 20)['response']['local_results']['places'][0]['title'] == "Acme"
+
+
+def test_segments_roll_over_at_the_size_limit(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"), segment_mb=0)
+    for niche in ("Dentist", "Vet", "Gym"):
+        archive.add(niche, "Pune", 20, response(niche))
+
+    assert len(archive.segments()) == 3
+    reopened = ResponseArchive(archive.directory, segment_mb=0)
+    assert reopened.add("Spa", "Pune", 20, response("Spa"))['segment'] == "segment-000004.jsonl.zst"
+
+
+def test_replay_reextracts_every_record(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"), segment_mb=0)
+    archive.add("Dentist", "Pune", 20, response("Old"), fetched_at=datetime(2024, 1, 1))
+    archive.add("Vet", "Pune", 20, response("Vet A", "Vet B"), fetched_at=datetime(2024, 1, 2))
+    archive.add("Dentist", "Pune", 20, response("New"), fetched_at=datetime(2024, 1, 3))
+
+    replayed = list(archive.replay(titles, workers=2))
+    assert [(result['niche'], result['leads']) for result in replayed] == [
+        ("Dentist", ["Old"]), ("Vet", ["Vet A", "Vet B"]), ("Dentist", ["New"])
+    ]
+
+    latest = list(archive.replay(titles, latest_only=True, since="2024-01-02 00:00:00"))
+    assert [result['leads'] for result in latest] == [["Vet A", "Vet B"], ["New"]]
+
+
+def test_replay_with_the_live_extractor(archive):
+    archive.add("Dentist", "Pune", 20, response("Smile Dental"))
+    leads = next(archive.replay())['leads']
+
+    assert [lead['business_name'] for lead in leads] == ["Smile Dental"]
+    assert leads[0]['niche'] == "Dentist"
+
+
+def add_many(directory, worker, count):
+    archive = ResponseArchive(directory, segment_mb=1)
+    padding = base64.b64encode(os.urandom(16 * 1024)).decode()
+    for index in range(count):
+        archive.add(f"Niche {worker}-{index}", "Pune", 20, response(f"Place {worker}-{index}", padding))
+
+
+def test_processes_sharing_a_directory_do_not_clobber_each_other(tmp_path):
+    directory = str(tmp_path / "archive")
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=add_many, args=(directory, worker, 50)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    archive = ResponseArchive(directory)
+    entries = list(archive.index.values())
+    assert len(entries) == 200
+    assert len({(entry['segment'], entry['offset']) for entry in entries}) == 200
+    assert sorted(result['leads'][0] for result in archive.replay(titles)) == sorted(
+        f"Place {worker}-{index}" for worker in range(4) for index in range(50))
+
+
+def test_records_added_by_another_instance_are_visible(tmp_path):
+    first = ResponseArchive(str(tmp_path / "archive"))
+    second = ResponseArchive(first.directory)
+    second.add("Dentist", "Pune", 20, response("Acme"))
+
+    assert first.get("Dentist", "Pune", 20)['response']['local_results']['places'][0]['title'] == "Acme"
+    assert first.stats()['records'] == 1
+
+
+def test_add_after_a_torn_index_line_keeps_both_records(archive):
+    archive.add("Dentist", "Pune", 20, response("Acme"))
+    with open(f"{archive.directory}/index.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"key": "torn')
+
+    ResponseArchive(archive.directory).add("Vet", "Pune", 20, response("Paws"))
+
+    reopened = ResponseArchive(archive.directory)
+    assert reopened.get("Dentist", "Pune", 20) is not None
+    assert reopened.get("Vet", "Pune", 20) is not None
+
+
+def test_oldest_segments_are_deleted_beyond_the_size_limit(tmp_path):
+    # Base64 of random data only compresses to its 6 bits per character, about 300KB per segment
+    archive = ResponseArchive(str(tmp_path / "archive"), segment_mb=0, max_mb=1)
+    for day in range(1, 7):
+        archive.add(f"Niche {day}", "Pune", 20, response(base64.b64encode(os.urandom(300 * 1024)).decode()),
+                    fetched_at=datetime(2024, 1, day))
+
+    assert archive.segments() == [f"segment-{number:06d}.jsonl.zst" for number in (4, 5, 6)]
+    assert archive.stats()['bytes'] <= 1024 * 1024
+    assert archive.get("Niche 3", "Pune", 20) is None
+    assert sorted(ResponseArchive(archive.directory).index) == sorted(archive.index)
+    assert len(archive.index) == 3
+
+
+def test_segments_past_the_age_limit_are_deleted(tmp_path):
+    archive = ResponseArchive(str(tmp_path / "archive"), segment_mb=0, max_age_days=7)
+    for niche in ("Dentist", "Vet", "Gym"):
+        archive.add(niche, "Pune", 20, response(niche))
+
+    # Age every segment, including the one still being appended to
+    old = time.time() - 10 * 86400
+    for name in archive.segments():
+        os.utime(os.path.join(archive.directory, name), (old, old))
+    other = ResponseArchive(archive.directory, segment_mb=0, max_age_days=0)
+
+    assert archive.prune() == ["segment-000001.jsonl.zst", "segment-000002.jsonl.zst"]
+    assert archive.segments() == ["segment-000003.jsonl.zst"]
+    assert other.get("Dentist", "Pune", 20) is None
+    assert other.get("Gym", "Pune", 20) is not None
+    assert other.add("Spa", "Pune", 20, response("Spa"))['segment'] == "segment-000004.jsonl.zst"
+    assert sorted(result['niche'] for result in archive.replay(titles)) == ["Gym", "Spa"]
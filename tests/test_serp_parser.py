@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from serp_parser import parse_search_results
+
+
+def full_parse(raw):
+    """What decoding the whole body and picking the result arrays gives"""
+    document = json.loads(raw)
+    local = document.get('local_results') or []
+    return {
+        'organic_results': document.get('organic_results') or [],
+        'local_results': local.get('places', []) if isinstance(local, dict) else local
+    }
+
+
+ORGANIC = [{'position': 1, 'title': "Smile Dental {1}", 'link': "https://smile.example.com/"},
+           {'position': 2, 'title': "Quote \" and [bracket]", 'snippet': "back\\slash é"}]
+PLACES = [{'title': "Clinic", 'phone': "+91 20 1234 5678"}]
+
+
+@pytest.mark.parametrize("document", [
+    {'organic_results': ORGANIC, 'local_results': {'places': PLACES}},
+    {'ads': [{'title': "Ad ]}"}], 'organic_results': ORGANIC, 'local_results': PLACES},
+    {'search_metadata': {'id': "x"}},
+    {'organic_results': [], 'local_results': {}},
+    # A result key that only appears nested in another object isn't a top-level result
+    {'knowledge_graph': {'local_results': [{'title': "WRONG"}]}, 'organic_results': ORGANIC},
+    {'related_questions': [{'organic_results': [{'title': "WRONG"}]}]},
+    # A key name inside a string value isn't a key
+    {'snippet': 'see "organic_results": [1]', 'organic_results': ORGANIC},
+])
+def test_matches_json_loads(document):
+    for raw in (json.dumps(document).encode(), json.dumps(document, indent=2, ensure_ascii=False).encode()):
+        assert parse_search_results(raw) == full_parse(raw)
+
+
+def test_large_response_matches_json_loads():
+    document = {
+        'inline_images': [{'thumbnail': "data:image/jpeg;base64," + "A" * 3000}] * 200,
+        'knowledge_graph': {'description': "{[" * 50000, 'local_results': [{'title': "WRONG"}]},
+        'organic_results': ORGANIC * 50,
+        'related_searches': [{'query': "dentist \\ near me"}] * 2000,
+    }
+    raw = json.dumps(document).encode()
+
+    assert parse_search_results(raw) == full_parse(raw)
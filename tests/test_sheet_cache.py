@@ -0,0 +1,73 @@
+from sheet_cache import SheetContentCache, estimate_size
+
+
+def grid(name, rows=10):
+    return [[f"{name}{row}", "x" * 20] for row in range(rows)]
+
+
+def test_entry_is_served_only_at_its_revision():
+    cache = SheetContentCache(max_bytes=10**6)
+    cache.put("leads", "r1", grid("a"))
+
+    assert cache.get("leads", "r1") == grid("a")
+    assert cache.get("leads", "r2") is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_put_replaces_the_previous_revision():
+    cache = SheetContentCache(max_bytes=10**6)
+    cache.put("leads", "r1", grid("a"))
+    cache.put("leads", "r2", grid("b"))
+
+    assert cache.get("leads", "r1") is None
+    assert cache.get("leads", "r2") == grid("b")
+    assert cache.stats()['bytes'] == estimate_size(grid("b"))
+
+
+def test_least_recently_used_entries_are_evicted_within_budget():
+    size = estimate_size(grid("a"))
+    cache = SheetContentCache(max_bytes=size * 2 + size // 2)
+    cache.put("a", "r1", grid("a"))
+    cache.put("b", "r1", grid("b"))
+    cache.get("a", "r1")
+    cache.put("c", "r1", grid("c"))
+
+    stats = cache.stats()
+    assert cache.get("b", "r1") is None
+    assert cache.get("a", "r1") is not None
+    assert cache.get("c", "r1") is not None
+    assert stats['evictions'] == 1
+    assert stats['bytes'] <= stats['max_bytes']
+
+
+def test_entry_larger_than_budget_is_not_cached():
+    cache = SheetContentCache(max_bytes=estimate_size(grid("a")) - 1)
+    cache.put("a", "r1", grid("a"))
+
+    assert cache.get("a", "r1") is None
+    assert cache.stats()['bytes'] == 0
+
+
+def test_invalidate_drops_matching_keys():
+    cache = SheetContentCache(max_bytes=10**6)
+    cache.put(("sheet", "Leads"), "r1", grid("a"))
+    cache.put(("other", "Leads"), "r1", grid("b"))
+    cache.invalidate(lambda key: key[0] == "sheet")
+
+    assert cache.get(("sheet", "Leads"), "r1") is None
+    assert cache.get(("other", "Leads"), "r1") is not None
+
+
+def test_writer_rereads_only_after_the_revision_changes(writer, backend):
+    # A diff save into an existing sheet leaves the written contents cached at the new revision
+    assert writer.save_leads([], "sheet", "Leads")
+    assert writer.save_leads([{'business_name': "Acme"}], "sheet", "Leads", diff=True)
+    backend.reset_stats()
+
+    assert len(writer.get_existing_leads("sheet", "Leads")) == 1
+    assert backend.stats['by_method']['values_get'] == 0
+
+    backend.spreadsheets["sheet"].worksheet("Leads").append_rows([["Beta"]])
+    assert len(writer.get_existing_leads("sheet", "Leads")) == 2
+    assert backend.stats['by_method']['values_get'] == 1
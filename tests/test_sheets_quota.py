@@ -0,0 +1,101 @@
+import threading
+import time
+
+import gspread
+import pytest
+
+import sheets_quota
+from sheets_quota import QuotaScheduler
+
+
+@pytest.fixture
+def client(backend):
+    return backend.authorize(None)
+
+
+def test_budget_applies_over_a_sliding_window(monkeypatch):
+    monkeypatch.setattr(sheets_quota, 'QUOTA_WINDOW_SECONDS', 0.3)
+    scheduler = QuotaScheduler(read_per_minute=2, write_per_minute=2)
+    started = time.monotonic()
+    finished = []
+    for _ in range(5):
+        scheduler.read(lambda: finished.append(time.monotonic() - started))
+
+    # Two calls per window: 0, 0, 0.3, 0.3, 0.6
+    assert finished[1] < 0.1
+    assert 0.25 < finished[2] < 0.45
+    assert 0.55 < finished[4] < 0.8
+    assert scheduler.metrics()['waits'] == 2
+
+
+def test_reads_and_writes_have_separate_budgets(monkeypatch):
+    monkeypatch.setattr(sheets_quota, 'QUOTA_WINDOW_SECONDS', 5.0)
+    scheduler = QuotaScheduler(read_per_minute=1, write_per_minute=1)
+    scheduler.read(lambda: None)
+    started = time.monotonic()
+    scheduler.write(lambda: None)
+
+    assert time.monotonic() - started < 0.1
+    assert scheduler.metrics()['window_usage'] == {'read': 1, 'write': 1}
+
+
+def test_waiting_callers_are_served_in_order(monkeypatch):
+    monkeypatch.setattr(sheets_quota, 'QUOTA_WINDOW_SECONDS', 0.2)
+    scheduler = QuotaScheduler(read_per_minute=1, write_per_minute=1)
+    scheduler.read(lambda: None)
+    order = []
+    threads = []
+    for index in range(3):
+        thread = threading.Thread(target=scheduler.read, args=(order.append, index))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+
+    assert order == [0, 1, 2]
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_retryable_errors_are_retried(backend, client, status):
+    scheduler = QuotaScheduler(10**6, 10**6, base_backoff=0.01)
+    backend.fail_next(2, status)
+    spreadsheet = scheduler.read(client.open_by_key, "sheet")
+
+    metrics = scheduler.metrics()
+    assert spreadsheet.id == "sheet"
+    assert backend.stats['calls'] == 3
+    assert metrics['retries'] == 2
+    assert metrics['throttled'] == (2 if status == 429 else 0)
+
+
+def test_backoff_grows_exponentially(backend, client, monkeypatch):
+    delays = []
+    monkeypatch.setattr(sheets_quota.time, 'sleep', delays.append)
+    scheduler = QuotaScheduler(10**6, 10**6, base_backoff=1.0, max_backoff=4.0)
+    backend.fail_next(4, 429)
+    scheduler.read(client.open_by_key, "sheet")
+
+    for attempt, delay in enumerate(delays):
+        base = min(4.0, 2 ** attempt)
+        assert base <= delay <= base * 1.5
+
+
+def test_retries_give_up_after_max_retries(backend, client):
+    scheduler = QuotaScheduler(10**6, 10**6, max_retries=2, base_backoff=0.01)
+    backend.fail_next(5, 503)
+    with pytest.raises(gspread.exceptions.APIError):
+        scheduler.read(client.open_by_key, "sheet")
+
+    assert backend.stats['calls'] == 3
+    assert scheduler.metrics()['failed'] == 1
+
+
+def test_other_errors_are_not_retried(backend, client):
+    scheduler = QuotaScheduler(10**6, 10**6, base_backoff=0.01)
+    backend.fail_next(1, 400)
+    with pytest.raises(gspread.exceptions.APIError):
+        scheduler.read(client.open_by_key, "sheet")
+
+    assert backend.stats['calls'] == 1
+    assert scheduler.metrics()['retries'] == 0
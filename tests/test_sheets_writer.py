@@ -0,0 +1,64 @@
+from fake_sheets import FakeWorksheet, _api_error
+
+
+def lead(name, phone=''):
+    return {'business_name': name, 'website': f"https://{name.lower()}.example.com", 'phone': phone}
+
+
+def phones(writer):
+    return {row['business_name']: row['phone'] for row in writer.get_existing_leads("sheet", "Leads", use_cache=False)}
+
+
+def test_upsert_inserts_and_updates(writer):
+    assert writer.upsert_leads([lead("Acme", "1"), lead("Beta", "2")], "sheet", "Leads")
+    assert writer.upsert_leads([lead("Acme", "3"), lead("Gamma", "4")], "sheet", "Leads")
+
+    assert phones(writer) == {'Acme': '3', 'Beta': '2', 'Gamma': '4'}
+
+
+def test_upsert_retries_after_failed_write(writer, monkeypatch):
+    assert writer.upsert_leads([lead("Acme", "1")], "sheet", "Leads")
+
+    def broken(self, *args, **kwargs):
+        raise _api_error(500, "Internal error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(FakeWorksheet, 'batch_update', broken)
+        assert not writer.upsert_leads([lead("Acme", "2")], "sheet", "Leads")
+
+    # The failed write must not leave the cached index claiming the row is up to date
+    assert writer.upsert_leads([lead("Acme", "2")], "sheet", "Leads")
+    assert phones(writer) == {'Acme': '2'}
+
+
+def test_upsert_merges_repeated_leads(writer):
+    assert writer.upsert_leads([lead("Acme", "1"), lead("Acme", "1")], "sheet", "Leads")
+
+    assert phones(writer) == {'Acme': '1'}
+
+
+def test_sharded_upsert_counts_distinct_leads(writer):
+    leads = [dict(lead("Acme"), niche="Dentist"), dict(lead("Acme"), niche="Dentist"),
+             dict(lead("Beta"), niche="Vet")]
+    assert writer.save_leads_sharded(leads, "sheet", mode="upsert")
+
+    assert writer.get_shard_index("sheet") == {'Leads - Dentist': 1, 'Leads - Vet': 1}
+
+
+def test_iter_existing_leads_keeps_sparse_columns(writer):
+    leads = [lead(f"Lead{i}", "123" if i in (0, 7) else "") for i in range(10)]
+    assert writer.save_leads(leads, "sheet", "Leads")
+
+    rows = list(writer.iter_existing_leads("sheet", "Leads", page_size=4, columns=['phone']))
+
+    assert rows == [{'phone': lead['phone']} for lead in leads]
+
+
+def test_iter_existing_leads_pages_past_blank_rows(writer):
+    leads = [lead(f"Lead{i}") for i in range(9)]
+    leads[3] = {}
+    assert writer.save_leads(leads, "sheet", "Leads")
+
+    rows = list(writer.iter_existing_leads("sheet", "Leads", page_size=4))
+
+    assert [row['business_name'] for row in rows] == [lead.get('business_name', '') for lead in leads]
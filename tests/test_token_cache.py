@@ -0,0 +1,85 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from token_cache import TokenCache, _utcnow
+
+
+class FakeCredentials:
+    """Service account credentials that count refreshes instead of calling Google"""
+
+    service_account_email = "bot@example.iam.gserviceaccount.com"
+
+    def __init__(self):
+        self.token = None
+        self.expiry = None
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = f"minted-{self.refreshes}"
+        self.expiry = _utcnow() + timedelta(hours=1)
+
+
+def test_memory_cache_round_trip():
+    cache = TokenCache()
+    expiry = _utcnow() + timedelta(hours=1)
+    cache.put("bot", "token", expiry)
+
+    assert cache.get("bot") == ("token", expiry)
+    assert cache.get("other") is None
+
+
+def test_disk_cache_is_shared_and_encrypted(tmp_path):
+    path = str(tmp_path / "tokens.bin")
+    expiry = (_utcnow() + timedelta(hours=1)).replace(microsecond=0)
+    TokenCache(path, "secret").put("bot", "ya29.token", expiry)
+
+    assert TokenCache(path, "secret").get("bot") == ("ya29.token", expiry)
+    assert b"ya29.token" not in open(path, 'rb').read()
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_disk_cache_with_wrong_secret_is_ignored(tmp_path):
+    path = str(tmp_path / "tokens.bin")
+    TokenCache(path, "secret").put("bot", "token", _utcnow() + timedelta(hours=1))
+
+    assert TokenCache(path, "other secret").get("bot") is None
+
+
+def test_expiry_is_stored_as_naive_utc(tmp_path):
+    path = str(tmp_path / "tokens.bin")
+    expiry = datetime(2030, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    TokenCache(path, "secret").put("bot", "token", expiry)
+
+    assert TokenCache(path, "secret").get("bot") == ("token", datetime(2030, 1, 1, 6, 30))
+
+
+def test_expired_tokens_are_dropped_from_disk(tmp_path):
+    path = str(tmp_path / "tokens.bin")
+    cache = TokenCache(path, "secret")
+    cache.put("old", "token", _utcnow() - timedelta(minutes=1))
+    cache.put("new", "token", _utcnow() + timedelta(hours=1))
+
+    fresh = TokenCache(path, "secret")
+    assert fresh.get("old") is None
+    assert fresh.get("new") is not None
+
+
+def test_writer_reuses_cached_token_until_it_nears_expiry(writer):
+    writer.token_cache = TokenCache()
+    writer.credentials = FakeCredentials()
+    writer._ensure_fresh_token()
+    assert writer.credentials.refreshes == 1
+
+    # Another worker's credentials pick up the minted token
+    writer.credentials = FakeCredentials()
+    writer._ensure_fresh_token()
+    assert writer.credentials.refreshes == 0
+    assert writer.credentials.token == "minted-1"
+
+    # A token inside the refresh margin is replaced
+    writer.credentials.expiry = _utcnow() + timedelta(minutes=1)
+    key = next(iter(writer.token_cache._memory))
+    writer.token_cache.put(key, "minted-1", writer.credentials.expiry)
+    writer._ensure_fresh_token()
+    assert writer.credentials.refreshes == 1
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from website_enricher import WebsiteEnricher
+
+
+def make_enricher(**kwargs):
+    options = dict(max_concurrency=16, host_concurrency=2, host_delay=0.0, timeout=2.0, max_page_kb=256)
+    options.update(kwargs)
+    return WebsiteEnricher(**options)
+
+
+def site_leads(server, count):
+    return [{'business_name': f"Site {i}", 'website': f"{server.url}/site{i}"} for i in range(count)]
+
+
+def requested(server, path):
+    return [started for logged, started in server.log if logged == path]
+
+
+def test_enrich_leads_fills_contacts(fixture_server):
+    enriched = make_enricher().enrich_leads(site_leads(fixture_server, 2))
+
+    assert enriched[1]['phone'] == "+91 20 5555 0001"
+    assert enriched[1]['address'].startswith("1 Main Street")
+    assert "Email: hello1@example.com" in enriched[1]['contact_info']
+
+
+def test_robots_disallow_is_respected_and_cached(fixture_server):
+    enricher = make_enricher()
+
+    assert enricher.fetch_page(f"{fixture_server.url}/private/page") == ''
+    assert enricher.fetch_page(f"{fixture_server.url}/site1/") != ''
+    assert enricher.fetch_page(f"{fixture_server.url}/private/other") == ''
+
+    assert enricher.stats['robots_blocked'] == 2
+    assert len(requested(fixture_server, '/robots.txt')) == 1
+    assert not any(path.startswith('/private') for path, _ in fixture_server.log)
+
+
+def test_host_concurrency_is_capped(fixture_server):
+    fixture_server.latency = 0.05
+    make_enricher(host_concurrency=2).enrich_leads(site_leads(fixture_server, 8))
+
+    assert fixture_server.requests >= 16
+    assert fixture_server.peak_active == 2
+
+
+def test_requests_to_one_host_are_spaced_by_host_delay(fixture_server):
+    make_enricher(host_concurrency=1, host_delay=0.1).enrich_leads(site_leads(fixture_server, 3))
+    starts = sorted(started for _, started in fixture_server.log)
+
+    assert len(starts) == 7
+    assert min(later - earlier for earlier, later in zip(starts, starts[1:])) >= 0.08
+
+
+def test_oversized_page_is_truncated(fixture_server):
+    enricher = make_enricher(max_page_kb=64)
+    page = enricher.fetch_page(f"{fixture_server.url}/huge")
+
+    assert len(page) == 64 * 1024
+    assert enricher.stats['truncated'] == 1
+
+
+@pytest.mark.parametrize('path', ['/slow', '/trickle'])
+def test_slow_page_gives_up_at_timeout(fixture_server, path):
+    enricher = make_enricher(timeout=0.5, max_page_kb=4096)
+    enricher.fetch_page(f"{fixture_server.url}/robots.txt")
+    started = time.monotonic()
+    page = enricher.fetch_page(f"{fixture_server.url}{path}")
+
+    assert page == ''
+    assert time.monotonic() - started < 2.0
+    assert enricher.stats['errors'] == 1
+
+
+def test_cancel_check_stops_enrichment(fixture_server):
+    class Stop(Exception):
+        pass
+
+    def cancel_check():
+        raise Stop()
+
+    with pytest.raises(Stop):
+        make_enricher().enrich_leads(site_leads(fixture_server, 4), cancel_check=cancel_check)
+
+    assert fixture_server.requests == 0